@@ -0,0 +1,114 @@
+'''
+Output Size Benchmark for PyTabular
+-----------------------------------
+
+Compares the size of the tex produced with styles wrapped cell by cell,
+with uniform alignments and row colors hoisted into the column
+specification and \\rowcolor, and in compact mode, which also defines a
+macro for each recurring combination of styles and drops cosmetic
+whitespace. The metrics do not depend on a LateX installation.
+
+Usage::
+
+    python benchmarks/output_size.py
+'''
+
+from __future__ import print_function, division
+
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pytabular as pytab
+
+CONTROL_SEQUENCE = re.compile(r'\\[A-Za-z]+')
+
+def tex_metrics(tex):
+    '''size metrics of a tex string
+
+    Parameters
+    ----------
+    tex : str
+        tex to measure
+
+    Returns
+    -------
+    metrics : dict
+        bytes, lines, control sequences, brace groups, maximum brace
+        depth and counts of \\mc, \\cellcolor and \\rowcolor
+    '''
+    depth = 0
+    max_depth = 0
+    for char in tex:
+        if char == '{':
+            depth += 1
+            max_depth = max(depth, max_depth)
+        elif char == '}':
+            depth -= 1
+
+    return {'bytes':len(tex), 'lines':tex.count('\n') + 1,
+            'control_sequences':len(CONTROL_SEQUENCE.findall(tex)),
+            'brace_groups':tex.count('{'), 'max_brace_depth':max_depth,
+            'multicolumns':tex.count('\\mc{'),
+            'cellcolors':tex.count('\\cellcolor{'),
+            'rowcolors':tex.count('\\rowcolor{')}
+
+def build_table(rows, cols):
+    '''builds a numeric table with aligned columns, composite styles and
+    striped rows
+
+    Parameters
+    ----------
+    rows : int
+        number of rows
+    cols : int
+        number of columns
+    '''
+    np.random.seed(1234)
+    table = pytab.Tabular(np.random.randn(rows, cols).round(3))
+    table.set_alignment('r')
+    table[:,0].set_alignment('l')
+    table[:,1:].set_bold()
+    table[:,1:].set_fontsize('small')
+    table[::2].set_color('gray', 20)
+    table[1,1].set_alignment('c')
+    table[3,2].set_color('red')
+
+    return table
+
+def run(shapes=((100, 5), (1000, 10), (5000, 20))):
+    '''prints size metrics of each output mode
+
+    Parameters
+    ----------
+    shapes : tuple
+        (rows, cols) of the tables to measure
+    '''
+    modes = [('per cell', False, False), ('hoisted', True, False), 
+             ('compact', True, True)]
+    for rows, cols in shapes:
+        table = build_table(rows, cols)
+        results = []
+        for name, hoist, compact in modes:
+            table.set_hoist(hoist)
+            table.set_compact(compact)
+            start = time.time()
+            tex = table.as_tex()
+            results.append((tex_metrics(tex), time.time() - start))
+
+        print('{} x {} table'.format(rows, cols))
+        print('  {:<20}'.format('metric') + \
+              ''.join('{:>12}'.format(mode[0]) for mode in modes))
+        for metric in sorted(results[0][0]):
+            print('  {:<20}'.format(metric) + \
+                  ''.join('{:>12}'.format(r[0][metric]) for r in results))
+        print('  {:<20}'.format('render seconds') + \
+              ''.join('{:>12.3f}'.format(r[1]) for r in results))
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,483 @@
+'''
+Benchmark Suite for PyTabular
+-----------------------------
+
+Times construction, slice styling, merging, cloning, stacking, formatting,
+rendering, saving and parsing of numeric and text tables of 1e3 to 1e6
+cells, and rendering of their cells alone (cell_as_tex). Each case runs in
+a forked process, so that its peak memory, the growth of the maximum
+resident set size over the size once the data is built, is its own and
+covers the setup of the case as well as the timed step.
+
+Results are saved as JSON and compared against a baseline, failing when a
+case loses more than `threshold` of its throughput (cells per second),
+grows its peak memory by more than `threshold` or has no baseline.
+Throughputs are compared relative to a calibration workload timed on the
+same host, so that a baseline recorded on one machine applies to others.
+
+Usage::
+
+    python benchmarks/suite.py                       # compare to baseline.json
+    python benchmarks/suite.py --save results.json
+    python benchmarks/suite.py --sizes 1000 1000000 --cases construct as_tex
+    python benchmarks/suite.py --baseline '' --save benchmarks/baseline.json
+    python benchmarks/suite.py --memory 1000000 --kinds numeric
+
+With --memory, the peak memory of constructing and of rendering a table
+is reported with the breakdown of its memory_usage().
+'''
+
+from __future__ import print_function, division
+
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import pytabular as pytab
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+COLUMNS = 10
+
+# peak memory below this many KB is noise of the allocator
+MEMORY_FLOOR = 2048
+
+SIZES = [1000, 10000, 100000, 1000000]
+
+def _data(cells, kind):
+    '''content of a table of `cells` cells, 10 columns wide
+
+    Parameters
+    ----------
+    cells : int
+        number of cells
+    kind : str
+        'numeric' for floats, 'text' for words
+    '''
+    np.random.seed(1234)
+    rows = max(cells//COLUMNS, 2)
+    if kind == 'numeric':
+        return np.random.randn(rows, COLUMNS).round(4)
+    words = np.array(['alpha', 'beta', 'gamma', 'delta', 'epsilon'], dtype=object)
+    return words[np.random.randint(0, 5, (rows, COLUMNS))] + \
+           np.random.randint(0, 1000, (rows, COLUMNS)).astype(str).astype(object)
+
+def _mergeable(data):
+    '''data with every other cell of the first column null, to merge
+
+    Parameters
+    ----------
+    data : np.ndarray
+        content of the table
+    '''
+    data = data.astype(object)
+    data[1::2,0] = ''
+    return data
+
+def _construct(data):
+    return None, lambda: pytab.Tabular(data)
+
+def _construct_long(data):
+    return None, lambda: pytab.LongTable(data)
+
+def _style(data):
+    table = pytab.Tabular(data)
+    def step():
+        table[1:,1:].set_bold()
+        table[:,0].set_alignment('l')
+        table[::2].set_color('gray', 20)
+        table[0].set_lines(1)
+    return table, step
+
+def _merge(data):
+    table = pytab.Tabular(_mergeable(data))
+    def step():
+        for i in xrange(0, len(table) - 1, 2):
+            table[i:i + 2,0].merge()
+    return table, step
+
+def _clone(data):
+    table = pytab.Table(data)
+    def step():
+        variant = table.clone()
+        variant[:,1].set_bold()
+        variant.set_caption('Variant')
+    return table, step
+
+def _hstack(data):
+    left, right = pytab.Tabular(data), pytab.Tabular(data)
+    return None, lambda: pytab.hstack(left, right)
+
+def _vstack(data):
+    top, bottom = pytab.Tabular(data), pytab.Tabular(data)
+    return None, lambda: pytab.vstack(top, bottom)
+
+def _format(data):
+    table = pytab.Tabular(data)
+    formatter = pytab.format_digits(2) if data.dtype != object else pytab.escape_tex
+    def step():
+        table.set_formatter(formatter)
+        table._format_cells()
+    return table, step
+
+def _as_tex(data):
+    table = pytab.Table(data)
+    table[::2].set_color('gray', 20)
+    table[:,1:].set_bold()
+    return table, table.as_tex
+
+def _cell_as_tex(data):
+    table = pytab.Tabular(data)
+    table[::2].set_color('gray', 20)
+    table[:,1:].set_bold()
+    table[1::3,2:].set_fontsize('small')
+    table[:,0].set_alignment('l')
+    cells = table.content.ravel()
+    formatted = table._format_cells().ravel()
+    def step():
+        for cell, val in zip(cells, formatted):
+            cell.as_tex((), None, val)
+    return table, step
+
+def _write(data):
+    table = pytab.LongTable(data)
+    table[:,1:].set_bold()
+    handle, name = tempfile.mkstemp(suffix='.tex')
+    os.close(handle)
+    def step():
+        try:
+            table.write(name)
+        finally:
+            os.remove(name)
+    return table, step
+
+def _parse_tex(data):
+    tex = pytab.LongTable(data).as_tex()
+    return None, lambda: pytab.parse_tex(tex)
+
+def _save_load(data):
+    table = pytab.Table(data)
+    table[0].set_bold()
+    handle, name = tempfile.mkstemp(suffix='.ptab')
+    os.close(handle)
+    def step():
+        try:
+            table.save(name)
+            pytab.Table.load(name)
+        finally:
+            os.remove(name)
+    return table, step
+
+CASES = [('construct', _construct), ('construct_long', _construct_long),
+         ('style', _style), ('merge', _merge), ('clone', _clone), ('hstack', _hstack),
+         ('vstack', _vstack), ('format', _format), ('cell_as_tex', _cell_as_tex),
+         ('as_tex', _as_tex), ('write', _write), ('save_load', _save_load),
+         ('parse_tex', _parse_tex)]
+
+def _rss_kb():
+    '''current resident set size in KB
+    '''
+    with open('/proc/self/statm') as statm:
+        pages = int(statm.read().split()[1])
+    return pages*resource.getpagesize()//1024
+
+def _peak_kb(func):
+    '''calls a function, measuring the peak memory it allocates
+
+    With tracemalloc (Python 3) the peak of traced allocations, otherwise
+    the growth of the maximum resident set size over the size at the call.
+
+    Returns
+    -------
+    result : tuple
+        (value returned by `func`, peak KB)
+    '''
+    if tracemalloc is not None:
+        tracemalloc.start()
+        try:
+            value = func()
+            peak = tracemalloc.get_traced_memory()[1]//1024
+        finally:
+            tracemalloc.stop()
+        return value, peak
+
+    start = _rss_kb()
+    value = func()
+
+    return value, max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - start, 0)
+
+def _call(func, args, queue):
+    '''calls a function, putting its result or error on a queue
+    '''
+    try:
+        queue.put(func(*args))
+    except Exception as e:
+        queue.put(RuntimeError('{}: {}'.format(type(e).__name__, e)))
+
+def _in_fork(func, *args):
+    '''calls a function in a forked process and returns its result
+    '''
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_call, args=(func, args, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    if isinstance(result, RuntimeError):
+        raise result
+
+    return result
+
+def _measure(case, cells, kind, repeat):
+    '''times a case in the current process
+
+    Parameters
+    ----------
+    case : function
+        takes the data and returns (object kept alive, timed function)
+    cells : int
+        number of cells
+    kind : str
+        'numeric' or 'text'
+    repeat : int
+        number of timings, the fastest is kept
+
+    Returns
+    -------
+    result : tuple
+        (seconds, peak KB)
+    '''
+    data = _data(cells, kind)
+
+    def timings():
+        best = None
+        for _ in xrange(repeat):
+            keep, step = case(data)
+            start = time.time()
+            step()
+            seconds = time.time() - start
+            best = seconds if best is None else min(best, seconds)
+            del keep, step
+        return best
+
+    return _peak_kb(timings)
+
+def measure(case, cells, kind, repeat=3):
+    '''times a case in a forked process
+
+    Returns
+    -------
+    result : dict
+        seconds, cells_per_sec and peak_kb
+    '''
+    seconds, peak = _in_fork(_measure, case, cells, kind, repeat)
+
+    return {'seconds':seconds, 'cells_per_sec':cells/max(seconds, 1e-9),
+            'peak_kb':peak}
+
+def _construct_usage(cells, kind):
+    '''peak memory of constructing a longtable and its memory_usage()
+    '''
+    data = _data(cells, kind)
+    table, peak = _peak_kb(lambda: pytab.LongTable(data))
+
+    return peak, table.memory_usage(deep=True)
+
+def _render_peak(cells, kind):
+    '''peak memory of rendering a longtable
+    '''
+    table = pytab.LongTable(_data(cells, kind))
+    gc.collect()
+
+    return _peak_kb(table.as_tex)[1]
+
+def memory_report(cells, kind='numeric', stream=sys.stdout):
+    '''prints the peak memory of constructing and rendering a longtable,
+    each in a forked process, and the breakdown of its memory_usage()
+
+    Parameters
+    ----------
+    cells : int
+        number of cells
+    kind : str
+        'numeric' or 'text'
+
+    Returns
+    -------
+    report : dict
+        construct_peak_kb, render_peak_kb and usage, in bytes
+    '''
+    construct, usage = _in_fork(_construct_usage, cells, kind)
+    render = _in_fork(_render_peak, cells, kind)
+
+    print('{} {} cells, peak memory measured by {}'.format(cells, kind,
+          'tracemalloc' if tracemalloc is not None else 'maximum resident set size'),
+          file=stream)
+    print('  {:<20}{:>12} KB'.format('construct peak', construct), file=stream)
+    print('  {:<20}{:>12} KB'.format('render peak', render), file=stream)
+    for key in sorted(usage, key=lambda k: -usage[k]):
+        print('  {:<20}{:>12} KB{:>10.1f} B/cell'.format(key, usage[key]//1024,
+              usage[key]/cells), file=stream)
+
+    return {'construct_peak_kb':construct, 'render_peak_kb':render, 'usage':usage}
+
+def calibrate(repeat=5):
+    '''throughput of a fixed workload of the host, formatting, wrapping and
+    joining floats in Python as rendering does
+
+    Parameters
+    ----------
+    repeat : int
+        number of timings, the fastest is kept
+
+    Returns
+    -------
+    cells_per_sec : float
+        values formatted per second
+    '''
+    values = np.random.RandomState(0).randn(100000).round(4).tolist()
+    best = None
+    for _ in xrange(repeat):
+        start = time.time()
+        ' & '.join(['\\textbf{%s}' % str(val) for val in values])
+        seconds = time.time() - start
+        best = seconds if best is None else min(best, seconds)
+
+    return len(values)/max(best, 1e-9)
+
+def run(sizes=SIZES, kinds=('numeric', 'text'), cases=None,
+        repeat=3, stream=sys.stdout):
+    '''runs the suite
+
+    Parameters
+    ----------
+    sizes : tuple
+        numbers of cells
+    kinds : tuple
+        'numeric' and/or 'text'
+    cases : list
+        names of the cases to run, None for all
+    repeat : int
+        number of timings of each case below 1e6 cells
+
+    Returns
+    -------
+    results : dict
+        metadata, the 'calibration' throughput of the host and, under
+        'results', the result of each case keyed by 'case/kind/cells'
+    '''
+    calibration = _in_fork(calibrate)
+    print('{:<32}{:>26.0f} cells/s'.format('calibration', calibration), file=stream)
+    results = {}
+    for name, case in CASES:
+        if (cases is not None) and (name not in cases):
+            continue
+        for kind in kinds:
+            for cells in sizes:
+                key = '{}/{}/{}'.format(name, kind, cells)
+                result = measure(case, cells, kind, repeat if cells < 1e6 else 1)
+                results[key] = result
+                print('{:<32}{:>10.4f}s{:>14.0f} cells/s{:>10} KB'.format(key,
+                      result['seconds'], result['cells_per_sec'], result['peak_kb']),
+                      file=stream)
+                stream.flush()
+
+    return {'python':platform.python_version(), 'numpy':np.__version__,
+            'machine':platform.machine(), 'calibration':calibration,
+            'results':results}
+
+def compare(results, baseline, threshold=0.25):
+    '''regressions of results against a baseline
+
+    Parameters
+    ----------
+    results : dict
+        as returned by run()
+    baseline : dict
+        as returned by run(), cases missing from it are regressions, so
+        that new cases are not silently left uncompared
+    threshold : float
+        fraction of throughput lost or peak memory gained tolerated, the
+        throughputs of the baseline scaled by the ratio of the
+        calibrations of the hosts
+
+    Returns
+    -------
+    regressions : list
+        message for each regression
+    '''
+    regressions = []
+    scale = 1.
+    if ('calibration' in results) and ('calibration' in baseline):
+        scale = results['calibration']/baseline['calibration']
+    for key, result in sorted(results['results'].items()):
+        if key not in baseline['results']:
+            regressions.append('{}: no baseline, regenerate it with '
+                               "--baseline '' --save".format(key))
+            continue
+        base = baseline['results'][key]
+        expected = base['cells_per_sec']*scale
+        if result['cells_per_sec'] < expected*(1 - threshold):
+            regressions.append('{}: {:.0f} cells/s, baseline {:.0f} on this host'.format(\
+                               key, result['cells_per_sec'], expected))
+        peak, base_peak = result['peak_kb'], max(base['peak_kb'], MEMORY_FLOOR)
+        if peak > base_peak*(1 + threshold):
+            regressions.append('{}: peak {} KB, baseline {} KB'.format(key,
+                               peak, base['peak_kb']))
+
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='PyTabular benchmark suite')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES,
+                        help='numbers of cells, up to 1000000')
+    parser.add_argument('--kinds', nargs='+', default=['numeric', 'text'],
+                        choices=['numeric', 'text'])
+    parser.add_argument('--cases', nargs='+', default=None,
+                        choices=[name for name, _ in CASES])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--save', default=None, help='file to save results as JSON')
+    parser.add_argument('--baseline', default=BASELINE,
+                        help="JSON results to compare against, '' for none")
+    parser.add_argument('--threshold', type=float, default=0.25)
+    parser.add_argument('--memory', type=int, default=None, metavar='CELLS',
+                        help='report the memory of a table of CELLS cells instead')
+    args = parser.parse_args(argv)
+
+    if args.memory is not None:
+        for kind in args.kinds:
+            memory_report(args.memory, kind)
+        return 0
+
+    results = run(args.sizes, args.kinds, args.cases, args.repeat)
+    if args.save:
+        with open(args.save, 'w') as resultfile:
+            json.dump(results, resultfile, indent=2, sort_keys=True)
+
+    if not (args.baseline and os.path.exists(args.baseline)):
+        return 0
+    with open(args.baseline) as basefile:
+        baseline = json.load(basefile)
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print('REGRESSION ' + regression)
+
+    return int(len(regressions) > 0)
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1 +1,4 @@
 from tables import *
+from builders import *
+from profiling import profile, Profiler
+from parsing import parse_tex, read_tex
@@ -0,0 +1,378 @@
+'''
+Table Builders for PyTabular Package
+------------------------------------
+
+Functions building styled tables from arrays of results.
+'''
+
+from __future__ import print_function, division
+
+# Third Party
+import numpy as np
+
+# Local packages
+from tables import Table, LongTable
+
+def _format_numbers(values, digits=3):
+    '''formats an array of numbers, '' where missing
+
+    Parameters
+    ----------
+    values : np.ndarray
+        numbers to format
+    digits : int
+        number of digits after the decimal point
+
+    Returns
+    -------
+    formatted : np.ndarray
+        dtype = object, same shape as `values`
+    '''
+    values = np.asarray(values, dtype=float)
+    finite = np.isfinite(values)
+    formatted = np.char.mod('%0.{}f'.format(digits), np.where(finite, values, 0))
+
+    return np.where(finite, formatted, '').astype(object)
+
+def _format_stats(values, digits=3):
+    '''formats model statistics, integers with thousands separators
+
+    Parameters
+    ----------
+    values : sequence
+        statistic of each model
+    digits : int
+        number of digits after the decimal point for non-integers
+    '''
+    values = np.asarray(values, dtype=float)
+    finite = np.isfinite(values)
+    if finite.any() and np.all(values[finite] == np.round(values[finite])):
+        formatted = np.array(['{:,}'.format(int(v)) if f else '' \
+                              for v, f in zip(values, finite)], dtype=object)
+        return formatted
+
+    return _format_numbers(values, digits)
+
+def regression_table(coefs, ses, pvalues=None, variables=None, models=None,
+                     stats=None, digits=3, levels=[0.1, 0.05, 0.01]):
+    '''builds a table of regression results
+
+    Each variable takes a row of coefficients, with significance stars
+    from the p-values, followed by a row of standard errors in
+    parentheses. Missing (NaN) coefficients are left blank.
+
+    Parameters
+    ----------
+    coefs : array-like
+        coefficients, models x variables
+    ses : array-like
+        standard errors, models x variables
+    pvalues : array-like
+        p-values, models x variables, None for no stars
+    variables : list
+        names of the variables, default 'x1', 'x2', ...
+    models : list
+        names of the models, default '(1)', '(2)', ...
+    stats : list
+        (name, values) of statistics of the models, e.g.
+        [('N', [100, 250]), ('R$^2$', [0.25, 0.31])]
+    digits : int
+        number of digits after the decimal point
+    levels : list
+        p-values for one, two, three, ... stars
+
+    Returns
+    -------
+    table : Table
+        header row of models, interleaved coefficient and standard
+        error rows and a footer of statistics
+    '''
+    coefs = np.atleast_2d(np.asarray(coefs, dtype=float))
+    ses = np.atleast_2d(np.asarray(ses, dtype=float))
+    nmodels, nvars = coefs.shape
+    if ses.shape != coefs.shape:
+        raise ValueError('ses has shape {}, expected {}'.format(ses.shape, coefs.shape))
+    if variables is None:
+        variables = ['x{}'.format(i + 1) for i in xrange(nvars)]
+    if models is None:
+        models = ['({})'.format(i + 1) for i in xrange(nmodels)]
+    if (len(variables) != nvars) or (len(models) != nmodels):
+        raise ValueError('expected {} variables and {} models'.format(nvars, nmodels))
+    if stats is None:
+        stats = []
+
+    coef_tex = _format_numbers(coefs, digits)
+    if pvalues is not None:
+        pvalues = np.atleast_2d(np.asarray(pvalues, dtype=float))
+        if pvalues.shape != coefs.shape:
+            raise ValueError('pvalues has shape {}, expected {}'.format(\
+                             pvalues.shape, coefs.shape))
+        stars = np.zeros(coefs.shape, dtype=int)
+        passed = np.ones(coefs.shape, dtype=bool)
+        for level in sorted(levels, reverse=True):
+            with np.errstate(invalid='ignore'):
+                passed &= pvalues <= level
+            stars += passed
+        marks = np.array(['*'*n for n in xrange(len(levels) + 1)], dtype=object)
+        coef_tex = np.where(coef_tex != '', coef_tex + marks[stars], '')
+
+    se_tex = _format_numbers(ses, digits)
+    se_tex = np.where(se_tex != '', '(' + se_tex + ')', '')
+
+    body = np.empty((2*nvars, nmodels + 1), dtype=object)
+    body[0::2,0] = variables
+    body[1::2,0] = ''
+    body[0::2,1:] = coef_tex.T
+    body[1::2,1:] = se_tex.T
+
+    header = np.array([[''] + list(models)], dtype=object)
+    footer = np.empty((len(stats), nmodels + 1), dtype=object)
+    for i, (name, values) in enumerate(stats):
+        if len(values) != nmodels:
+            raise ValueError('statistic {} needs a value for each model'.format(name))
+        footer[i,0] = name
+        footer[i,1:] = _format_stats(values, digits)
+
+    table = Table(np.vstack([header, body, footer]))
+    table.set_tab_alignment('l' + 'c'*nmodels)
+    table[0].set_lines(1)
+    if len(stats) > 0:
+        table[2*nvars].set_lines(1)
+    if pvalues is not None:
+        marks = ['{} p$<${}'.format('*'*(n + 1), level) for n, level in \
+                 enumerate(sorted(levels, reverse=True))]
+        table.add_note('Standard errors in parentheses. ' + ', '.join(marks))
+
+    return table
+
+_STAT_LABELS = {'mean':'Mean', 'std':'Std.', 'min':'Min', 'max':'Max', 
+                'count':'N', 'sum':'Sum'}
+
+def _group_codes(groups, nrows):
+    '''codes of the group of each row
+
+    Parameters
+    ----------
+    groups : array-like
+        group label of each row, None for a single group
+    nrows : int
+        number of rows of the data
+
+    Returns
+    -------
+    labels : np.ndarray
+        sorted unique group labels
+    codes : np.ndarray
+        dtype = int, index into `labels` of each row
+    '''
+    if groups is None:
+        return np.array([''], dtype=object), np.zeros(nrows, dtype=int)
+    groups = np.asarray(groups)
+    if groups.shape != (nrows,):
+        raise ValueError('received groups of shape {}, expected ({},)'.format(\
+                         groups.shape, nrows))
+
+    return np.unique(groups, return_inverse=True)
+
+def _chunk_moments(values, codes):
+    '''grouped counts, sums, sums of squared deviations, minima and maxima
+    of a chunk, ignoring NaN
+
+    Parameters
+    ----------
+    values : np.ndarray
+        dtype = float, rows x variables
+    codes : np.ndarray
+        dtype = int, group of each row
+
+    Returns
+    -------
+    moments : tuple
+        (count, mean, m2, vmin, vmax), each groups x variables, for the
+        groups present in the chunk only, and those groups
+    '''
+    order = np.argsort(codes, kind='mergesort')
+    codes = codes[order]
+    values = values[order]
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(codes)) + 1])
+    present = codes[starts]
+
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.)
+    count = np.add.reduceat(valid, starts, axis=0).astype(float)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.add.reduceat(filled, starts, axis=0)/count
+    sizes = np.diff(np.concatenate([starts, [len(codes)]]))
+    deviation = np.where(valid, values - np.repeat(mean, sizes, axis=0), 0.)
+    m2 = np.add.reduceat(deviation**2, starts, axis=0)
+    vmin = np.fmin.reduceat(values, starts, axis=0)
+    vmax = np.fmax.reduceat(values, starts, axis=0)
+
+    return (count, mean, m2, vmin, vmax), present
+
+def grouped_stats(data, groups=None, stats=['mean', 'std', 'min', 'max', 'count'], 
+                  chunksize=100000):
+    '''computes statistics of each variable by group, ignoring NaN
+
+    The rows are read `chunksize` at a time, so `data` may be an
+    np.memmap larger than memory. Chunks are combined with the pairwise
+    update of means and sums of squared deviations.
+
+    Parameters
+    ----------
+    data : array-like
+        observations x variables
+    groups : array-like
+        group label of each observation, None for a single group
+    stats : list
+        names of statistics, any of 'mean', 'std', 'min', 'max',
+        'count' and 'sum'
+    chunksize : int
+        number of rows reduced at a time
+
+    Returns
+    -------
+    labels : np.ndarray
+        sorted unique group labels
+    results : dict
+        array of groups x variables for each statistic
+    '''
+    for stat in stats:
+        if stat not in _STAT_LABELS:
+            raise ValueError('received {}, expected one of {}'.format(\
+                             stat, sorted(_STAT_LABELS)))
+    if (not isinstance(chunksize, int)) or (chunksize < 1):
+        raise ValueError('chunksize must be a positive int')
+    if data.ndim == 1:
+        data = data.reshape((-1, 1))
+    nrows, nvars = data.shape
+    labels, codes = _group_codes(groups, nrows)
+
+    shape = (len(labels), nvars)
+    count, mean, m2 = np.zeros(shape), np.zeros(shape), np.zeros(shape)
+    vmin, vmax = np.full(shape, np.nan), np.full(shape, np.nan)
+    for start in xrange(0, nrows, chunksize):
+        values = np.asarray(data[start:start + chunksize], dtype=float)
+        chunk, present = _chunk_moments(values, codes[start:start + chunksize])
+        n_b, mean_b, m2_b, min_b, max_b = chunk
+        n_a = count[present]
+        n = n_a + n_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            delta = np.where(n_b > 0, mean_b - mean[present], 0.)
+            ratio = np.where(n > 0, n_b/n, 0.)
+        mean[present] += delta*ratio
+        m2[present] += m2_b + delta**2*n_a*ratio
+        count[present] = n
+        vmin[present] = np.fmin(vmin[present], min_b)
+        vmax[present] = np.fmax(vmax[present], max_b)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        results = {'count':count.astype(int), 
+                   'sum':mean*count,
+                   'mean':np.where(count > 0, mean, np.nan),
+                   'std':np.sqrt(m2/(count - 1)),
+                   'min':vmin,
+                   'max':vmax}
+
+    return labels, {stat:results[stat] for stat in stats}
+
+def summary_table(data, groups=None, variables=None, 
+                  stats=['mean', 'std', 'min', 'max', 'count'], digits=3, 
+                  chunksize=100000):
+    '''builds a table of summary statistics
+
+    Each variable takes a row of statistics, see grouped_stats(). With
+    groups, the rows of a group follow its label, merged over them.
+
+    Parameters
+    ----------
+    data : array-like
+        observations x variables, may be an np.memmap
+    groups : array-like
+        group label of each observation, None for no groups
+    variables : list
+        names of the variables, default 'x1', 'x2', ...
+    stats : list
+        names of statistics, see grouped_stats()
+    digits : int
+        number of digits after the decimal point
+    chunksize : int
+        number of rows reduced at a time
+
+    Returns
+    -------
+    table : Table
+        header row of statistics, a row for each group and variable
+    '''
+    if not isinstance(data, np.ndarray):
+        data = np.asarray(data, dtype=float)
+    labels, results = grouped_stats(data, groups, stats, chunksize)
+    ngroups, nvars = len(labels), results[stats[0]].shape[1]
+    if variables is None:
+        variables = ['x{}'.format(i + 1) for i in xrange(nvars)]
+    if len(variables) != nvars:
+        raise ValueError('received {} variables, expected {}'.format(\
+                         len(variables), nvars))
+
+    columns = []
+    for stat in stats:
+        if stat == 'count':
+            tex = np.array(['{:,}'.format(n) for n in results[stat].flat], 
+                           dtype=object)
+        else:
+            tex = _format_numbers(results[stat], digits).ravel()
+        columns.append(tex)
+    body = np.column_stack([np.tile(np.asarray(variables, dtype=object), ngroups)] + 
+                           columns)
+    header = [['Variable'] + [_STAT_LABELS[stat] for stat in stats]]
+
+    if groups is not None:
+        labels_tex = np.empty(ngroups*nvars, dtype=object)
+        labels_tex.fill('')
+        labels_tex[::nvars] = [str(label) for label in labels]
+        body = np.column_stack([labels_tex, body])
+        header[0].insert(0, 'Group')
+
+    table = Table(np.vstack([np.array(header, dtype=object), body]))
+    nlabels = len(header[0]) - len(stats)
+    table.set_tab_alignment('l'*nlabels + 'c'*len(stats))
+    table[0].set_lines(1)
+    if (groups is not None) and (nvars > 1):
+        for g in xrange(ngroups):
+            top = 1 + g*nvars
+            table[top:top + nvars,0].merge()
+            if g < ngroups - 1:
+                table[top + nvars - 1].set_lines(1)
+
+    return table
+
+def csv_to_tex(path, filename, chunksize=10000, formatters=None, header=True,
+               delimiter=','):
+    '''converts a csv file to a longtable, streaming the rows
+
+    Parameters
+    ----------
+    path : str
+        name of the csv file
+    filename : str
+        name of the tex file
+    chunksize : int
+        number of rows read, formatted and written at a time
+    formatters : dict
+        formatter by column index, e.g. {1:format_digits(2)}
+    header : bool
+        True if the first line of the file holds column names
+    delimiter : str
+        field separator
+
+    Returns
+    -------
+    table : LongTable
+        header and first chunk of the table, see LongTable.from_csv()
+    '''
+    table = LongTable.from_csv(path, chunksize, header, delimiter)
+    for col, formatter in (formatters or {}).items():
+        table[int(header):,col].set_formatter(formatter)
+    table.write(filename)
+
+    return table
@@ -0,0 +1,343 @@
+'''
+Command Line Renderer for PyTabular Package
+-------------------------------------------
+
+Renders a directory of table specifications to tex files::
+
+    pytabular specs/ --out tables/ --processes 4
+    pytabular specs/ --watch
+
+A specification is a JSON (or, with PyYAML, YAML) file such as::
+
+    {"data": "results.csv", "kind": "table", "caption": "Results",
+     "label": "results", "digits": 2, "alignment": "lcc",
+     "styles": [{"rows": "0", "bold": true}]}
+
+The data file, relative to the specification, is a csv file with a
+header line or a .npy array. Keys:
+
+- data : data file, required
+- kind : 'table' or 'longtable', streaming csv rows or .npy records to
+  the output
+- output : name of the tex file, default the name of the specification
+- caption, label, alignment, na_rep : see the setters of Tabular
+- header, delimiter, chunksize : reading of csv files, chunksize also of
+  .npy records
+- digits : digits after the decimal point of float columns
+- compact, hoist : output modes, both off by default
+- notes : list of notes
+- styles : list of regions, 'rows' and 'cols' as slices like '1:',
+  with bold, emph, underline, color, fontsize, alignment, rotation or
+  digits, see pytabular.Stylesheet
+'''
+
+from __future__ import print_function, division
+
+# Standard Library
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+# Third Party
+import numpy as np
+
+# Local packages
+from tables import Table, LongTable, _to_str
+from formatting import format_digits
+from styles import Stylesheet
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+SPEC_EXTENSIONS = ['.json', '.yaml', '.yml']
+
+def load_spec(path):
+    '''loads a table specification
+
+    Parameters
+    ----------
+    path : str
+        name of a .json, .yaml or .yml file
+
+    Returns
+    -------
+    spec : dict
+        specification, with the name of the data file made absolute
+    '''
+    ext = os.path.splitext(path)[1].lower()
+    with open(path) as specfile:
+        if ext == '.json':
+            spec = json.load(specfile)
+        elif yaml is None:
+            raise ValueError('PyYAML is required to read {}'.format(path))
+        else:
+            spec = yaml.safe_load(specfile)
+    spec = _to_str(spec)
+
+    if (not isinstance(spec, dict)) or ('data' not in spec):
+        raise ValueError('{} must specify a data file'.format(path))
+    if spec.get('kind', 'table') not in ['table', 'longtable']:
+        raise ValueError('received kind {}, expected table or longtable'.format(\
+                         spec['kind']))
+    root = os.path.dirname(os.path.abspath(path))
+    spec['data'] = os.path.join(root, spec['data'])
+
+    return spec
+
+def _load_table(spec):
+    '''creates the table of a specification from its data file
+
+    Parameters
+    ----------
+    spec : dict
+        table specification
+    '''
+    cls = LongTable if spec.get('kind', 'table') == 'longtable' else Table
+    data = spec['data']
+    header = spec.get('header', True)
+
+    if data.endswith('.npy'):
+        array = np.load(data, mmap_mode='r')
+        if (array.dtype.names is not None) and (cls is LongTable):
+            return LongTable.from_records(array, header, 
+                                          spec.get('chunksize', 10000))
+        if array.dtype.names is not None:
+            return cls.from_records(array, header)
+        return cls(array)
+    if cls is LongTable:
+        return LongTable.from_csv(data, spec.get('chunksize', 10000), header,
+                                  spec.get('delimiter', ','))
+    return Table.from_csv(data, header, spec.get('delimiter', ','))
+
+def build_table(spec):
+    '''creates and styles the table of a specification
+
+    Parameters
+    ----------
+    spec : dict
+        table specification, see the module docstring
+
+    Returns
+    -------
+    table : Table or LongTable
+    '''
+    table = _load_table(spec)
+    offset = int(spec.get('header', True))
+
+    if 'digits' in spec:
+        formatter = format_digits(int(spec['digits']))
+        for j in xrange(table.shape[1]):
+            if table.values(j, slice(offset, None)).dtype.kind == 'f':
+                table[offset:,j].set_formatter(formatter)
+    Stylesheet(spec.get('styles', [])).apply(table)
+
+    if 'alignment' in spec:
+        table.set_tab_alignment(spec['alignment'])
+    if 'caption' in spec:
+        table.set_caption(spec['caption'])
+    if 'label' in spec:
+        table.set_label(spec['label'])
+    if 'na_rep' in spec:
+        table.set_na_rep(spec['na_rep'])
+    table.set_compact(bool(spec.get('compact', False)))
+    table.set_hoist(bool(spec.get('hoist', False)))
+    for note in spec.get('notes', []):
+        table.add_note(note)
+
+    return table
+
+def render_spec(task):
+    '''renders a specification to its tex file
+
+    Parameters
+    ----------
+    task : tuple
+        (name of the specification, output directory)
+
+    Returns
+    -------
+    result : tuple
+        (name of the specification, name of the tex file, seconds, error
+        message or None)
+    '''
+    path, outdir = task
+    start = time.time()
+    output = None
+    try:
+        spec = load_spec(path)
+        name = spec.get('output', os.path.splitext(os.path.basename(path))[0])
+        output = os.path.join(outdir or os.path.dirname(os.path.abspath(path)),
+                              str(name))
+        if not output.endswith('.tex'):
+            output += '.tex'
+        build_table(spec).write(output)
+    except Exception as e:
+        return path, output, time.time() - start, '{}: {}'.format(\
+               type(e).__name__, e)
+
+    return path, output, time.time() - start, None
+
+def find_specs(directory):
+    '''names of the specifications in a directory
+
+    Parameters
+    ----------
+    directory : str
+        directory to search, not recursively
+    '''
+    names = sorted(os.listdir(directory))
+    return [os.path.join(directory, name) for name in names \
+            if os.path.splitext(name)[1].lower() in SPEC_EXTENSIONS]
+
+def _mtimes(path):
+    '''modification times of a specification and of its data file
+
+    Parameters
+    ----------
+    path : str
+        name of the specification
+    '''
+    mtimes = [os.path.getmtime(path)]
+    try:
+        data = load_spec(path)['data']
+        mtimes.append(os.path.getmtime(data))
+    except (IOError, OSError, ValueError):
+        pass
+
+    return tuple(mtimes)
+
+def render_all(paths, outdir=None, processes=1):
+    '''renders specifications, in parallel if `processes` > 1
+
+    Parameters
+    ----------
+    paths : list
+        names of the specifications
+    outdir : str
+        directory of the tex files, None to write next to each
+        specification
+    processes : int
+        number of worker processes
+
+    Returns
+    -------
+    results : list
+        result of render_spec() for each specification
+    '''
+    tasks = [(path, outdir) for path in paths]
+    if (processes == 1) or (len(tasks) < 2):
+        return [render_spec(task) for task in tasks]
+
+    pool = multiprocessing.Pool(min(processes, len(tasks)))
+    try:
+        return pool.map(render_spec, tasks)
+    finally:
+        pool.close()
+        pool.join()
+
+def _report(results, stream=None):
+    '''prints the render time or error of each specification
+
+    Parameters
+    ----------
+    results : list
+        results of render_spec()
+    stream : file
+        stream to print to, None for sys.stdout
+
+    Returns
+    -------
+    failed : int
+        number of specifications which failed
+    '''
+    stream = sys.stdout if stream is None else stream
+    failed = 0
+    for path, output, seconds, error in results:
+        if error is None:
+            print('{} -> {} ({:.3f}s)'.format(path, output, seconds), file=stream)
+        else:
+            failed += 1
+            print('{} failed: {}'.format(path, error), file=stream)
+    stream.flush()
+
+    return failed
+
+def watch(directory, outdir=None, processes=1, interval=1.):
+    '''renders specifications whenever they or their data files change
+
+    Parameters
+    ----------
+    directory : str
+        directory of the specifications
+    outdir : str
+        directory of the tex files
+    processes : int
+        number of worker processes
+    interval : float
+        seconds between checks of modification times
+    '''
+    seen = {}
+    while True:
+        changed = []
+        for path in find_specs(directory):
+            try:
+                mtimes = _mtimes(path)
+            except OSError:
+                continue
+            if seen.get(path) != mtimes:
+                seen[path] = mtimes
+                changed.append(path)
+        if len(changed) > 0:
+            _report(render_all(changed, outdir, processes))
+        time.sleep(interval)
+
+def main(argv=None):
+    '''entry point of the pytabular command
+
+    Parameters
+    ----------
+    argv : list
+        arguments, None for sys.argv[1:]
+
+    Returns
+    -------
+    status : int
+        0 if every specification rendered, 1 otherwise
+    '''
+    parser = argparse.ArgumentParser(prog='pytabular',
+                                     description='Render table specifications to tex files.')
+    parser.add_argument('directory', help='directory of .json/.yaml specifications')
+    parser.add_argument('-o', '--out', default=None,
+                        help='directory of the tex files, default next to the specifications')
+    parser.add_argument('-p', '--processes', type=int, default=multiprocessing.cpu_count(),
+                        help='number of worker processes')
+    parser.add_argument('-w', '--watch', action='store_true',
+                        help='re-render specifications or data files as they change')
+    parser.add_argument('--interval', type=float, default=1.,
+                        help='seconds between checks in watch mode')
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.directory):
+        parser.error('{} is not a directory'.format(args.directory))
+    if args.processes < 1:
+        parser.error('processes must be positive')
+    if (args.out is not None) and (not os.path.isdir(args.out)):
+        os.makedirs(args.out)
+
+    if args.watch:
+        try:
+            watch(args.directory, args.out, args.processes, args.interval)
+        except KeyboardInterrupt:
+            return 0
+
+    results = render_all(find_specs(args.directory), args.out, args.processes)
+
+    return int(_report(results) > 0)
+
+if __name__ == '__main__':
+    sys.exit(main())
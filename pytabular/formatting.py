@@ -1,8 +1,22 @@
 '''
 Formatters for Package PyTabular
 --------------------------------
+
+A formatter takes a scalar and returns a string. Formatters may carry a
+`vectorized` attribute, a function taking a 1-d array of values and
+returning an array of strings, which tables use to format many cells
+sharing the formatter in one call.
+
+Formatters created by format_digits() and format_stars() carry a `spec`
+attribute, (name of the creator, arguments), from which saved tables
+create them again.
 '''
 
+# Standard Library
+import importlib
+
+import numpy as np
+
 def format_int(val):
     '''formats an integer
 
@@ -70,6 +84,16 @@ def format_digits(digits=3):
         val = float(val)
         
         return '%0.{}f'.format(digits) % val
+
+    def vectorized(vals):
+        '''formats an array of values to {} significant digits'''.format(digits)
+
+        vals = np.asarray(vals, dtype=float)
+
+        return np.char.mod('%0.{}f'.format(digits), vals).astype(object)
+
+    f.vectorized = vectorized
+    f.spec = ('format_digits', (digits,))
         
     return f
     
@@ -123,5 +147,127 @@ def format_stars(side='left', levels=[0.1,0.05,0.01], formatter=str):
             return '{}{}'.format('*'*stars, formatter(val))
         else:
             return '{}{}'.format(formatter(val), '*'*stars)
+
+    def vectorized(vals):
+        '''formats an array of values with significance stars'''
+
+        vals = np.asarray(vals, dtype=float)
+
+        stars = np.zeros(len(vals), dtype=int)
+        passed = np.ones(len(vals), dtype=bool)
+        for level in levels:
+            passed &= vals <= level
+            stars += passed
+
+        if hasattr(formatter, 'vectorized'):
+            formatted = formatter.vectorized(vals)
+        else:
+            formatted = [formatter(val) for val in vals.tolist()]
+        stars = np.array(['*'*n for n in xrange(len(levels) + 1)], dtype=object)[stars]
+
+        if side == 'left':
+            return stars + formatted
+        else:
+            return formatted + stars
+
+    f.vectorized = vectorized
+    f.spec = ('format_stars', (side, levels, formatter))
     
-    return f
\ No newline at end of file
+    return f
+
+
+_TEX_ESCAPES = [('&', '\\&'), ('%', '\\%'), ('$', '\\$'), ('#', '\\#'), 
+                ('_', '\\_'), ('{', '\\{'), ('}', '\\}'), 
+                ('~', '\\textasciitilde{}'), ('^', '\\textasciicircum{}')]
+
+def escape_tex(val):
+    '''formats a value as text, escaping LateX special characters
+
+    Parameters
+    ----------
+    val : scalar type
+        value to format
+
+    Returns
+    -------
+    val : str
+        formatted value
+    '''
+    val = str(val).replace('\\', '\x01')
+    for char, escaped in _TEX_ESCAPES:
+        val = val.replace(char, escaped)
+
+    return val.replace('\x01', '\\textbackslash{}')
+
+def _escape_tex_vectorized(vals):
+    '''escapes an array of values, converted by str() one by one unless
+    they are strings, as numpy formats floats differently'''
+
+    vals = np.asarray(vals)
+    if vals.size == 0:
+        return vals.astype(object)
+    if vals.dtype.kind != 'S':
+        vals = np.array([str(val) for val in vals.ravel().tolist()]).reshape(vals.shape)
+    vals = np.char.replace(vals, '\\', '\x01')
+    for char, escaped in _TEX_ESCAPES:
+        vals = np.char.replace(vals, char, escaped)
+
+    return np.char.replace(vals, '\x01', '\\textbackslash{}').astype(object)
+
+escape_tex.vectorized = _escape_tex_vectorized
+
+_FORMATTER_CREATORS = {'format_digits':format_digits, 'format_stars':format_stars}
+
+def _formatter_spec(formatter):
+    '''JSON-serializable description of a formatter
+
+    Parameters
+    ----------
+    formatter : function
+        module-level function, e.g. str or escape_tex, or formatter
+        created by format_digits() or format_stars()
+
+    Returns
+    -------
+    spec : dict
+        {'function': 'module.name'} or {'creator': name, 'args': list},
+        formatter arguments described in turn as {'formatter': spec}
+    '''
+    spec = getattr(formatter, 'spec', None)
+    if spec is not None:
+        name, args = spec
+        return {'creator':name, 'args':[{'formatter':_formatter_spec(arg)} \
+                if hasattr(arg, '__call__') else arg for arg in args]}
+
+    module = getattr(formatter, '__module__', None) or '__builtin__'
+    name = getattr(formatter, '__name__', None)
+    try:
+        found = getattr(importlib.import_module(module), name)
+    except (ImportError, AttributeError, TypeError):
+        found = None
+    if found is not formatter:
+        raise ValueError('cannot describe formatter {}, expected a module-level '
+                         'function or a formatter created by format_digits() or '
+                         'format_stars()'.format(formatter))
+
+    return {'function':'{}.{}'.format(module, name)}
+
+def _formatter_from_spec(spec):
+    '''formatter described by _formatter_spec()
+
+    Parameters
+    ----------
+    spec : dict
+        description of the formatter, naming a module to import
+    '''
+    if 'creator' in spec:
+        if spec['creator'] not in _FORMATTER_CREATORS:
+            raise ValueError('received creator {}, expected one of {}'.format(\
+                             spec['creator'], sorted(_FORMATTER_CREATORS)))
+        args = [_formatter_from_spec(arg['formatter']) if isinstance(arg, dict) \
+                else arg for arg in spec['args']]
+        return _FORMATTER_CREATORS[spec['creator']](*args)
+
+    module, name = str(spec['function']).rsplit('.', 1)
+
+    return getattr(importlib.import_module(module), name)
@@ -29,18 +29,3 @@ def texCommands():
 \newcommand{\mr}{\multirow}
 \newcommand{\mc}{\multicolumn}
 '''
-
-#def parse_tex(tex):
-#    '''parses a tex string into a Tabular Object
-#    
-#    Parameters
-#    ----------
-#    tex: str
-#        text containing LateX table
-#    '''
-#    tab = 'tabu'
-#    begin = 13 + len(tab)
-#    tabular = tex[tex.index('\\begin{tabu}')+begin:tex.index('\\end{tabu}')]
-#    tabular = tabular.replace('\n', '')
-#    
-#    return tabular
\ No newline at end of file
@@ -0,0 +1,585 @@
+'''
+TeX Parser for PyTabular Package
+--------------------------------
+
+Reads tables rendered by PyTabular back into tables, to restyle or
+re-merge them without the data they were built from::
+
+    table = read_tex('results.tex')
+    table[1:,2].set_bold()
+    table.write('results.tex')
+
+The output of as_tex() and write() is read in one pass over its rows,
+including compact output with style macros, hoisted alignments and row
+colors, decimal aligned columns and longtables written in fragments.
+Contents are the tex rendered in each cell, with numbers converted back
+to ints and to floats formatted to the digits rendered. Rules, other
+formatters and `na_rep` are not recovered, the text and styles they
+rendered are.
+'''
+
+from __future__ import print_function, division
+
+# Standard Library
+import os
+import re
+
+# Third Party
+import numpy as np
+
+# Local packages
+from tables import Tabular, Table, LongTable, TabularCell, _split_alignment
+from formatting import format_digits
+from styles import Style
+
+FONTSIZES = ['tiny', 'scriptsize', 'footnotesize', 'small', 'normalsize',
+             'large', 'Large', 'LARGE', 'huge', 'Huge']
+
+# styles by the command wrapping the content
+_FLAGS = {'\\textbf{':'bold', '\\emph{':'emph', '\\uline{':'underline'}
+_SIZES = {'\\{}{{'.format(size):size for size in FONTSIZES}
+
+_BRACES = re.compile(r'(?<!\\)[{}]')
+_BEGIN = re.compile(r'\\begin\{([^}]*)\}')
+_TABULAR = re.compile(r'\\begin\{(tabu|tabular|longtabu)\}')
+_MACRO = re.compile(r'\\renewcommand\{\\(\w+)\}\[1\]\{')
+_ROW_END = re.compile(r'\\\\(?:\[([^\]]*)\])?')
+_LINE = r'\\hline|\\cmidrule\(([lr]*)\)\{(\d+)-\d+\}|\\morecmidrules'
+_LINES = re.compile(r'(?:\s*(?:{}))+'.format(_LINE))
+_INPUT = re.compile(r'^[ \t]*\\(?:input\{([^}]*)\}|@@input[ \t]+(\S+))[ \t]*$', 
+                    re.MULTILINE)
+_MAKEAT = re.compile(r'^\\makeat(?:letter|other)[ \t]*\n?', re.MULTILINE)
+_ITEM = re.compile(r'^\s*\\item ', re.MULTILINE)
+_NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(?:\.(\d+))?$')
+_NUMBER_START = set('-0123456789')
+_COMMANDS = set('\\{')
+_STARS = re.compile(r'^\{(\*+)\}|\{(\*+)\}$')
+
+def _group(text, start):
+    '''index after the brace group opening at `start`
+
+    Parameters
+    ----------
+    text : str
+        tex
+    start : int
+        index of the opening brace
+    '''
+    end = text.find('}', start) + 1
+    if (end > 0) and (text.find('{', start + 1, end) < 0) and (text[end - 2] != '\\'):
+        return end
+    depth = 0
+    for match in _BRACES.finditer(text, start):
+        depth += 1 if match.group() == '{' else -1
+        if depth == 0:
+            return match.end()
+
+    raise ValueError('received unbalanced braces in {}'.format(text))
+
+def _arguments(text, start, n):
+    '''contents of `n` brace groups following each other from `start`
+
+    Returns
+    -------
+    arguments : tuple
+        (list of the contents, index after the last group)
+    '''
+    arguments = []
+    for _ in xrange(n):
+        if text[start:start + 1] != '{':
+            raise ValueError('received {}, expected {} arguments'.format(text, n))
+        end = _group(text, start)
+        arguments.append(text[start + 1:end - 1])
+        start = end
+
+    return arguments, start
+
+def _unwrap(text, command):
+    '''content of a command with one argument spanning `text`, None if
+    `text` is not such a command
+    '''
+    if not (text.startswith(command) and text.endswith('}')):
+        return None
+    inner = text[len(command):-1]
+    if ('{' in inner) or ('}' in inner):
+        if _group(text, len(command) - 1) != len(text):
+            return None
+
+    return inner
+
+def _number(text):
+    '''int or float of a number rendered, `text` if not a number
+    '''
+    try:
+        return int(text)
+    except ValueError:
+        try:
+            return float(text)
+        except ValueError:
+            return text
+
+def _parse_cell(text, macros):
+    '''content, span and styles of a rendered cell
+
+    Parameters
+    ----------
+    text : str
+        tex of the cell, stripped
+    macros : dict
+        styles by the name of the style macros of the tabular
+
+    Returns
+    -------
+    cell : tuple
+        (content, rows, columns, dict of the fields of its Style set)
+    '''
+    rows = columns = 1
+    styles = {}
+    if text.startswith('\\mc{'):
+        (n, align, inner), end = _arguments(text, 3, 3)
+        if end == len(text):
+            columns = int(n)
+            if (columns == 1) or (align != 'c'):
+                styles['alignment'] = align
+            text = inner
+    if text.startswith('\\mr{'):
+        (n, _, inner), end = _arguments(text, 3, 3)
+        if end == len(text):
+            rows = int(n)
+            text = inner
+
+    while (len(text) > 1) and (text[-1] == '}'):
+        if text[0] == '{':
+            # braced as text in a siunitx S column
+            if _group(text, 0) != len(text):
+                break
+            text = text[1:-1]
+            continue
+        command = text[:text.find('{') + 1]
+        if command in _FLAGS:
+            inner = _unwrap(text, command)
+            styles[_FLAGS[command]] = True
+        elif command in _SIZES:
+            inner = _unwrap(text, command)
+            styles['fontsize'] = _SIZES[command]
+        elif command in ['\\cellcolor{', '\\rotatebox{']:
+            (value, inner), end = _arguments(text, len(command) - 1, 2)
+            if end != len(text):
+                break
+            if command == '\\cellcolor{':
+                styles['color'] = value
+            else:
+                styles['rotation'] = _number(value)
+        elif command[1:-1] in macros:
+            inner = _unwrap(text, command)
+            if inner is not None:
+                styles.update(macros[command[1:-1]])
+        else:
+            break
+        if inner is None:
+            break
+        text = inner
+
+    return text, rows, columns, styles
+
+def _strip_decimal(text, decimal):
+    '''text of a cell without the markup of decimal alignment
+
+    Parameters
+    ----------
+    text : str
+        text of the cell, without its styles
+    decimal : str
+        decimal alignment of the tabular, see Tabular.set_decimal_alignment()
+    '''
+    if decimal == 'S':
+        return _STARS.sub(lambda m: m.group(1) or m.group(2), text)
+    if text.endswith('}') and ('\\phantom{' in text):
+        return text[:text.rindex('\\phantom{')]
+
+    return text
+
+def _style(styles, digits, formatters):
+    '''style of a parsed cell
+
+    Parameters
+    ----------
+    styles : tuple
+        (field, value) of the fields of the Style set
+    digits : int
+        digits of a float, None for other contents
+    formatters : dict
+        formatters by digits, shared by the cells parsed
+    '''
+    fields = dict(styles)
+    if digits is not None:
+        if digits not in formatters:
+            formatters[digits] = format_digits(digits)
+        fields['formatter'] = formatters[digits]
+
+    return Style(**fields)
+
+def _split_rows(body):
+    '''rows of the body of a tabular
+
+    Parameters
+    ----------
+    body : str
+        tex between the column specification and the end of the tabular
+
+    Returns
+    -------
+    rows : list
+        [tex of the cells, space above, space below, lines below] for
+        each row
+    '''
+    parts = _ROW_END.split(body)
+    rows = []
+    above = None
+    current = parts[0]
+    for k in xrange(1, len(parts) - 1, 2):
+        space, text = parts[k], parts[k + 1]
+        current = current.strip()
+        if (current == '') and (space is not None):
+            above = space
+        else:
+            rows.append([current, above, space, None])
+            above = None
+        lines = _LINES.match(text)
+        if lines is not None:
+            if len(rows) > 0:
+                rows[-1][3] = lines.group()
+            text = text[lines.end():]
+        current = text
+    if current.strip() != '':
+        raise ValueError('received {}, expected the end of a row'.format(current.strip()))
+
+    return rows
+
+def _style_macros(preamble):
+    '''styles of the style macros defined before a tabular
+
+    Parameters
+    ----------
+    preamble : str
+        tex between \\begin{ThreePartTable} and the tabular
+    '''
+    macros = {}
+    for match in _MACRO.finditer(preamble):
+        end = _group(preamble, match.end() - 1)
+        text, _, _, styles = _parse_cell(preamble[match.end() - 1:end][1:-1], {})
+        if text != '#1':
+            raise ValueError('received macro {}, expected a style macro'.format(\
+                             match.group(1)))
+        macros[match.group(1)] = styles
+
+    return macros
+
+def _set_lines(cells, lines):
+    '''sets the lines below a row from their tex
+
+    Parameters
+    ----------
+    cells : np.ndarray
+        cells of the row
+    lines : str
+        \\hline or \\cmidrule commands
+    '''
+    hlines = lines.count('\\hline')
+    if hlines > 0:
+        for cell in cells:
+            if not cell.mergedrow:
+                cell.lines = hlines
+        return
+    for match in re.finditer(_LINE, lines):
+        if match.group(2) is None:
+            continue
+        cell = cells[int(match.group(2)) - 1]
+        cell.lines = (cell.lines or 0) + 1
+        cell.narrow = match.group(1) or None
+
+def _set_spans(content, i, j, rows, columns):
+    '''marks the cells merged into a cell spanning rows and columns
+
+    Parameters
+    ----------
+    content : np.ndarray
+        cells of the table
+    i, j : int
+        location of the spanning cell
+    rows, columns : int
+        rows and columns spanned
+    '''
+    cell = content[i,j]
+    cell.rows = rows
+    cell.columns = columns
+    for k in xrange(i, i + rows):
+        for l in xrange(j, j + columns):
+            if (k, l) == (i, j):
+                continue
+            merged = content[k,l]
+            if l > j:
+                merged.mergedrow = True
+            if k > i:
+                merged.mergedcol = True
+            if (k == i) and (rows > 1):
+                merged.rows = rows
+            if (l == j) and (columns > 1):
+                merged.columns = columns
+
+def _parse_environments(prefix, gap):
+    '''environments around a tabular, outermost first
+
+    Parameters
+    ----------
+    prefix : str
+        tex before \\begin{ThreePartTable}
+    gap : str
+        separator following the text after each \\begin
+
+    Returns
+    -------
+    environments : list
+        (name, text after \\begin, tex until the next \\begin)
+    '''
+    matches = list(_BEGIN.finditer(prefix))
+    environments = []
+    for n, match in enumerate(matches):
+        stop = matches[n + 1].start() if n + 1 < len(matches) else len(prefix)
+        segment = prefix[match.end():stop]
+        post = segment[:segment.index(gap)] if gap in segment else segment.rstrip()
+        environments.append((match.group(1), post, segment))
+
+    return environments
+
+def _parse_caption(text, table):
+    '''sets the caption, label and location of a table from the tex
+    introducing it
+
+    Parameters
+    ----------
+    text : str
+        tex holding \\caption{...} and the justification
+    table : Table or LongTable
+        table to set
+    '''
+    start = text.find('\\caption{')
+    if start >= 0:
+        caption = text[start + 9:_group(text, start + 8) - 1]
+        split = caption.rfind(' \\label{')
+        if (split >= 0) and caption.endswith('}'):
+            table.set_label(caption[split + 8:-1])
+            caption = caption[:split]
+        table.set_caption(caption)
+    for loc, just in [('r', '\\raggedleft'), ('l', '\\raggedright')]:
+        if just in text:
+            table.set_location(loc)
+
+def parse_tex(tex, numbers=True):
+    '''parses a table rendered by PyTabular
+
+    Parameters
+    ----------
+    tex : str
+        tex of a Tabular, Table or LongTable, as from as_tex()
+    numbers : bool
+        True to convert numbers to int, and to float formatted to the
+        digits rendered
+
+    Returns
+    -------
+    table : Tabular
+        LongTable for a longtabu, Table inside a table environment,
+        Tabular otherwise, with the contents, styles, spans, lines,
+        spacing, notes and environments rendered
+    '''
+    match = _TABULAR.search(tex)
+    if match is None:
+        raise ValueError('received no tabu, tabular or longtabu environment')
+    tab_type = match.group(1)
+    (spec,), start = _arguments(tex, match.end(), 1)
+    end = tex.index('\\end{{{}}}'.format(tab_type), start)
+    compact = not tex.startswith('\n\n', start)
+    gap = '\n' if compact else '\n\n'
+
+    # environments, style macros and notes
+    threepart = tex.rfind('\\begin{ThreePartTable}', 0, match.start())
+    if threepart < 0:
+        threepart = match.start()
+    macros = _style_macros(tex[threepart:match.start()])
+    environments = _parse_environments(tex[:threepart], gap)
+    # the table environment of a Table is innermost and holds its caption,
+    # other environments named table were added to the table
+    wrapped = (len(environments) > 0) and (environments[-1][0] == 'table') and \
+              ('\\caption{' in environments[-1][2])
+    wrapper = environments.pop() if wrapped else None
+    footer = tex[end:]
+    notes, notesize = [], None
+    if '\\begin{tablenotes}' in footer:
+        notes = footer[footer.index('\\begin{tablenotes}') + 18:\
+                       footer.index('\\end{tablenotes}')].strip()
+        notesize, _, notes = notes.partition('\n')
+        notesize = notesize.strip()[1:]
+        notes = [note.rstrip() for note in _ITEM.split(notes)[1:]]
+
+    # rows, the head of a longtabu repeated as its first rows
+    body = tex[start:end]
+    head, repeats = '', 0
+    if tab_type == 'longtabu' and ('\\endlastfoot' in body):
+        head = body[:body.index('\\endfirsthead')]
+        caption = _group(head, head.index('\\caption{') + 8)
+        headrows = head[head.index('\\\\', caption) + 2:]
+        body = headrows + '\n' + body[body.index('\\endlastfoot') + 12:]
+        repeats = len(_split_rows(headrows))
+    rows = _split_rows(body)
+    if len(rows) == 0:
+        raise ValueError('received no rows')
+
+    segments = _split_alignment(spec)
+    decimal = None
+    if '\\phantom{' in body:
+        decimal = 'r'
+    if (segments is not None) and any(s.strip('|').startswith('S[') for s in segments):
+        decimal = 'S'
+        spec = ''.join(s.replace(s.strip('|'), 'c') if s.strip('|').startswith('S[') \
+                       else s for s in segments)
+
+    # cells, built directly as their content needs no checks
+    ncols = len(segments) if segments is not None else None
+    cells, spans, rowcolors = [], [], []
+    interned, formatters = {}, {}
+    new = TabularCell.__new__
+    for i, (text, above, below, lines) in enumerate(rows):
+        rowcolor = None
+        if text.startswith('\\rowcolor{'):
+            close = _group(text, 9)
+            rowcolor, text = text[10:close - 1], text[close:]
+        rowcolors.append(rowcolor)
+        texts = text.split('&') if '\\&' not in text else re.split(r'(?<!\\)&', text)
+        row = []
+        for text in texts:
+            text = text.strip()
+            if (rowcolor is None) and (text[:1] not in _COMMANDS):
+                styles, nrows, ncolumns = (), 1, 1
+            else:
+                text, nrows, ncolumns, fields = _parse_cell(text, macros)
+                if rowcolor is not None:
+                    fields.setdefault('color', rowcolor)
+                styles = tuple(sorted(fields.items()))
+            if decimal is not None:
+                text = _strip_decimal(text, decimal)
+            content, digits = text, None
+            if numbers and (text[:1] in _NUMBER_START) and (text != '-0'):
+                match = _NUMBER.match(text)
+                if match is not None:
+                    digits = match.group(1)
+                    if digits is None:
+                        content = int(text)
+                    else:
+                        content, digits = float(text), len(digits)
+            style = interned.get((styles, digits))
+            if style is None:
+                style = interned[(styles, digits)] = _style(styles, digits, formatters)
+            cell = new(TabularCell)
+            cell.loc = (i, len(row))
+            cell.content = content
+            cell.isnull = content == ''
+            cell.style = style
+            cell._overrides = None
+            row.append(cell)
+            if (nrows > 1) or (ncolumns > 1):
+                spans.append((i, len(row) - 1, nrows, ncolumns))
+                for _ in xrange(ncolumns - 1):
+                    cell = new(TabularCell)
+                    cell.loc = (i, len(row))
+                    cell.content = ''
+                    cell.isnull = True
+                    cell.style = style
+                    cell._overrides = None
+                    row.append(cell)
+        if ncols is None:
+            ncols = len(row)
+        if len(row) != ncols:
+            raise ValueError('received {} columns in row {}, expected {}'.format(\
+                             len(row), i, ncols))
+        cells.append(row)
+
+    if tab_type == 'longtabu':
+        cls = LongTable
+    elif wrapped:
+        cls = Table
+    else:
+        cls = Tabular
+    content = np.empty((len(cells), ncols), dtype=object)
+    content[:] = cells
+    table = cls(content)
+
+    # spans, lines and spacing
+    for i, j, nrows, ncolumns in spans:
+        _set_spans(content, i, j, nrows, ncolumns)
+    for i, (_, above, below, lines) in enumerate(rows):
+        if lines is not None:
+            _set_lines(content[i], lines)
+        for attr, space in [('space_above', above), ('space_below', below)]:
+            if space is not None:
+                for cell in content[i]:
+                    setattr(cell, attr, space)
+
+    # settings of the table
+    table.set_tab_alignment(spec)
+    table.set_compact(compact)
+    table.set_decimal_alignment(decimal)
+    # hoisting only if the output shows it and keeps the styles left in
+    # the cells in them
+    table.set_hoist(True)
+    alignment, alignments, hoisted = table._hoist_styles()
+    if (alignment != spec) or (hoisted != rowcolors) or \
+        not any(val is not None for val in (alignments or []) + hoisted):
+        table.set_hoist(False)
+    if tab_type != 'longtabu':
+        table._set_tab_type(tab_type)
+    for name, post, _ in reversed(environments):
+        table.add_environment(name, post)
+    if not compact:
+        depth = table.depth + int(cls is Table)
+        line = body.lstrip('\n').split('\n', 1)[0]
+        table.set_indent((len(line) - len(line.lstrip(' ')))//depth)
+    for note in notes:
+        table.add_note(note, notesize)
+    if cls is Table:
+        _parse_caption(wrapper[2], table)
+    elif cls is LongTable:
+        _parse_caption(head, table)
+        table.set_repeats(repeats)
+
+    return table
+
+def read_tex(filename, numbers=True):
+    '''reads a table written by PyTabular, with its fragments
+
+    Parameters
+    ----------
+    filename : str
+        name of the tex file, see Tabular.write() and LongTable.write()
+    numbers : bool
+        True to convert numbers to int and float, see parse_tex()
+
+    Returns
+    -------
+    table : Tabular
+        see parse_tex()
+    '''
+    with open(filename) as texfile:
+        tex = texfile.read()
+    root = os.path.dirname(os.path.abspath(filename))
+
+    def fragment(match):
+        name = match.group(1) or match.group(2)
+        if not name.endswith('.tex'):
+            name += '.tex'
+        if not os.path.exists(name):
+            name = os.path.join(root, os.path.basename(name))
+        with open(name) as fragmentfile:
+            return fragmentfile.read().rstrip('\n')
+
+    return parse_tex(_INPUT.sub(fragment, _MAKEAT.sub('', tex)), numbers)
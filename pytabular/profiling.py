@@ -0,0 +1,204 @@
+'''
+Render Profiling for PyTabular Package
+--------------------------------------
+
+Records where the time of building and rendering tables goes::
+
+    with profile() as profiler:
+        table = Table(data)
+        table.as_tex()
+    print(profiler.summary())
+
+The methods implementing the phases time themselves while a profile
+is active in the calling thread, otherwise they only check that none
+is. Times are inclusive, e.g. build_rows contains handle_lines. Each
+thread has its own active profile; fragments written by worker
+processes are not recorded.
+'''
+
+from __future__ import print_function, division
+
+# Standard Library
+import heapq
+import time
+
+# Local packages
+import tables
+
+# phase names, timed by the methods of tables decorated with _phase()
+PHASES = ['handle_content', 'handle_lines', 'format_cells', 'hoist_styles',
+          'align_decimals', 'style_macros', 'set_header', 'build_rows',
+          'build_head', 'set_footer', 'handle_environments']
+
+def _formatter_name(formatter):
+    '''module and name of a formatter
+
+    Parameters
+    ----------
+    formatter : function
+        formatter of cells
+    '''
+    name = getattr(formatter, '__name__', type(formatter).__name__)
+    module = getattr(formatter, '__module__', None)
+
+    return name if module in [None, '__builtin__'] else '{}.{}'.format(module, name)
+
+class Profiler(object):
+    '''timings of the phases of building and rendering tables
+
+    Parameters
+    ----------
+    slowest : int
+        number of slowest rows kept
+
+    ** Attributes **
+    phases : dict
+        {'calls', 'seconds'} by phase name
+    formatters : dict
+        {'name', 'calls', 'cells', 'vectorized', 'seconds'} by formatter
+    rows : list
+        (seconds, row index) of the slowest rows rendered, slowest first
+    '''
+
+    def __init__(self, slowest=10):
+        if (not isinstance(slowest, int)) or (slowest < 0):
+            raise ValueError('received {}, expected non-negative int'.format(slowest))
+        self.slowest = slowest
+        self.phases = {}
+        self.formatters = {}
+        self._rows = []
+
+    def timed(self, name, method, *args, **kwargs):
+        '''calls a method, recording its time and call under a phase
+
+        Parameters
+        ----------
+        name : str
+            phase name, see PHASES
+        method : function
+            method to call
+        args, kwargs : arguments
+            arguments of the method
+        '''
+        record = self.phases.setdefault(name, {'calls':0, 'seconds':0.})
+        start = time.time()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            record['calls'] += 1
+            record['seconds'] += time.time() - start
+
+    def start(self):
+        '''activates the profiler in the calling thread
+        '''
+        if tables._profiler() is not None:
+            raise RuntimeError('a profiler is already active')
+        tables._PROFILING.profiler = self
+
+    def stop(self):
+        '''deactivates the profiler in the calling thread
+        '''
+        if tables._profiler() is self:
+            tables._PROFILING.profiler = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def add_formatter(self, formatter, cells, vectorized, seconds):
+        '''records a call of a formatter on a group of cells
+
+        Parameters
+        ----------
+        formatter : function
+            formatter called
+        cells : int
+            number of cells formatted
+        vectorized : bool
+            True if its vectorized version formatted them in one call
+        seconds : float
+            time taken
+        '''
+        record = self.formatters.get(formatter)
+        if record is None:
+            record = {'name':_formatter_name(formatter), 'calls':0, 'cells':0,
+                      'vectorized':0, 'seconds':0.}
+            self.formatters[formatter] = record
+        record['calls'] += 1
+        record['cells'] += cells
+        record['vectorized'] += cells if vectorized else 0
+        record['seconds'] += seconds
+
+    def add_row(self, row, seconds):
+        '''records the time taken to render a row
+
+        Parameters
+        ----------
+        row : int
+            index of the row in its table
+        seconds : float
+            time taken
+        '''
+        if len(self._rows) < self.slowest:
+            heapq.heappush(self._rows, (seconds, row))
+        elif (self.slowest > 0) and (seconds > self._rows[0][0]):
+            heapq.heapreplace(self._rows, (seconds, row))
+
+    @property
+    def rows(self):
+        return sorted(self._rows, reverse=True)
+
+    def report(self):
+        '''structured report of the timings
+
+        Returns
+        -------
+        report : dict
+            'phases' and 'formatters', lists of records sorted by time,
+            and 'rows', the slowest rows as {'row', 'seconds'}
+        '''
+        phases = [dict(record, phase=name) for name, record in self.phases.items() \
+                  if record['calls'] > 0]
+        formatters = [dict(record) for record in self.formatters.values()]
+
+        return {'phases':sorted(phases, key=lambda r: -r['seconds']),
+                'formatters':sorted(formatters, key=lambda r: -r['seconds']),
+                'rows':[{'row':row, 'seconds':seconds} for seconds, row in self.rows]}
+
+    def summary(self):
+        '''report as text
+        '''
+        report = self.report()
+        lines = ['{:<24}{:>10}{:>12}'.format('phase', 'calls', 'seconds')]
+        for r in report['phases']:
+            lines.append('{:<24}{:>10}{:>12.4f}'.format(r['phase'], r['calls'],
+                                                        r['seconds']))
+        lines.append('')
+        lines.append('{:<40}{:>10}{:>12}{:>12}'.format('formatter', 'cells',
+                                                       'vectorized', 'seconds'))
+        for r in report['formatters']:
+            lines.append('{:<40}{:>10}{:>12}{:>12.4f}'.format(r['name'][:39],
+                         r['cells'], r['vectorized'], r['seconds']))
+        lines.append('')
+        lines.append('slowest rows: ' + ', '.join('{} ({:.2e}s)'.format(\
+                     r['row'], r['seconds']) for r in report['rows']))
+
+        return '\n'.join(lines)
+
+def profile(slowest=10):
+    '''profiler recording tables built and rendered in a with block
+
+    Parameters
+    ----------
+    slowest : int
+        number of slowest rows kept
+
+    Returns
+    -------
+    profiler : Profiler
+        context manager, see Profiler.report()
+    '''
+    return Profiler(slowest)
@@ -0,0 +1,421 @@
+'''
+Conditional Formatting Rules for Package PyTabular
+--------------------------------------------------
+'''
+
+import numpy as np
+
+def float_values(cells):
+    '''numeric values of cells
+
+    Parameters
+    ----------
+    cells : np.ndarray
+        dtype = object, filled with TabularCell instances
+
+    Returns
+    -------
+    values : np.ndarray
+        dtype = float, same shape as `cells`, NaN where a cell is null
+        or not numeric
+    '''
+    contents = [c.content for c in cells.flat]
+
+    try:
+        values = np.array(contents, dtype=float)
+    except (TypeError, ValueError):
+        values = np.array([_to_float(c) for c in contents], dtype=float)
+
+    return values.reshape(cells.shape)
+
+def _to_float(val):
+    '''converts a value to float, NaN if not numeric
+
+    Parameters
+    ----------
+    val : scalar type
+        value to convert
+    '''
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return np.nan
+
+def _style_cells(cells, styles, applied):
+    '''sets styles of cells, recording their previous styles
+
+    The setters run once per distinct style of the cells, the other
+    cells of that style are given the same interned Style
+
+    Parameters
+    ----------
+    cells : iterable
+        TabularCell instances to style
+    styles : dict
+        style names and values, see Rule
+    applied : list
+        list to which (cells, previous Styles, style names) are appended
+    '''
+    cells = list(cells)
+    previous = [cell.style for cell in cells]
+    restyled = {}
+    for cell, before in zip(cells, previous):
+        style = restyled.get(before)
+        if style is None:
+            for name, value in styles.items():
+                if name == 'color':
+                    if isinstance(value, tuple):
+                        cell.set_color(*value)
+                    else:
+                        cell.set_color(value)
+                else:
+                    getattr(cell, 'set_' + name)(value)
+            restyled[before] = cell.style
+        else:
+            cell.style = style
+    applied.append((cells, previous, tuple(styles)))
+
+def _restore_cells(applied):
+    '''restores styles recorded by _style_cells(), keeping styles set on
+    the cells since which the rule does not set
+
+    Parameters
+    ----------
+    applied : list
+        (cells, previous Styles, style names) recorded
+    '''
+    for cells, previous, names in reversed(applied):
+        restored = {}
+        for cell, before in zip(cells, previous):
+            key = (cell.style, before)
+            style = restored.get(key)
+            if style is None:
+                style = cell.style
+                for name in names:
+                    style = style.replace(name, getattr(before, name))
+                restored[key] = style
+            cell.style = style
+
+def _styled_cells(rule):
+    '''cells styled by the last application of a rule
+
+    Parameters
+    ----------
+    rule : Rule, Best or Heatmap
+        rule applied
+    '''
+    return [cell for cells, _, _ in rule.applied for cell in cells]
+
+def _check_styles(styles):
+    '''validates the styles of a rule
+
+    Parameters
+    ----------
+    styles : dict
+        style names and values
+    '''
+    for style in styles:
+        if style not in Rule.valid_styles:
+            raise ValueError('{} not a valid style for a rule'.format(style))
+    if len(styles) == 0:
+        raise ValueError('rule requires at least one style')
+
+class Rule(object):
+    '''style applied to the cells of a region whose values satisfy a
+    predicate
+
+    Parameters
+    ----------
+    predicate : function
+        takes an array of the values of the region (float, NaN for null
+        or non-numeric cells) and returns a boolean array of the same
+        shape, e.g. lambda x: x < 0
+    region : index
+        cells the rule applies to, any index of a table, e.g.
+        np.s_[1:, 2:], None for the whole table
+    styles : keyword arguments
+        styles of matching cells: bold, emph, underline (bool), color
+        (str, or tuple of color and opacity) and fontsize (str)
+    '''
+
+    valid_styles = ['bold', 'emph', 'underline', 'color', 'fontsize']
+
+    def __init__(self, predicate, region=None, **styles):
+        if not hasattr(predicate, '__call__'):
+            raise ValueError('received {}, expected callable'.format(type(predicate)))
+        _check_styles(styles)
+
+        self.predicate = predicate
+        self.region = region
+        self.styles = styles
+        self.applied = []
+
+    def mask(self, values):
+        '''evaluates the predicate
+
+        Parameters
+        ----------
+        values : np.ndarray
+            values of the region
+
+        Returns
+        -------
+        mask : np.ndarray
+            dtype = bool, True for matching cells
+        '''
+        with np.errstate(invalid='ignore'):
+            mask = np.asarray(self.predicate(values), dtype=bool)
+        if mask.shape != values.shape:
+            raise ValueError('predicate returned shape {}, expected {}'.format(\
+                             mask.shape, values.shape))
+
+        return mask
+
+    def apply(self, cells, values):
+        '''styles the matching cells, recording their previous styles
+
+        Parameters
+        ----------
+        cells : np.ndarray
+            dtype = object, TabularCell instances of the region
+        values : np.ndarray
+            values of the region
+        '''
+        _style_cells(cells[self.mask(values)], self.styles, self.applied)
+
+    def undo(self):
+        '''restores the styles of the cells styled by the last apply()
+        '''
+        _restore_cells(self.applied)
+        self.applied = []
+
+class Best(object):
+    '''styles the best values of each column or row of a region
+
+    Parameters
+    ----------
+    region : index
+        cells to rank, any index of a table, None for the whole table
+    axis : int
+        0 to rank within each column, 1 within each row
+    direction : str or list
+        'max' if higher is better, 'min' if lower is better, or a list
+        with one of them for each column (row if `axis` is 1)
+    styles : list
+        dict of styles for each rank, see Rule, by default bold for the
+        best and underline for the second best
+    ties : str
+        'all' to style every cell tied with a ranked value, so that a
+        tie for best leaves no second best, 'first' to give the next
+        rank to the later cells of a tie
+    '''
+
+    def __init__(self, region=None, axis=0, direction='max', styles=None, 
+                 ties='all'):
+        if styles is None:
+            styles = [{'bold':True}, {'underline':True}]
+        if axis not in [0, 1]:
+            raise ValueError('axis must be 0 or 1, received {}'.format(axis))
+        if ties not in ['all', 'first']:
+            raise ValueError('ties must be all or first, received {}'.format(ties))
+        directions = [direction] if isinstance(direction, str) else direction
+        for d in directions:
+            if d not in ['max', 'min']:
+                raise ValueError('direction must be max or min, received {}'.format(d))
+        for style in styles:
+            _check_styles(style)
+
+        self.region = region
+        self.axis = axis
+        self.direction = direction
+        self.styles = styles
+        self.ties = ties
+        self.applied = []
+
+    def ranks(self, values):
+        '''ranks of the values
+
+        Parameters
+        ----------
+        values : np.ndarray
+            values of the region, 1-d or 2-d
+
+        Returns
+        -------
+        ranks : np.ndarray
+            dtype = int, same shape as `values`, 0 for the best, 1 for
+            the second best, ..., -1 for cells not ranked
+        '''
+        shape = values.shape
+        values = values.reshape((-1, 1)) if values.ndim < 2 else values
+        if self.axis == 1:
+            values = values.T
+
+        sign = np.where(np.array(self.direction) == 'max', 1., -1.)
+        if sign.size not in [1, values.shape[1]]:
+            raise ValueError('expected a direction for each of {} vectors'.format(\
+                             values.shape[1]))
+        score = np.where(np.isfinite(values), values*sign, -np.inf)
+
+        k = min(len(self.styles), score.shape[0])
+        top = np.argpartition(-score, range(k), axis=0)[:k]
+        best = score[top, np.arange(score.shape[1])]
+
+        ranks = np.empty(score.shape, dtype=int)
+        ranks.fill(-1)
+        for r in xrange(k):
+            tied = (score == best[r]) & (ranks < 0) & np.isfinite(score)
+            if self.ties == 'first':
+                tied &= np.cumsum(tied, axis=0) == 1
+            ranks[tied] = r
+
+        if self.axis == 1:
+            ranks = ranks.T
+
+        return ranks.reshape(shape)
+
+    def apply(self, cells, values):
+        '''styles the ranked cells, recording their previous styles
+
+        Parameters
+        ----------
+        cells : np.ndarray
+            dtype = object, TabularCell instances of the region
+        values : np.ndarray
+            values of the region
+        '''
+        ranks = self.ranks(values)
+        for r, styles in enumerate(self.styles):
+            _style_cells(cells[ranks == r], styles, self.applied)
+
+    def undo(self):
+        '''restores the styles of the cells styled by the last apply()
+        '''
+        _restore_cells(self.applied)
+        self.applied = []
+
+class Heatmap(object):
+    '''colors the cells of a region by their values
+
+    Values are normalized between `vmin` and `vmax` and quantized to
+    `levels` opacities of the colors in `cmap`. The result is kept as an
+    array of color codes indexing a small palette of color strings
+    shared by the cells.
+
+    Parameters
+    ----------
+    region : index
+        cells to color, any index of a table, None for the whole table
+    cmap : str or tuple
+        a color for a sequential map, from no color at `vmin` to full
+        color at `vmax`, or a tuple (low, high) of colors for a diverging
+        map, full `low` at `vmin`, no color at `center` and full `high`
+        at `vmax`
+    vmin : float
+        value mapped to the low end, None for the minimum of the region
+    vmax : float
+        value mapped to the high end, None for the maximum of the region
+    levels : int
+        number of opacities for each color, between 1 and 100
+    center : float
+        value without color in a diverging map, None for the middle of
+        `vmin` and `vmax`
+    '''
+
+    def __init__(self, region=None, cmap=('blue', 'red'), vmin=None, vmax=None, 
+                 levels=10, center=None):
+        if isinstance(cmap, str):
+            cmap = (cmap,)
+        if (not isinstance(cmap, tuple)) or (len(cmap) not in [1, 2]) or \
+            (not all(isinstance(color, str) for color in cmap)):
+            raise ValueError('cmap must be a color or a tuple of two colors')
+        if (not isinstance(levels, int)) or (levels < 1) or (levels > 100):
+            raise ValueError('levels must be an int between 1 and 100')
+
+        self.region = region
+        self.cmap = cmap
+        self.vmin = vmin
+        self.vmax = vmax
+        self.levels = levels
+        self.center = center
+        self.palette = self._palette()
+        self.codes = None
+        self.applied = []
+
+    def _palette(self):
+        '''color strings indexed by color code, None for code 0
+        '''
+        palette = [None]
+        for color in self.cmap:
+            for level in xrange(1, self.levels + 1):
+                opacity = int(round(100*level/float(self.levels)))
+                palette.append('{}!{}'.format(color, opacity))
+
+        return palette
+
+    def quantize(self, values):
+        '''color codes of values
+
+        Parameters
+        ----------
+        values : np.ndarray
+            values of the region
+
+        Returns
+        -------
+        codes : np.ndarray
+            dtype = uint8, indices into the palette, 0 for no color
+        '''
+        finite = np.isfinite(values)
+        codes = np.zeros(values.shape, dtype=np.uint8)
+        if not finite.any():
+            return codes
+
+        vmin = values[finite].min() if self.vmin is None else self.vmin
+        vmax = values[finite].max() if self.vmax is None else self.vmax
+        clipped = np.clip(np.where(finite, values, vmin), vmin, vmax)
+
+        if len(self.cmap) == 1:
+            scaled = (clipped - vmin)/float(max(vmax - vmin, 1e-300))
+            codes[:] = np.round(scaled*self.levels)
+        else:
+            center = (vmin + vmax)/2. if self.center is None else self.center
+            low = (center - clipped)/float(max(center - vmin, 1e-300))
+            high = (clipped - center)/float(max(vmax - center, 1e-300))
+            low = np.round(np.clip(low, 0, 1)*self.levels).astype(int)
+            high = np.round(np.clip(high, 0, 1)*self.levels).astype(int)
+            codes[:] = np.where(high > 0, high + self.levels, low)
+
+        codes[~finite] = 0
+
+        return codes
+
+    def apply(self, cells, values):
+        '''colors the cells, recording their previous colors
+
+        Parameters
+        ----------
+        cells : np.ndarray
+            dtype = object, TabularCell instances of the region
+        values : np.ndarray
+            values of the region
+        '''
+        self.codes = self.quantize(values)
+        colored = self.codes > 0
+        cells = list(cells[colored])
+        previous = [cell.style for cell in cells]
+        self.applied = [(cells, previous, ('color',))]
+
+        # one interned Style per distinct style and color
+        palette, recolored = self.palette, {}
+        for cell, before, code in zip(cells, previous, self.codes[colored].tolist()):
+            style = recolored.get((before, code))
+            if style is None:
+                style = recolored[(before, code)] = before.replace('color', palette[code])
+            cell.style = style
+
+    def undo(self):
+        '''restores the colors of the cells colored by the last apply()
+        '''
+        _restore_cells(self.applied)
+        self.applied = []
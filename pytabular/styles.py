@@ -0,0 +1,347 @@
+'''
+Cell Styles for Package PyTabular
+---------------------------------
+
+Cells share interned, immutable Style objects: cells styled alike
+reference the same Style, whose wrapper around the formatted content,
+e.g. '\\textbf{\\small{%s}}', is compiled once when the style is first
+created, and with a cell's \\multirow and \\multicolumn on its first
+render (Style.compile()). Styles are replaced, never modified, when a
+cell is styled, so that compiled templates never go stale.
+
+Stylesheets are sets of styles for regions of tables, which may be
+registered under a name and applied to many tables::
+
+    sheet = Stylesheet(name='results')
+    sheet.add('0', bold=True)
+    sheet.add('1:', '1:', digits=2, alignment='r')
+    sheet.apply(table1, table2)
+    table3.apply_stylesheet('results')
+'''
+
+# Standard Library
+import weakref
+
+# Third Party
+import numpy as np
+
+def _wrap_style(val, key):
+    '''wraps a value in the styles of a style key
+
+    Parameters
+    ----------
+    val : str
+        formatted content
+    key : tuple
+        style key, see Style.key
+    '''
+    color, fontsize, bold, emph, underline, rotation = key
+
+    if color is not None:
+        val = '\\cellcolor{{{}}}{{{}}}'.format(color, val)
+
+    if fontsize is not None:
+        val = '\\{}{{{}}}'.format(fontsize, val)
+
+    environments = {'\\textbf{':bold, '\\emph{':emph,
+            '\\uline{':underline}
+
+    for env in environments:
+        if environments[env]:
+            val = env + val + '}'
+
+    if rotation is not None:
+        val = '\\rotatebox{{{}}}{{{}}}'.format(rotation, val)
+
+    return val
+
+def _parse_index(index):
+    '''parses a row or column index of a style, e.g. 0, '1:', '::2'
+
+    Parameters
+    ----------
+    index : int, slice or str
+        index or slice
+    '''
+    if isinstance(index, (int, slice)):
+        return index
+    parts = [int(p) if p.strip() else None for p in str(index).split(':')]
+    if len(parts) == 1:
+        return parts[0]
+    if len(parts) > 3:
+        raise ValueError('received {}, expected an int or slice'.format(index))
+
+    return slice(*parts)
+
+class Style(object):
+    '''immutable style of cells, interned so that equal styles are the
+    same object
+
+    Parameters
+    ----------
+    color : str
+        color of the cell, e.g. 'gray!50', None for none
+    fontsize : str
+        font size, None to retain the fontsize of the outer environment
+    bold, emph, underline : bool
+        True to bold, emphasize or underline
+    rotation : int
+        angle of rotation, None if not rotated
+    alignment : str
+        alignment, None to retain the alignment of the column
+    formatter : function
+        function formatting the content to a string
+
+    ** Attributes **
+    key : tuple
+        (color, fontsize, bold, emph, underline, rotation), the styles
+        wrapped around the formatted content
+    prefix, suffix : str
+        compiled wrapper, placed before and after the formatted content
+    '''
+
+    __slots__ = ('color', 'fontsize', 'bold', 'emph', 'underline', 'rotation',
+                 'alignment', 'formatter', 'key', 'prefix', 'suffix',
+                 '_replaced', '_compiled', '__weakref__')
+
+    fields = ('color', 'fontsize', 'bold', 'emph', 'underline', 'rotation',
+              'alignment', 'formatter')
+
+    # interned styles by values, dropped once no cell references them
+    _interned = weakref.WeakValueDictionary()
+
+    def __new__(cls, color=None, fontsize=None, bold=False, emph=False,
+                underline=False, rotation=None, alignment=None, formatter=str):
+        values = (color, fontsize, bold, emph, underline, rotation, alignment,
+                  formatter, type(rotation))
+        style = cls._interned.get(values)
+        if style is not None:
+            return style
+
+        style = object.__new__(cls)
+        for name, value in zip(cls.fields, values):
+            object.__setattr__(style, name, value)
+        key = values[:6]
+        prefix, suffix = _wrap_style('\x00', key).split('\x00')
+        object.__setattr__(style, 'key', key)
+        object.__setattr__(style, 'prefix', prefix)
+        object.__setattr__(style, 'suffix', suffix)
+        object.__setattr__(style, '_replaced', {})
+        object.__setattr__(style, '_compiled', {})
+        cls._interned[values] = style
+
+        return style
+
+    def __setattr__(self, name, value):
+        raise AttributeError('styles are immutable, use replace()')
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return (Style, tuple(getattr(self, name) for name in self.fields))
+
+    def __repr__(self):
+        changed = ['{}={!r}'.format(name, getattr(self, name)) for name in \
+                   self.fields if getattr(self, name) != getattr(DEFAULT_STYLE, name)]
+        return 'Style({})'.format(', '.join(changed))
+
+    @property
+    def template(self):
+        '''wrapper around the formatted content, e.g. '\\textbf{%s}'
+        '''
+        return self.prefix + '%s' + self.suffix
+
+    def wrap(self, val):
+        '''wraps formatted content in the style
+
+        Parameters
+        ----------
+        val : str
+            formatted content
+        '''
+        return self.prefix + val + self.suffix
+
+    def compile(self, rows=1, columns=1, hoisted=()):
+        '''template rendering the formatted content of a cell of the
+        style, built once for each span and hoisted styles
+
+        Parameters
+        ----------
+        rows, columns : int
+            rows and columns spanned by the cell
+        hoisted : tuple
+            names of styles applied by the enclosing tabular, see
+            TabularCell.as_tex()
+
+        Returns
+        -------
+        template : tuple
+            (prefix, suffix) around the formatted content, (prefix,
+            suffix) of the \\multirow and \\multicolumn only, around a
+            style macro, and the style key wrapped
+        '''
+        template = self._compiled.get((rows, columns, hoisted))
+        if template is not None:
+            return template
+
+        style = self.replace('color', None) if 'color' in hoisted else self
+        align = 'c' if self.alignment is None else self.alignment
+        multicolumn = (columns > 1) | ((self.alignment is not None) & \
+                                       ('alignment' not in hoisted))
+        outer = '\x00'
+        if rows > 1:
+            outer = '\\mr{{{}}}{{*}}{{{}}}'.format(rows, outer)
+        if multicolumn:
+            outer = '\\mc{{{}}}{{{}}}{{{}}}'.format(columns, align, outer)
+        elif 'text' in hoisted:
+            outer = '{{{}}}'.format(outer)
+        outer = tuple(outer.split('\x00'))
+
+        template = (outer[0] + style.prefix, style.suffix + outer[1], outer, style.key)
+        self._compiled[(rows, columns, hoisted)] = template
+
+        return template
+
+    def replace(self, name, value):
+        '''style with one field replaced
+
+        Parameters
+        ----------
+        name : str
+            field, see Style.fields
+        value : object
+            value of the field
+
+        Returns
+        -------
+        style : Style
+            interned style, remembered by this style unless `name` is
+            'formatter'
+        '''
+        transition = (name, value, type(value))
+        style = self._replaced.get(transition)
+        if style is None:
+            if name not in self.fields:
+                raise ValueError('{} not a valid style'.format(name))
+            values = {field:getattr(self, field) for field in self.fields}
+            values[name] = value
+            style = Style(**values)
+            if name != 'formatter':
+                self._replaced[transition] = style
+
+        return style
+
+DEFAULT_STYLE = Style()
+
+class Stylesheet(object):
+    '''styles of regions of tables, applied to many tables at once
+
+    Parameters
+    ----------
+    styles : list
+        dicts of styles with the region they apply to, 'rows' and 'cols'
+        as ints, slices or strings like '1:', see add()
+    name : str
+        name to register the stylesheet under, None to not register it
+    '''
+
+    valid_styles = ['bold', 'emph', 'underline', 'color', 'fontsize',
+                    'alignment', 'rotation', 'formatter', 'digits']
+
+    # stylesheets by name
+    registry = {}
+
+    def __init__(self, styles=[], name=None):
+        self.name = name
+        self.regions = []
+        for style in styles:
+            style = dict(style)
+            rows, cols = style.pop('rows', ':'), style.pop('cols', ':')
+            self.add(rows, cols, **style)
+        if name is not None:
+            Stylesheet.registry[name] = self
+
+    @classmethod
+    def get(cls, name):
+        '''registered stylesheet
+
+        Parameters
+        ----------
+        name : str
+            name of the stylesheet
+        '''
+        if name not in cls.registry:
+            raise ValueError('received {}, expected one of {}'.format(name,
+                             sorted(cls.registry)))
+
+        return cls.registry[name]
+
+    def add(self, rows=':', cols=':', **styles):
+        '''adds styles of a region
+
+        Parameters
+        ----------
+        rows, cols : int, slice or str
+            rows and columns of the region, e.g. 0, slice(1, None), '::2'
+        styles : keyword arguments
+            bold, emph, underline (bool), color (str, or tuple of color
+            and opacity), fontsize, alignment (str), rotation (int),
+            formatter (function) or digits (int)
+        '''
+        for style in styles:
+            if style not in self.valid_styles:
+                raise ValueError('{} not a valid style'.format(style))
+        if len(styles) == 0:
+            raise ValueError('received no styles')
+
+        self.regions.append((_parse_index(rows), _parse_index(cols), styles))
+
+        return self
+
+    def _restyle(self, cell, styles):
+        '''styles a cell through its setters, validating the styles
+
+        Parameters
+        ----------
+        cell : TabularCell
+            cell to style
+        styles : dict
+            style names and values
+        '''
+        for style, value in styles.items():
+            if style == 'color' and isinstance(value, (tuple, list)):
+                cell.set_color(*value)
+            else:
+                getattr(cell, 'set_' + style)(value)
+
+    def apply(self, *tables):
+        '''styles the regions of tables
+
+        Cells sharing a style before a region is styled share it after,
+        so the setters run once per distinct style of the region.
+
+        Parameters
+        ----------
+        tables : Tabular
+            tables to style
+        '''
+        for rows, cols, styles in self.regions:
+            restyled = {}
+            for table in tables:
+                if table._shared is not None:
+                    table._own((rows, cols))
+                cells = table.content[rows, cols]
+                if not isinstance(cells, np.ndarray):
+                    cells = [cells]
+                for cell in np.ravel(cells):
+                    style = restyled.get(cell.style)
+                    if style is None:
+                        before = cell.style
+                        self._restyle(cell, styles)
+                        restyled[before] = cell.style
+                    else:
+                        cell.style = style
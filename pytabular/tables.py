@@ -29,6 +29,19 @@ __docformat__ = 'restructeredtext'
 __version__ = '0.1.3'
 
 # Standard Library
+import copy
+import cPickle
+import csv
+import functools
+import itertools
+import json
+import multiprocessing
+import operator
+import os
+import struct
+import sys
+import threading
+import time
 import warnings
 
 # Third Party
@@ -36,11 +49,311 @@ import numpy as np
 
 # Local packages
 from formatting import *
+from formatting import _formatter_spec, _formatter_from_spec
 from operators import *
+from rules import *
+from rules import _styled_cells
+from styles import *
+from styles import _wrap_style
 
 def version():
     print(__version__)
 
+def _most_common(counts):
+    '''most common key of a dict of counts, ties broken by key
+
+    Parameters
+    ----------
+    counts : dict
+        counts of each key
+
+    Returns
+    -------
+    key : object
+        None if `counts` is empty
+    '''
+    if len(counts) == 0:
+        return None
+    return sorted(counts.items(), key=lambda item: (-item[1], item[0]))[0][0]
+
+def _ismissing(val):
+    '''True if a value is missing (None or NaN)
+
+    Parameters
+    ----------
+    val : scalar type
+        value to check
+    '''
+    return (val is None) or (isinstance(val, (float, np.floating)) and (val != val))
+
+# contents of an array of cells, as an array of dtype object
+_contents = np.frompyfunc(operator.attrgetter('content'), 1, 1)
+
+def _missing_values(values, empty=False):
+    '''mask of missing values (None or NaN) of an array of dtype object
+
+    Parameters
+    ----------
+    values : np.ndarray
+        dtype = object
+    empty : bool
+        True to count empty strings as missing, as for null cells
+    '''
+    # NaN is the only value unequal to itself, None and '' are falsy
+    mask = values != values
+    falsy = ~values.astype(bool)
+    if falsy.any():
+        candidates = values[falsy]
+        missing = candidates == None
+        if empty:
+            missing |= candidates == ''
+        mask[falsy] = missing
+
+    return mask
+
+def _missing_mask(columns, empty=False):
+    '''mask of missing values (None, NaN or masked) of typed columns
+
+    Parameters
+    ----------
+    columns : list
+        array of each column in its native dtype, see _typed_array()
+    empty : bool
+        True to count empty strings as missing, as for null cells
+
+    Returns
+    -------
+    mask : np.ndarray
+        dtype = bool, a column for each column, True where a value is
+        missing
+    '''
+    masks = []
+    for column in columns:
+        if column.dtype.kind == 'f':
+            masks.append(np.isnan(column))
+        elif column.dtype == object:
+            masks.append(_missing_values(column, empty))
+        elif empty and (column.dtype.kind == 'S'):
+            masks.append(column == '')
+        else:
+            masks.append(np.zeros(len(column), dtype=bool))
+
+    return np.column_stack(masks)
+
+def _null_mask(cells):
+    '''mask of null cells, whose content is missing or empty, computed
+    for their contents at once, see _missing_mask()
+
+    Parameters
+    ----------
+    cells : np.ndarray
+        dtype = object, filled with TabularCell instances
+
+    Returns
+    -------
+    mask : np.ndarray
+        dtype = bool, same shape as `cells`, True where a cell is null
+    '''
+    return _missing_values(_contents(cells), empty=True)
+
+def _sizeof(obj, seen):
+    '''size of an object in bytes, 0 if already counted
+
+    Parameters
+    ----------
+    obj : object
+        object to measure, arrays with the data they own
+    seen : set
+        ids of the objects counted, updated
+    '''
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    return sys.getsizeof(obj)
+
+def _function_size(func, seen):
+    '''size of a function with its closure, defaults and attributes
+
+    Parameters
+    ----------
+    func : callable
+        function to measure
+    seen : set
+        ids of the objects counted, updated
+    '''
+    size = _sizeof(func, seen)
+    if size == 0:
+        return 0
+    parts = list(getattr(func, '__defaults__', None) or [])
+    for cell in getattr(func, '__closure__', None) or []:
+        parts.extend([cell, cell.cell_contents])
+    attrs = getattr(func, '__dict__', {})
+    size += _sizeof(attrs, seen) if len(attrs) > 0 else 0
+    for part in parts + attrs.values():
+        if hasattr(part, '__code__'):
+            size += _function_size(part, seen)
+        else:
+            size += _sizeof(part, seen)
+
+    return size
+
+def _override_property(name, default):
+    '''attribute of a cell stored in its overrides, default unless set
+
+    Parameters
+    ----------
+    name : str
+        name of the attribute
+    default : object
+        value of cells on which it was not set
+    '''
+    def fget(self):
+        overrides = self._overrides
+        return default if overrides is None else overrides.get(name, default)
+
+    def fset(self, value):
+        if self._overrides is None:
+            self._overrides = {}
+        self._overrides[name] = value
+
+    return property(fget, fset)
+
+def _style_property(name):
+    '''attribute of a cell stored in its interned style
+
+    Parameters
+    ----------
+    name : str
+        field of Style
+    '''
+    def fget(self):
+        return getattr(self.style, name)
+
+    def fset(self, value):
+        style = self.style._replaced.get((name, value, type(value)))
+        self.style = style or self.style.replace(name, value)
+
+    return property(fget, fset)
+
+def _typed_array(values):
+    '''array of values in their native dtype
+
+    Parameters
+    ----------
+    values : sequence
+        scalar values
+
+    Returns
+    -------
+    array : np.ndarray
+        dtype bool, int64, float64 or str when all values are of that
+        kind (ints are float64 among floats or missing values, which
+        become NaN), object otherwise
+    '''
+    kinds = set()
+    for val in values:
+        if val is None:
+            kinds.add('N')
+        elif isinstance(val, (bool, np.bool_)):
+            kinds.add('b')
+        elif isinstance(val, (int, long, np.integer)):
+            kinds.add('i')
+        elif isinstance(val, (float, np.floating)):
+            kinds.add('f')
+        elif isinstance(val, basestring):
+            kinds.add('S')
+        else:
+            kinds.add('O')
+        if len(kinds) > 3:
+            break
+
+    if kinds == set(['b']):
+        return np.array(values, dtype=bool)
+    elif kinds == set(['i']):
+        return np.array(values, dtype=np.int64)
+    elif kinds <= set(['i', 'f', 'N']) and (len(kinds - set(['N'])) > 0):
+        return np.array([np.nan if val is None else val for val in values], \
+                        dtype=np.float64)
+    elif kinds == set(['S']):
+        return np.array(values, dtype=str)
+    return np.array(values, dtype=object)
+
+def _macro_name(number):
+    '''name of the style macro with a given number
+
+    Parameters
+    ----------
+    number : int
+        0 for 'ptA', 1 for 'ptB', ..., 26 for 'ptAA'
+    '''
+    name = ''
+    number += 1
+    while number > 0:
+        number, r = divmod(number - 1, 26)
+        name = chr(65 + r) + name
+
+    return 'pt' + name
+
+def _split_alignment(spec):
+    '''splits a column specification into one segment per column
+
+    Parameters
+    ----------
+    spec : str
+        column specification, e.g. 'c|cc', 'p{3cm}ll', 'X[2l]r'
+
+    Returns
+    -------
+    segments : list or None
+        for each column, the part of `spec` which a \\multicolumn in
+        that column replaces (its rules on the right, and on the left
+        for the first column), None if `spec` uses unsupported syntax
+        such as '@{}', '>{}' or '*{n}{}'
+    '''
+    segments = []
+    lead = ''
+    i = 0
+    while i < len(spec):
+        char = spec[i]
+        if char.isspace():
+            i += 1
+        elif char == '|':
+            if len(segments) == 0:
+                lead += char
+            else:
+                segments[-1] += char
+            i += 1
+        elif char in 'lcrXSpmb':
+            start = i
+            i += 1
+            if char in 'pmb':
+                if (i == len(spec)) or (spec[i] != '{'):
+                    return None
+            opening = '{' if char in 'pmb' else '['
+            if (i < len(spec)) and (spec[i] == opening):
+                closing = '}' if opening == '{' else ']'
+                depth = 0
+                while i < len(spec):
+                    if spec[i] == opening:
+                        depth += 1
+                    elif spec[i] == closing:
+                        depth -= 1
+                    i += 1
+                    if depth == 0:
+                        break
+                if depth != 0:
+                    return None
+            segments.append(lead + spec[start:i])
+            lead = ''
+        else:
+            return None
+
+    if len(segments) == 0:
+        return None
+    segments[-1] += lead
+    return segments
+
 def hstack(*args):
     '''stacks tabular objects horizontally
     
@@ -112,6 +425,502 @@ def vstack(*args):
     
     return Tabular(np.vstack(tables))
 
+def _parse_column(values):
+    '''parses a column of text read from a csv file, deciding its type
+
+    Parameters
+    ----------
+    values : sequence
+        str of each row
+
+    Returns
+    -------
+    column : np.ndarray
+        dtype int64 or float64 when all values parse as such (empty
+        values become NaN in float64), object of str otherwise
+    '''
+    column = np.array(values, dtype=object)
+    empty = column == ''
+    if not empty.all():
+        if not empty.any():
+            try:
+                return column.astype(np.int64)
+            except (TypeError, ValueError):
+                pass
+        try:
+            return np.where(empty, 'nan', column).astype(np.float64)
+        except (TypeError, ValueError):
+            pass
+
+    return column
+
+def _read_chunk(reader, chunksize, ncols):
+    '''reads the next rows of a csv file as parsed columns
+
+    Parameters
+    ----------
+    reader : csv.reader
+        reader of the file
+    chunksize : int
+        number of rows to read, None for all
+    ncols : int
+        number of columns expected, None for any
+
+    Returns
+    -------
+    columns : list
+        dtype = object array of the text of each column, empty at the
+        end of the file
+    '''
+    rows = list(itertools.islice(reader, chunksize))
+    if len(rows) == 0:
+        return []
+    if ncols is None:
+        ncols = len(rows[0])
+    for i, row in enumerate(rows):
+        if len(row) != ncols:
+            raise ValueError('received {} fields in row {}, expected {}'.format(\
+                             len(row), i, ncols))
+
+    return [np.array(values, dtype=object) for values in zip(*rows)]
+
+# saved tables start with this string, then the length of their header
+_SAVE_MAGIC = '\x93PYTABULAR\x01'
+
+# arrays of saved tables start at multiples of this many bytes
+_SAVE_ALIGNMENT = 64
+
+# attributes of tables not saved as metadata
+_UNSAVED = ['content', 'shape', 'original_content', 'rules', 'fields', '_typed', 
+            '_shared', '_revision', '_nulls']
+
+# kinds of cell contents saved
+_NONE, _STR, _INT, _FLOAT, _BOOL, _OBJECT = range(6)
+
+def _blob(strings):
+    '''strings concatenated into bytes, with their offsets
+
+    Parameters
+    ----------
+    strings : list
+        str instances
+
+    Returns
+    -------
+    blob : tuple
+        (np.ndarray of dtype uint8, np.ndarray of dtype int64 of the
+        len(strings) + 1 offsets)
+    '''
+    offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(val) for val in strings])
+    joined = ''.join(strings)
+    data = np.frombuffer(joined, dtype=np.uint8) if len(joined) > 0 else \
+           np.zeros(0, dtype=np.uint8)
+
+    return data, offsets
+
+def _unblob(data, offsets):
+    '''strings of a blob made by _blob()
+    '''
+    joined = data.tostring()
+    offsets = offsets.tolist()
+
+    return [joined[start:stop] for start, stop in zip(offsets[:-1], offsets[1:])]
+
+def _encode_contents(values):
+    '''typed arrays of cell contents
+
+    Parameters
+    ----------
+    values : sequence
+        contents, str, int, float, bool or None, other types pickled
+
+    Returns
+    -------
+    arrays : dict
+        'kinds' of each value, 'ints' (and bools), 'floats' and blobs of
+        'strings' and pickled 'objects' with their offsets, each in the
+        order of `values`
+    '''
+    kinds = np.empty(len(values), dtype=np.uint8)
+    ints, floats, strings, objects = [], [], [], []
+    for k, val in enumerate(values):
+        kind = type(val)
+        if val is None:
+            kinds[k] = _NONE
+        elif kind is str:
+            kinds[k] = _STR
+            strings.append(val)
+        elif kind is float:
+            kinds[k] = _FLOAT
+            floats.append(val)
+        elif kind is int:
+            kinds[k] = _INT
+            ints.append(val)
+        elif kind is bool:
+            kinds[k] = _BOOL
+            ints.append(val)
+        else:
+            kinds[k] = _OBJECT
+            objects.append(cPickle.dumps(val, 2))
+
+    arrays = {'kinds':kinds, 'ints':np.array(ints, dtype=np.int64), 
+              'floats':np.array(floats, dtype=np.float64)}
+    arrays['strings'], arrays['string_offsets'] = _blob(strings)
+    arrays['objects'], arrays['object_offsets'] = _blob(objects)
+
+    return arrays
+
+def _decode_contents(arrays):
+    '''contents encoded by _encode_contents()
+
+    Returns
+    -------
+    values : np.ndarray
+        dtype = object
+    '''
+    kinds = np.asarray(arrays['kinds'])
+    values = np.empty(len(kinds), dtype=object)
+    numbers = kinds[(kinds == _INT) | (kinds == _BOOL)] == _INT
+    ints = np.asarray(arrays['ints'])
+    values[kinds == _INT] = ints[numbers]
+    values[kinds == _BOOL] = ints[~numbers].astype(bool)
+    values[kinds == _FLOAT] = np.asarray(arrays['floats'])
+    strings = kinds == _STR
+    if strings.any():
+        values[strings] = _unblob(arrays['strings'], arrays['string_offsets'])
+    objects = np.flatnonzero(kinds == _OBJECT)
+    if len(objects) > 0:
+        pickled = _unblob(arrays['objects'], arrays['object_offsets'])
+        for k, val in zip(objects, pickled):
+            values[k] = cPickle.loads(val)
+
+    return values
+
+def _to_str(obj):
+    '''converts the unicode strings of loaded JSON to str
+
+    Parameters
+    ----------
+    obj : object
+        dict, list or scalar
+    '''
+    if isinstance(obj, unicode):
+        return obj.encode('utf-8')
+    elif isinstance(obj, dict):
+        return {_to_str(k):_to_str(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [_to_str(v) for v in obj]
+
+    return obj
+
+def _table_state(table, portable=False):
+    '''metadata and arrays representing a table, see Tabular.save()
+
+    Parameters
+    ----------
+    table : Tabular
+        table to represent
+    portable : bool
+        True to describe every formatter by name, raising ValueError for
+        those which cannot be, False to keep those as they are
+
+    Returns
+    -------
+    state : tuple
+        (metadata, dict of np.ndarray), cells in column-major order
+    '''
+    nrows, ncols = table.content.shape
+    cells = table.content.T.ravel()
+    arrays = _encode_contents([cell.content for cell in cells])
+
+    codes = {}
+    style_codes = np.array([codes.setdefault(cell.style, len(codes)) for cell in cells],
+                           dtype=np.int64)
+    styles = sorted(codes, key=codes.get)
+    flags = np.array([cell.isnull for cell in cells], dtype=np.uint8) << 2
+    spans, extras = [], []
+    overrides = [cell._overrides for cell in cells]
+    for k in [k for k, cellstyles in enumerate(overrides) if cellstyles]:
+        cell, cellstyles = cells[k], overrides[k]
+        i, j = k % nrows, k // nrows
+        flags[k] |= int(cell.mergedrow) | (int(cell.mergedcol) << 1)
+        if (cell.rows != 1) or (cell.columns != 1):
+            spans.append((i, j, cell.rows, cell.columns))
+        for attr, val in cellstyles.items():
+            if attr not in ['rows', 'columns', 'mergedrow', 'mergedcol']:
+                extras.append([i, j, attr, val])
+
+    described = {}
+    def describe(formatter):
+        if formatter not in described:
+            try:
+                described[formatter] = _formatter_spec(formatter)
+            except ValueError:
+                if portable:
+                    raise
+                described[formatter] = formatter
+        return described[formatter]
+
+    meta = {'class':table.__class__.__name__, 'shape':[nrows, ncols],
+            'attrs':{attr:val for attr, val in table.__dict__.items() \
+                     if attr not in _UNSAVED},
+            'styles':[dict([(field, getattr(style, field)) for field in \
+                            Style.fields[:-1]], formatter=describe(style.formatter)) \
+                      for style in styles],
+            'extras':extras}
+    arrays['styles'] = style_codes.astype(np.min_scalar_type(max(len(styles) - 1, 0)))
+    arrays['flags'] = flags
+    arrays['spans'] = np.array(spans, dtype=np.int64).reshape((-1, 4))
+
+    return meta, arrays
+
+def _saved_fields(arrays, nrows, ncols):
+    '''typed columns of a saved table, if the body rows of every column
+    are all ints or all floats
+
+    Returns
+    -------
+    fields : tuple or None
+        see Tabular.fields, views of the saved ints and floats
+    '''
+    kinds = np.asarray(arrays['kinds']).reshape((ncols, nrows))
+    typed = {_INT:(kinds == _INT) | (kinds == _BOOL), _FLOAT:kinds == _FLOAT}
+    for offset in [0, 1]:
+        body = kinds[:,offset:]
+        if (body.shape[1] == 0) or (not (body == body[:,:1]).all()) or \
+            (not np.in1d(body[:,0], [_INT, _FLOAT]).all()):
+            continue
+        fields = []
+        for j in xrange(ncols):
+            kind = body[j,0]
+            start = typed[kind][:j].sum() + typed[kind][j,:offset].sum()
+            source = arrays['ints'] if kind == _INT else arrays['floats']
+            fields.append(source[start:start + nrows - offset])
+        return (offset, fields)
+
+    return None
+
+def _restore_table(cls, meta, arrays):
+    '''table represented by _table_state()
+
+    Parameters
+    ----------
+    cls : type
+        class of the table
+    meta : dict
+        metadata
+    arrays : dict
+        np.ndarray of the cells
+    '''
+    nrows, ncols = meta['shape']
+    formatters, styles = {}, []
+    for fields in meta['styles']:
+        fields = dict(fields)
+        if isinstance(fields['formatter'], dict):
+            key = json.dumps(fields['formatter'], sort_keys=True)
+            if key not in formatters:
+                formatters[key] = _formatter_from_spec(fields['formatter'])
+            fields['formatter'] = formatters[key]
+        styles.append(Style(**fields))
+
+    values = _decode_contents(arrays).tolist()
+    flags = np.asarray(arrays['flags'])
+    cellstyles = [styles[code] for code in np.asarray(arrays['styles']).tolist()]
+    isnull = (flags & 4).astype(bool).tolist()
+    cells = np.empty(nrows*ncols, dtype=object)
+    new, k = TabularCell.__new__, 0
+    for j in xrange(ncols):
+        for i in xrange(nrows):
+            cell = new(TabularCell)
+            cell.loc = (i, j)
+            cell.content = values[k]
+            cell.isnull = isnull[k]
+            cell.style = cellstyles[k]
+            cell._overrides = None
+            cells[k] = cell
+            k += 1
+    for k in np.flatnonzero(flags & 1):
+        cells[k].mergedrow = True
+    for k in np.flatnonzero(flags & 2):
+        cells[k].mergedcol = True
+    content = cells.reshape((ncols, nrows)).T.copy()
+    for i, j, rows, columns in np.asarray(arrays['spans']).tolist():
+        content[i,j].rows = rows
+        content[i,j].columns = columns
+    for i, j, attr, val in meta['extras']:
+        setattr(content[i,j], attr, val)
+
+    table = object.__new__(cls)
+    table.__dict__.update(meta['attrs'])
+    table.content = content
+    table.shape = content.shape
+    table.original_content = None
+    table.rules = []
+    fields = _saved_fields(arrays, nrows, ncols)
+    table.fields = None if fields is None else (table._version(),) + fields
+    table._typed = (None, None)
+    table._nulls = (None, None)
+
+    return table
+
+def _aligned(size):
+    '''smallest multiple of _SAVE_ALIGNMENT not below `size`
+    '''
+    return -(-size//_SAVE_ALIGNMENT)*_SAVE_ALIGNMENT
+
+def _write_state(path, meta, arrays):
+    '''writes the representation of a table, see Tabular.save()
+
+    The file holds _SAVE_MAGIC, the length of a JSON header as uint64,
+    the header, with the metadata and the dtype, shape and offset of
+    each array, then the arrays, each aligned. It is written to a
+    temporary file renamed over `path`, so that tables loaded from
+    `path` keep the data they map.
+    '''
+    layout, offset = {}, 0
+    for name in sorted(arrays):
+        layout[name] = {'dtype':arrays[name].dtype.str,
+                        'shape':list(arrays[name].shape), 'offset':offset}
+        offset += _aligned(arrays[name].nbytes)
+    try:
+        header = json.dumps({'meta':meta, 'arrays':layout})
+    except TypeError as e:
+        raise ValueError('cannot save table: {}'.format(e))
+    start = _aligned(len(_SAVE_MAGIC) + 8 + len(header))
+
+    temp = path + '.tmp'
+    try:
+        with open(temp, 'wb') as savefile:
+            savefile.write(_SAVE_MAGIC + struct.pack('<Q', len(header)) + header)
+            for name in sorted(arrays):
+                savefile.seek(start + layout[name]['offset'])
+                np.ascontiguousarray(arrays[name]).tofile(savefile)
+        os.rename(temp, path)
+    except:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+
+def _read_state(path):
+    '''representation of a table written by _write_state(), its arrays
+    memory-mapped
+    '''
+    with open(path, 'rb') as savefile:
+        if savefile.read(len(_SAVE_MAGIC)) != _SAVE_MAGIC:
+            raise ValueError('{} is not a saved table'.format(path))
+        size = struct.unpack('<Q', savefile.read(8))[0]
+        header = _to_str(json.loads(savefile.read(size)))
+    start = _aligned(len(_SAVE_MAGIC) + 8 + size)
+
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        dtype = np.dtype(spec['dtype'])
+        begin = start + spec['offset']
+        end = begin + int(np.prod(spec['shape']))*dtype.itemsize
+        arrays[name] = data[begin:end].view(dtype).reshape(spec['shape'])
+
+    return header['meta'], arrays
+
+_FRAGMENT_TABLE = None
+_FRAGMENT_LOCK = threading.Lock()
+
+# Profiler active in each thread, set by pytabular.profiling.profile()
+_PROFILING = threading.local()
+
+def _profiler():
+    '''Profiler active in the calling thread, None if none is
+    '''
+    return getattr(_PROFILING, 'profiler', None)
+
+def _phase(name):
+    '''decorator timing a method under a phase of the Profiler active in
+    the calling thread, see pytabular.profiling
+
+    Parameters
+    ----------
+    name : str
+        name of the phase
+    '''
+    def decorate(method):
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            profiler = getattr(_PROFILING, 'profiler', None)
+            if profiler is None:
+                return method(*args, **kwargs)
+            return profiler.timed(name, method, *args, **kwargs)
+
+        return timed
+
+    return decorate
+
+def _write_fragment(task, table=None, layout=None):
+    '''renders rows of the table being fragmented and writes them
+
+    Parameters
+    ----------
+    task : tuple
+        (start, stop, filename)
+    table : Tabular
+        table to fragment, None for the one inherited by a worker
+    layout : tuple
+        see _write_fragments()
+    '''
+    if table is None:
+        table, layout = _FRAGMENT_TABLE
+    start, stop, filename = task
+    alignments, rowcolors, macros, formatted, protected = layout
+    if formatted is not None:
+        formatted = formatted[start:stop]
+    if protected is not None:
+        protected = protected[start:stop]
+
+    rows = table._render_rows(alignments, rowcolors, macros, start, stop, 
+                              formatted, protected)
+    texfile = open(filename, 'wb')
+    texfile.write('\n'.join(rows) + '\n')
+    texfile.close()
+
+def _write_fragments(table, layout, tasks, processes=1):
+    '''writes fragments of a table, in parallel if `processes` > 1
+
+    Parameters
+    ----------
+    table : Tabular
+        table to fragment
+    layout : tuple
+        (alignments, rowcolors, macros, formatted, protected) of the whole
+        table, formatted None for the workers to format their rows
+    tasks : list
+        (start, stop, filename) of each fragment
+    processes : int
+        number of worker processes
+
+    Notes
+    -----
+    Worker processes inherit the table when forked, so that cells and
+    their formatters are never pickled. Pools are started one at a time,
+    fragments written in the calling process hold no shared state
+    '''
+    global _FRAGMENT_TABLE
+    if (processes == 1) or (len(tasks) < 2):
+        for task in tasks:
+            _write_fragment(task, table, layout)
+        return
+
+    with _FRAGMENT_LOCK:
+        _FRAGMENT_TABLE = (table, layout)
+        try:
+            pool = multiprocessing.Pool(min(processes, len(tasks)))
+            try:
+                pool.map(_write_fragment, tasks)
+            finally:
+                pool.close()
+                pool.join()
+        finally:
+            _FRAGMENT_TABLE = None
+
 class TabularBase(object):
     '''base tabular object
 
@@ -122,6 +931,8 @@ class TabularBase(object):
 
     '''
 
+    __slots__ = ()
+
     def __init__(self, content):
          self.original_content = content
          self.content = self._handle_content(content)
@@ -222,30 +1033,70 @@ class TabularCell(TabularBase):
         If True, places horizontal line below cell
     loc : tuple
         (row, col) coordinates in table
+
+    style : Style
+        interned style holding color, fontsize, bold, emph, underline,
+        rotation, alignment and formatter, shared by cells styled alike
+
+    Notes
+    -----
+    Spans, merges, lines and spacing are kept in the dict `_overrides`,
+    None until one of them is set on the cell
     '''
 
+    __slots__ = ('loc', 'content', 'isnull', 'style', '_overrides')
+
+    # incremented whenever content is set on a cell, which has no
+    # reference to its table, invalidates the typed columns of tables
+    revision = 0
+
+    shape = ()
+    ndim = 0
+    rows = _override_property('rows', 1)
+    columns = _override_property('columns', 1)
+    mergedrow = _override_property('mergedrow', False)
+    mergedcol = _override_property('mergedcol', False)
+    lines = _override_property('lines', None)
+    narrow = _override_property('narrow', None)
+    space_above = _override_property('space_above', None)
+    space_below = _override_property('space_below', None)
+
+    color = _style_property('color')
+    fontsize = _style_property('fontsize')
+    bold = _style_property('bold')
+    emph = _style_property('emph')
+    underline = _style_property('underline')
+    rotation = _style_property('rotation')
+    alignment = _style_property('alignment')
+    formatter = _style_property('formatter')
+
     def __init__(self, content, loc):
         self.loc = loc
-        TabularBase.__init__(self, content)
-        self.shape = ()
-        self.ndim = 0
-        self.rows = 1
-        self.columns = 1
-        self.rotation = None
-        self.underline = False
-        self.bold = False
-        self.emph = False
-        self.alignment = None
-        self.formatter = str
-        self.fontsize = None
-        self.mergedrow = False
-        self.mergedcol = False
-        self.lines = None
-        self.narrow = None
-        self.space_above = None
-        self.space_below = None
-        self.color = None
+        self.style = DEFAULT_STYLE
+        self._overrides = None
+        self.content = self._handle_content(content)
         
+    def __copy__(self):
+        cell = TabularCell.__new__(TabularCell)
+        cell.loc = self.loc
+        cell.content = self.content
+        cell.isnull = self.isnull
+        cell.style = self.style
+        cell._overrides = None if self._overrides is None else dict(self._overrides)
+
+        return cell
+
+    def set_content(self, content):
+        '''sets content of cell
+
+        Parameters
+        ----------
+        content : scalar type
+            content to replace with
+        '''
+        TabularBase.set_content(self, content)
+        TabularCell.revision += 1
+
     def _handle_content(self, content):
         '''handles content
 
@@ -255,7 +1106,7 @@ class TabularCell(TabularBase):
             content of cell
 
         '''
-        accepted = (str, long, float, int, basestring, np.generic)
+        accepted = (str, long, float, int, basestring, np.generic, type(None))
         if not isinstance(content, accepted):
             msg = 'content must be scalar type, received {}'.format(type(content))
             raise ValueError(msg)
@@ -273,7 +1124,7 @@ class TabularCell(TabularBase):
                     msg += '\nspecial characters may cause LateX errors, use remove_character() to remove'
                     warnings.warn(msg, UserWarning)
             
-        self.isnull = content == ''        
+        self.isnull = (content is None) or _ismissing(content) or (content == '')
             
         return content
     
@@ -551,54 +1402,71 @@ class TabularCell(TabularBase):
         self.lines = lines
         self.narrow = narrow
         
-    def as_tex(self):
+    def _style_key(self, hoisted=()):
+        '''styles wrapped around the formatted content
+
+        Parameters
+        ----------
+        hoisted : container
+            names of styles applied by the enclosing tabular
+
+        Returns
+        -------
+        key : tuple
+            (color, fontsize, bold, emph, underline, rotation)
+        '''
+        if 'color' in hoisted:
+            return self.style.replace('color', None).key
+        return self.style.key
+
+    def as_tex(self, hoisted=(), macros=None, val=None):
         '''render the tabular element as text
 
+        Parameters
+        ----------
+        hoisted : container
+            names of styles ('alignment', 'color') already applied by
+            the enclosing tabular, through its column specification or
+            a \\rowcolor, and 'text' to brace the cell as text in a
+            siunitx S column
+        macros : dict
+            macro names by style key, for styles defined as macros in
+            the preamble of the table
+        val : str
+            content already formatted by the formatter, None to format
+            the content here; for null cells, a placeholder to render
+
         Returns
         -------
         val : str
             string which LateX will recognize in tabular environment
         '''
-        columns = self.columns
-        rows = self.rows
-        
-        align = 'c' if self.alignment is None else self.alignment
-        color = self.color
-        fontsize = self.fontsize        
-        
-        if self.isnull:
+        style = self.style
+        if self.isnull and not val:
+            color = None if 'color' in hoisted else style.color
+            align = 'c' if style.alignment is None else style.alignment
+            multicolumn = (self.columns > 1) | ((style.alignment is not None) & \
+                                                ('alignment' not in hoisted))
             val = ''
             if color is not None:
                 val = '\\cellcolor{{{}}}{{}}'.format(color)
-            if (columns > 1) | ('|' in align):
-                return '\\mc{{{}}}{{{}}}{{{}}}'.format(columns, align, val)
+            if (self.columns > 1) | (('|' in align) & multicolumn):
+                return '\\mc{{{}}}{{{}}}{{{}}}'.format(self.columns, align, val)
             return val
 
-        val = self.formatter(self.content)
-
-        if color is not None:
-            val = '\\cellcolor{{{}}}{{{}}}'.format(color, val)
-        
-        if fontsize is not None:
-            val = '\\{}{{{}}}'.format(fontsize, val)
-        
-        environments = {'\\textbf{':self.bold, '\\emph{':self.emph, 
-                '\\uline{':self.underline}
+        if type(hoisted) is not tuple:
+            hoisted = tuple(hoisted)
+        template = style._compiled.get((self.rows, self.columns, hoisted)) or \
+                   style.compile(self.rows, self.columns, hoisted)
 
-        for env in environments:
-            if environments[env]:
-                val = env + val + '}'
+        if val is None:
+            val = style.formatter(self.content)
 
-        if self.rotation is not None:
-            val = '\\rotatebox{{{}}}{{{}}}'.format(self.rotation, val)
-            
-        if rows > 1:
-            val = '\\mr{{{}}}{{*}}{{{}}}'.format(rows, val)        
-        if (self.alignment is not None) | (columns > 1):
-            val = '\\mc{{{}}}{{{}}}{{{}}}'.format(columns, align, val)
-            
+        if (macros is not None) and (template[3] in macros):
+            outer = template[2]
+            return '{}\\{}{{{}}}{}'.format(outer[0], macros[template[3]], val, outer[1])
 
-        return val
+        return template[0] + val + template[1]
 
 class Tabular2D(TabularBase):
     '''2-dimensional tabular
@@ -613,11 +1481,22 @@ class Tabular2D(TabularBase):
 
     '''
 
+    # cells shared with clones, see Tabular.clone()
+    _shared = None
+    # table a region was taken from and revision of the content of a
+    # table, see _changed()
+    _table = None
+    _revision = 0
+    # tabular a region was taken from and its index, see _positions()
+    _parent = None
+    _index = None
+
     def __init__(self, content, rowfragment=True, colfragment=True):
         TabularBase.__init__(self, content)
         self.rowfragment = rowfragment
         self.colfragment = colfragment
 
+    @_phase('handle_content')
     def _handle_content(self, content):
         '''handles content
 
@@ -630,6 +1509,8 @@ class Tabular2D(TabularBase):
         '''
         
         try:
+            if np.ma.isMaskedArray(content):
+                content = content.astype(object).filled(None)
             content = np.array(content, dtype=object)
         except ValueError:
             print('Cannot cast content as array')
@@ -649,6 +1530,89 @@ class Tabular2D(TabularBase):
         self.shape = content.shape
         return content
     
+    def _own(self, val):
+        '''copies the cells of a region shared with clones, before they
+        are modified
+
+        Parameters
+        ----------
+        val : index
+            region of the cells
+        '''
+        shared = self._shared[val]
+        if not np.any(shared):
+            return
+        cells = self.content[val]
+        if isinstance(cells, np.ndarray):
+            cells = cells.copy()
+            cells[shared] = [copy.copy(cell) for cell in cells[shared]]
+        else:
+            cells = copy.copy(cells)
+        self.content[val] = cells
+        self._shared[val] = False
+
+    def _changed(self):
+        '''marks the content of the table the tabular belongs to as
+        changed, invalidating its typed columns
+        '''
+        table = self if self._table is None else self._table
+        table._revision += 1
+
+    def _positions(self):
+        '''rows and columns of the cells of a region in its table
+
+        Returns
+        -------
+        positions : tuple
+            np.ndarray of the row and of the column of each cell
+        '''
+        if self._parent is None:
+            nrows, ncols = self.content.shape
+            return (np.broadcast_to(np.arange(nrows)[:,None], (nrows, ncols)),
+                    np.broadcast_to(np.arange(ncols), (nrows, ncols)))
+
+        rows, cols = self._parent._positions()
+        return rows[self._index], cols[self._index]
+
+    def _null_cells(self):
+        '''mask of the null cells, see _null_mask(), read from the typed
+        columns of the table the tabular belongs to while they are current
+        '''
+        table = self if self._table is None else self._table
+        if isinstance(table, Tabular) and (table._typed[0] == table._version()):
+            return table._null_at(*self._positions())
+
+        return _null_mask(self.content)
+
+    def _writable(self):
+        '''cells of the tabular, copying those shared with clones first
+        '''
+        if self._shared is not None:
+            self._own(Ellipsis)
+
+        return self.content
+
+    def _restyle(self, setter, *args):
+        '''calls a style setter of the cells once per distinct style,
+        giving cells which shared a style the same new style
+
+        Parameters
+        ----------
+        setter : str
+            name of the TabularCell setter, e.g. 'set_bold'
+        args : arguments
+            arguments of the setter
+        '''
+        restyled = {}
+        for cell in self._writable().flat:
+            style = restyled.get(cell.style)
+            if style is None:
+                before = cell.style
+                getattr(cell, setter)(*args)
+                restyled[before] = cell.style
+            else:
+                cell.style = style
+
     def remove_character(self, char=None):
         '''removes characters from cell
 
@@ -658,7 +1622,7 @@ class Tabular2D(TabularBase):
             characters to remove from cell, if None, uses list of 
             special characters
         '''
-        cells = self.content.flatten()
+        cells = self._writable().flatten()
         for cell in cells:
             cell.remove_character(char)   
         
@@ -671,9 +1635,7 @@ class Tabular2D(TabularBase):
          angle : int
              0 to 90
          '''
-         cells = self.content.flatten()
-         for cell in cells:
-             cell.set_rotation(angle)
+         self._restyle('set_rotation', angle)
 
 
     def set_underline(self, underline=True):
@@ -684,9 +1646,7 @@ class Tabular2D(TabularBase):
          underline : bool
              True to underline
          '''
-         cells = self.content.flatten()
-         for cell in cells:
-             cell.set_underline(underline)
+         self._restyle('set_underline', underline)
 
     def set_bold(self, bold=True):
          '''set to bold
@@ -696,9 +1656,7 @@ class Tabular2D(TabularBase):
          bold : bool
              True to bold
          '''
-         cells = self.content.flatten()
-         for cell in cells:
-             cell.set_bold(bold)
+         self._restyle('set_bold', bold)
 
     def set_emph(self, emph=True):
         '''set to emph
@@ -708,9 +1666,7 @@ class Tabular2D(TabularBase):
         emph : bool
             True to emph
         '''
-        cells = self.content.flatten()
-        for cell in cells:
-            cell.set_emph(emph)
+        self._restyle('set_emph', emph)
 
     def set_alignment(self, alignment):
         '''sets alignment of tabular element
@@ -721,9 +1677,7 @@ class Tabular2D(TabularBase):
             alignment string in LateX
             ex: 'c', 'l', or 'r'
         '''
-        cells = self.content.flatten()
-        for cell in cells:
-            cell.set_alignment(alignment)
+        self._restyle('set_alignment', alignment)
 
     def set_formatter(self, formatter):
         '''sets function to format content
@@ -733,9 +1687,7 @@ class Tabular2D(TabularBase):
         formatter : function
             function to format the content, must return a string
         '''
-        cells = self.content.flatten()
-        for cell in cells:
-            cell.set_formatter(formatter)
+        self._restyle('set_formatter', formatter)
 
     def set_fontsize(self, fontsize):
         '''sets fontsize
@@ -746,9 +1698,7 @@ class Tabular2D(TabularBase):
             font size for tabular element
         '''
 
-        cells = self.content.flatten()
-        for cell in cells:
-            cell.set_fontsize(fontsize)
+        self._restyle('set_fontsize', fontsize)
 
     def set_mergedrow(self, mergedrow=True):
         '''sets cells to mergedrow
@@ -759,7 +1709,7 @@ class Tabular2D(TabularBase):
             True to hide element
         '''
 
-        cells = self.content.flatten()
+        cells = self._writable().flatten()
         for cell in cells:
             cell.set_mergedrow(mergedrow)
 
@@ -772,7 +1722,7 @@ class Tabular2D(TabularBase):
             True to hide element
         '''
 
-        cells = self.content.flatten()
+        cells = self._writable().flatten()
         for cell in cells:
             cell.set_mergedcol(mergedcol)
 
@@ -787,7 +1737,7 @@ class Tabular2D(TabularBase):
             'r', 'l', or 'lr'
         '''
         
-        cells = self.content.flatten()
+        cells = self._writable().flatten()
         for cell in cells:
             cell.set_lines(lines, narrow)
         
@@ -799,9 +1749,7 @@ class Tabular2D(TabularBase):
         digits : int
             number of significant digits
         '''
-        cells = self.content.flatten()
-        for cell in cells:
-            cell.set_digits(digits)
+        self._restyle('set_digits', digits)
     
     def set_stars(self, side='left', levels=[0.1,0.05,0.01]):
         '''sets cell to display significance stars
@@ -815,9 +1763,7 @@ class Tabular2D(TabularBase):
             list for which to apply significance stars
 
         '''
-        cells = self.content.flatten()
-        for cell in cells:
-            cell.set_stars(side, levels)
+        self._restyle('set_stars', side, levels)
 
     def set_space_above(self, space):
         '''set the spacing before a cell in a row
@@ -832,7 +1778,7 @@ class Tabular2D(TabularBase):
         if numeric type give for `space`, assumes unit is 'cm'
         '''
         
-        cells = self.content.flatten()
+        cells = self._writable().flatten()
         for cell in cells:
             cell.set_space_above(space)
 
@@ -849,7 +1795,7 @@ class Tabular2D(TabularBase):
         if numeric type give for `space`, assumes unit is 'cm'
         '''
         
-        cells = self.content.flatten()
+        cells = self._writable().flatten()
         for cell in cells:
             cell.set_space_below(space)
 
@@ -865,9 +1811,7 @@ class Tabular2D(TabularBase):
             int in [0,100]
         '''
         
-        cells = self.content.flatten()
-        for cell in cells:
-            cell.set_color(color, opacity)
+        self._restyle('set_color', color, opacity)
 
     def merge(self, force=False):
         '''merges the Tabular2D
@@ -878,6 +1822,7 @@ class Tabular2D(TabularBase):
             if True, forces merge over non-null cells, purges these cells
         '''
         
+        self._writable()
         if self.content[0,0].mergedrow | self.content[0,0].mergedcol:
             raise MergeError('attempting merge cells that are already merged')
             
@@ -889,7 +1834,7 @@ class Tabular2D(TabularBase):
         if force:
             for c in self.flatten()[1:]:
                 c.set_content('')
-        if not np.all([c.isnull for c in self.flatten()[1:]]):
+        if not self._null_cells().flat[1:].all():
             raise MergeError('cannot multirow merge on nonnull cells')
         for i,cell in enumerate(self.flatten()):
             if i == 0:
@@ -913,41 +1858,76 @@ class Tabular2D(TabularBase):
             may be single ints/slices or a tuple
             of two of them or lists
         '''
+        if self._shared is not None:
+            self._own(val)
+
+        return self._region(val)
 
+    def _region(self, val):
+        '''slices from Tabular2D, without copying cells shared with
+        clones, for reading
+
+        Parameters
+        ----------
+        val : tuple
+            see __getitem__()
+        '''
         newcontent = self.content[val]
         if newcontent.shape == ():
             return newcontent
         elif newcontent.shape == self.content.shape:
             return self
-        elif newcontent.ndim == 2:
+        table = self if self._table is None else self._table
+        tab = None
+        if newcontent.ndim == 2:
             tab = Tabular2D(newcontent)
             if not self.rowfragment:
                 tab.colfragment = newcontent.shape[0] < self.content.shape[0]
             if not self.colfragment:
                 tab.rowfragment = newcontent.shape[1] < self.content.shape[1]
-            return tab
-        else:
-            if isinstance(val, int) & (not self.rowfragment):
-                return TabularRow(newcontent)
-            elif isinstance(val, int):
-                return Tabular1D(newcontent, 0)
-            elif isinstance(val, tuple):
-                if len(val)==1:
-                    if (len(newcontent) < self.content.shape[1]) | (self.rowfragment):
-                        return Tabular1D(newcontent, 0)
-                    return TabularRow(newcontent)
-                elif isinstance(val[0], int):
-                    if (len(newcontent) < self.content.shape[1]) | (self.rowfragment):
-                        return Tabular1D(newcontent, 0)
-                    return TabularRow(newcontent)
-                elif isinstance(val[1], int):
-                    if (len(newcontent) < self.content.shape[0]) | (self.colfragment):
-                        return Tabular1D(newcontent, 1)
-                    return TabularColumn(newcontent)
-        raise ValueError('invalid slice: {}'.format(val))
+        elif isinstance(val, int) & (not self.rowfragment):
+            tab = TabularRow(newcontent)
+        elif isinstance(val, int):
+            tab = Tabular1D(newcontent, 0)
+        elif isinstance(val, tuple):
+            if len(val)==1:
+                if (len(newcontent) < self.content.shape[1]) | (self.rowfragment):
+                    tab = Tabular1D(newcontent, 0)
+                else:
+                    tab = TabularRow(newcontent)
+            elif isinstance(val[0], int):
+                if (len(newcontent) < self.content.shape[1]) | (self.rowfragment):
+                    tab = Tabular1D(newcontent, 0)
+                else:
+                    tab = TabularRow(newcontent)
+            elif isinstance(val[1], int):
+                if (len(newcontent) < self.content.shape[0]) | (self.colfragment):
+                    tab = Tabular1D(newcontent, 1)
+                else:
+                    tab = TabularColumn(newcontent)
+        if tab is None:
+            raise ValueError('invalid slice: {}'.format(val))
+        tab._table, tab._parent, tab._index = table, self, val
+
+        return tab
 
     def __setitem__(self, key, value):
         self.content[key] = value
+        if self._shared is not None:
+            self._shared[key] = False
+        self._changed()
+
+    def set_content(self, content):
+        '''sets content of tabular
+
+        Parameters
+        ----------
+        content : 2-d like
+            content to replace with
+        '''
+        TabularBase.set_content(self, content)
+        self._shared = None
+        self._changed()
 
     def __len__(self):
         return len(self.content)
@@ -1005,12 +1985,12 @@ class Tabular1D(Tabular2D):
                 c.set_content('')
         
         if self.orientation == 0:
-            if not np.all([c.isnull for c in self[1:]]):
+            if not self._null_cells()[1:].all():
                 raise MergeError('cannot multirow merge on nonnull cells')
             self.content[0]._set_columns(len(self.content))
             self[1:].set_mergedrow()
         else:
-            if not np.all([c.isnull for c in self[1:]]):
+            if not self._null_cells()[1:].all():
                 raise MergeError('cannot multirow merge on nonnull cells')
             self.content[0]._set_rows(len(self.content))
             self[1:].set_mergedcol()
@@ -1032,7 +2012,10 @@ class Tabular1D(Tabular2D):
         if newcontent.shape == self.content.shape:
             return self
         else:
-            return Tabular1D(newcontent)
+            tab = Tabular1D(newcontent)
+            tab._table = self if self._table is None else self._table
+            tab._parent, tab._index = self, val
+            return tab
 
 class TabularRow(Tabular1D):
     '''tabular for a row
@@ -1058,7 +2041,7 @@ class TabularRow(Tabular1D):
         if force:
             for c in self[1:]:
                 c.set_content('')
-        if not np.all([c.isnull for c in self[1:]]):
+        if not self._null_cells()[1:].all():
             raise MergeError('cannot multicolumn merge on nonnull cells')
         self.content[0]._set_columns(len(self.content))
         self[1:].set_mergedrow()
@@ -1067,12 +2050,13 @@ class TabularRow(Tabular1D):
         '''handles horizontal spacing between rows
         '''
         
-        space_below = list(set([c.space_below for c in self]))
-        space_above = list(set([c.space_above for c in self]))
+        space_below = list(set([c.space_below for c in self.content]))
+        space_above = list(set([c.space_above for c in self.content]))
         
         return space_above[0], space_below[0]
             
     
+    @_phase('handle_lines')
     def _handle_lines(self, indent=2):
         '''handles lines around cells
         
@@ -1082,7 +2066,7 @@ class TabularRow(Tabular1D):
             length of indent        
         
         '''
-        cells = [c for c in self if not c.mergedrow]
+        cells = [c for c in self.content if not c.mergedrow]
         narrow = np.any([c.narrow is not None for c in cells])
         lines = [c.lines for c in cells]
         if (not narrow) & (len(list(set(lines))) == 1):
@@ -1092,8 +2076,9 @@ class TabularRow(Tabular1D):
             return '\n' + ' '*indent + '\\hline '*lines[0]
         
         tex = []
-        for c in cells:
-            loc = c.loc[1]
+        for loc, c in enumerate(self.content):
+            if c.mergedrow:
+                continue
             cols = c.columns
             sides = '({})'.format(c.narrow if c.narrow is not None else '')
             hlines = 0 if c.lines is None else c.lines
@@ -1109,23 +2094,87 @@ class TabularRow(Tabular1D):
             return ''
         return '\n' + indent*' ' + ' '.join(tex)
         
-    def as_tex(self, indent=2):
+    def _hoisted(self, alignments=None, rowcolor=None, protected=None):
+        '''styles of each cell applied by the enclosing tabular
+
+        Parameters
+        ----------
+        alignments : list
+            hoisted alignment for each column
+        rowcolor : str
+            color of the \\rowcolor of the row
+        protected : sequence
+            True for each cell to brace as text in a siunitx S column
+
+        Returns
+        -------
+        hoisted : list
+            list of hoisted style names for each cell
+        '''
+        hoisted = []
+        for j, cell in enumerate(self.content):
+            styles = []
+            if (alignments is not None) and (cell.columns == 1) and \
+                (alignments[j] is not None) and (cell.style.alignment == alignments[j]):
+                styles.append('alignment')
+            if (rowcolor is not None) and (cell.style.color == rowcolor):
+                styles.append('color')
+            if (protected is not None) and protected[j]:
+                styles.append('text')
+            hoisted.append(tuple(styles))
+
+        return hoisted
+
+    def as_tex(self, indent=2, alignments=None, rowcolor=None, macros=None, 
+               compact=False, formatted=None, protected=None):
         '''creates tex string for the row
+
+        Parameters
+        ----------
+        indent : int
+            length of indent
+        alignments : list
+            alignment hoisted into the column specification for each
+            column, None where the column has none
+        rowcolor : str
+            color applied to the whole row by \\rowcolor, None for no
+            \\rowcolor
+        macros : dict
+            macro names by style key, see TabularCell.as_tex()
+        compact : bool
+            True to drop cosmetic whitespace
+        formatted : sequence
+            formatted content of each cell, None to format while
+            rendering
+        protected : sequence
+            True for each cell to brace as text in a siunitx S column
         '''
 
         
-        underlining_tex = self._handle_lines(indent)
+        # rows without spans, merges, lines or spacing skip their handling
+        plain = not any([cell._overrides for cell in self.content])
+        underlining_tex = '' if plain else self._handle_lines(indent)
         
-        row = [cell.as_tex() for cell in self.content if not cell.mergedrow]
+        if formatted is None:
+            formatted = [None]*len(self.content)
+        hoisted = self._hoisted(alignments, rowcolor, protected)
+        row = [cell.as_tex(hoisted[j], macros, formatted[j]) for j, cell in \
+               enumerate(self.content) if plain or not cell.mergedrow]
         
-        row = ' '*indent + ' & '.join(row)
+        row = ('&' if compact else ' & ').join(row)
+        if rowcolor is not None:
+            row = '\\rowcolor{{{}}}{}{}'.format(rowcolor, '' if compact else ' ', row)
+        row = ' '*indent + row
         
-        space_above, space_below = self._handle_rowspace()        
+        space_above, space_below = (None, None) if plain else self._handle_rowspace()
         if space_above is not None:
             space_above = '[{}]'.format(space_above)
             row = '{}\\\\{}\n{}'.format(' '*indent, space_above, row)
         space_below = '' if space_below is None else '[{}]'.format(space_below)
-        row += ' \\\\{} {} \n'.format(space_below, underlining_tex)
+        if compact:
+            row += '\\\\{}{}'.format(space_below, underlining_tex.strip())
+        else:
+            row += ' \\\\{} {} \n'.format(space_below, underlining_tex)
                 
         return row
    
@@ -1152,7 +2201,7 @@ class TabularColumn(Tabular1D):
         if force:
             for c in self[1:]:
                 c.set_content('')
-        if not np.all([c.isnull for c in self[1:]]):
+        if not self._null_cells()[1:].all():
             raise MergeError('cannot multirow merge on nonnull cells')
         self.content[0]._set_rows(len(self.content))
         self[1:].set_mergedcol()
@@ -1173,8 +2222,462 @@ class Tabular(Tabular2D):
         self.tab_type = 'tabu'
         self.notes = []
         self.notesize = 'scriptsize'
+        self.hoist = False
+        self.compact = False
+        self.decimal_alignment = None
+        self.rules = []
+        self.na_rep = ''
+        self.fields = None
+        # typed on first use, from the content if still unchanged
+        self._typed = (self._version(), None)
+        self._nulls = (None, None)
+
+    @classmethod
+    def from_records(cls, records, header=True):
+        '''creates a table from a structured array
+
+        Parameters
+        ----------
+        records : np.ndarray
+            1-d structured array, e.g. np.rec.array or np.memmap, a
+            column for each field
+        header : bool
+            True to put the field names in a header row
+
+        Notes
+        -----
+        The fields are kept as views of `records`, used as the typed
+        columns of the body rows until content is set, see values().
+        A cell is created for each record, reading every record, see
+        LongTable.from_records() to stream records instead
+        '''
+        if (not isinstance(records, np.ndarray)) or (records.dtype.names is None):
+            raise ValueError('received {}, expected structured array'.format(\
+                             type(records)))
+        records = records.reshape(-1)
+        names = records.dtype.names
+        offset = int(header)
+
+        content = np.empty((len(records) + offset, len(names)), dtype=object)
+        if header:
+            content[0] = names
+        for j, name in enumerate(names):
+            content[offset:,j] = records[name].tolist()
+
+        table = cls(content)
+        table.fields = (table._version(), offset, 
+                        [records[name] for name in names])
+
+        return table
+
+    @classmethod
+    def from_csv(cls, path, header=True, delimiter=',', nrows=None):
+        '''creates a table from a csv file
+
+        Parameters
+        ----------
+        path : str
+            name of the csv file
+        header : bool
+            True if the first line of the file holds column names
+        delimiter : str
+            field separator
+        nrows : int
+            number of rows to read after the header, None for all
+
+        Notes
+        -----
+        Cells keep the text of the file, so that numbers render as
+        written, e.g. 02130 or 1.50, empty values of numeric columns
+        being missing. The parsed columns are kept as the typed columns
+        of the body rows until content is set, see values(). Text
+        columns and the header are formatted with escape_tex(), numeric
+        columns keep str() unless another formatter is set
+        '''
+        with open(path, 'rb') as csvfile:
+            reader = csv.reader(csvfile, delimiter=delimiter)
+            names = next(reader) if header else None
+            texts = _read_chunk(reader, nrows, None if names is None \
+                                else len(names))
+        if (names is None) and (len(texts) == 0):
+            raise ValueError('{} has no rows'.format(path))
+
+        offset = int(header)
+        ncols = len(names) if header else len(texts)
+        if len(texts) == 0:
+            texts = [np.array([], dtype=object) for _ in xrange(ncols)]
+        columns = [_parse_column(text) for text in texts]
+        content = np.empty((len(texts[0]) + offset, ncols), dtype=object)
+        if header:
+            content[0] = names
+        for j, (text, column) in enumerate(zip(texts, columns)):
+            if column.dtype != object:
+                text = np.where(text == '', None, text)
+            content[offset:,j] = text.tolist()
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            table = cls(content)
+        if header:
+            table[0].set_formatter(escape_tex)
+        for j, column in enumerate(columns):
+            if column.dtype == object:
+                table[offset:,j].set_formatter(escape_tex)
+        table.fields = (table._version(), offset, columns)
+
+        return table
+
+    def save(self, path):
+        '''saves the table to a compact binary file, see load()
+
+        Parameters
+        ----------
+        path : str
+            name of the file
+
+        Notes
+        -----
+        Contents are saved as typed arrays, styles as codes into the
+        distinct styles of the cells, merges as spans and settings such
+        as environments and notes as metadata. Formatters must be
+        module-level functions or made by format_digits() or
+        format_stars(). Rules are not saved, the table keeps the styles
+        they set.
+        '''
+        meta, arrays = _table_state(self, portable=True)
+        _write_state(path, meta, arrays)
+
+    @classmethod
+    def load(cls, path):
+        '''loads a table saved by save(), memory-mapping its arrays
+
+        Parameters
+        ----------
+        path : str
+            name of the file
+
+        Returns
+        -------
+        table : Tabular
+            of the class saved, numeric columns kept as memory-mapped
+            typed columns, see from_records()
+
+        Notes
+        -----
+        Loading imports the modules of the formatters named in the file,
+        only load files from trusted sources.
+        '''
+        meta, arrays = _read_state(path)
+        saved = globals().get(meta['class'])
+        if not (isinstance(saved, type) and issubclass(saved, cls)):
+            raise ValueError('received {} table, expected {}'.format(\
+                             meta['class'], cls.__name__))
+
+        return _restore_table(saved, meta, arrays)
+
+    def __reduce__(self):
+        return (_restore_table, (self.__class__,) + _table_state(self))
+
+    def __copy__(self):
+        table = object.__new__(self.__class__)
+        table.__dict__.update(self.__dict__)
+
+        return table
+
+    def __deepcopy__(self, memo):
+        table = object.__new__(self.__class__)
+        memo[id(self)] = table
+        for attr, value in self.__dict__.items():
+            setattr(table, attr, copy.deepcopy(value, memo))
+
+        return table
+
+    def clone(self):
+        '''copy of the table sharing its cells until either table
+        modifies them
+
+        Cells of a region are copied by the table indexing the region,
+        e.g. clone[1:, 2].set_bold(), or styling, merging or applying
+        rules to it, so that variants of a table cost little more than
+        the regions they change. Settings such as the caption are
+        copied.
+
+        Returns
+        -------
+        table : Tabular
+            same class as the table
+
+        Notes
+        -----
+        Rules are not cloned, the clone keeps the styles they set.
+        Regions taken from the table before cloning still refer to its
+        shared cells.
+        '''
+        table = object.__new__(self.__class__)
+        for attr, value in self.__dict__.items():
+            if isinstance(value, (list, dict)):
+                value = copy.copy(value)
+            setattr(table, attr, value)
+        table.content = self.content.copy()
+        table.rules = []
+        table._shared = np.ones(self.content.shape, dtype=bool)
+        self._shared = np.ones(self.content.shape, dtype=bool)
+
+        # cells styled by rules stay with the table, whose rules restore them
+        styled = set(id(cell) for rule in self.rules for cell in _styled_cells(rule))
+        if len(styled) > 0:
+            ruled = np.frompyfunc(lambda c: id(c) in styled, 1, 1)(\
+                                  self.content).astype(bool)
+            table._own(ruled)
+            self._shared[ruled] = False
+
+        return table
+
+    def _field_values(self, col, rows=None):
+        '''values of rows of a column from the records the table was
+        created from
+
+        Parameters
+        ----------
+        col : int
+            index of the column
+        rows : index
+            rows, None for all
+
+        Returns
+        -------
+        values : np.ndarray or None
+            view or copy of the field, None if the table was not created
+            from records, content was set since or `rows` are not all
+            body rows
+        '''
+        if self.fields is None:
+            return None
+        revision, offset, fields = self.fields
+        if revision != self._version():
+            return None
+        field = fields[col]
+
+        nrows = self.content.shape[0]
+        if rows is None:
+            rows = slice(None)
+        if isinstance(rows, slice):
+            start, stop, step = rows.indices(nrows)
+            if (step > 0) and (start >= offset):
+                return field[start - offset:stop - offset:step]
+            return None
+        index = np.arange(nrows)[rows]
+        if (np.ndim(index) != 1) or (len(index) == 0) or (index.min() < offset):
+            return None
+
+        return field[index - offset]
 
     
+    def _type_columns(self, content=None):
+        '''arrays of the columns in their native dtype
+
+        Parameters
+        ----------
+        content : array-like
+            content the table was created from, columns of an array of
+            a non-object dtype keep it, None to type the cell contents
+        '''
+        if np.ma.isMaskedArray(content):
+            content = content.astype(float).filled(np.nan) \
+                if content.dtype.kind in 'bif' else None
+        if isinstance(content, np.ndarray) and (content.dtype != object) and \
+            (content.ndim in [1, 2]) and (content.size == self.content.size):
+            content = content.reshape(self.content.shape)
+            return [content[:,j] for j in xrange(content.shape[1])]
+
+        return [_typed_array([c.content for c in self.content[:,j]]) \
+                for j in xrange(self.content.shape[1])]
+
+    def _version(self):
+        '''revision of the content of the table, changed by setting
+        content on the table, its regions or any cell
+        '''
+        return (self._revision, TabularCell.revision)
+
+    def _typed_columns(self):
+        '''arrays of the columns in their native dtype, typed on first
+        use and retyped from the cells when content was set since
+        '''
+        revision, columns = self._typed
+        if revision != self._version():
+            columns = self._type_columns()
+        elif columns is None:
+            columns = self._type_columns(self.original_content)
+        self._typed = (self._version(), columns)
+
+        return columns
+
+    def memory_usage(self, deep=True):
+        '''bytes used by the table
+
+        Parameters
+        ----------
+        deep : bool
+            True to count the objects referenced by the cells, their
+            content, styles and formatters, counting each object once,
+            so that a Style shared by cells is counted once
+
+        Returns
+        -------
+        usage : dict
+            bytes of the 'array' of cells, the 'cells' themselves with
+            their overrides, the cached 'typed' columns and null mask,
+            and if `deep` the 'content', 'styles' and 'formatters', with
+            their 'total'
+
+        Notes
+        -----
+        Sizes are those of sys.getsizeof(), without the allocator's
+        overhead; views such as the fields of memory-mapped records count
+        their header only
+        '''
+        seen = set()
+        cells = self.content.ravel()
+        usage = {'array':_sizeof(self.content, seen), 'cells':0, 'typed':0}
+        styles = [cell._overrides for cell in cells]
+        for cell, cellstyles in zip(cells, styles):
+            usage['cells'] += _sizeof(cell, seen) + _sizeof(cell.loc, seen)
+            if cellstyles is not None:
+                usage['cells'] += _sizeof(cellstyles, seen)
+
+        if deep:
+            usage['content'] = usage['styles'] = usage['formatters'] = 0
+            usage['content'] += _sizeof(self.original_content, seen)
+            for cell, cellstyles in zip(cells, styles):
+                usage['content'] += _sizeof(cell.content, seen)
+                usage['formatters'] += _function_size(cell.style.formatter, seen)
+                style = cell.style
+                if id(style) not in seen:
+                    usage['styles'] += _sizeof(style, seen) + \
+                        sum(_sizeof(val, seen) for val in (style.key, style.color, \
+                            style.alignment, style.prefix, style.suffix))
+                for val in (cellstyles or {}).values():
+                    usage['styles'] += _sizeof(val, seen)
+
+        if self._nulls[1] is not None:
+            usage['typed'] += _sizeof(self._nulls[1], seen)
+        for column in self._typed[1] or []:
+            usage['typed'] += _sizeof(column, seen)
+            if deep and (column.dtype == object):
+                usage['typed'] += sum(_sizeof(val, seen) for val in column)
+        usage['total'] = sum(usage.values())
+
+        return usage
+
+    def _null_at(self, rows, cols):
+        '''mask of the null cells at positions of the table, from the mask
+        of its typed columns, kept until content is set
+
+        Parameters
+        ----------
+        rows, cols : np.ndarray
+            row and column of each cell, see Tabular2D._positions()
+        '''
+        revision, nulls = self._nulls
+        if revision != self._version():
+            nulls = _missing_mask(self._typed_columns(), empty=True)
+            self._nulls = (self._version(), nulls)
+
+        return nulls[rows, cols]
+
+    def missing_mask(self):
+        '''mask of missing values (None, NaN or masked), computed for
+        each typed column at once
+
+        Returns
+        -------
+        mask : np.ndarray
+            dtype = bool, True where a value is missing
+        '''
+        return _missing_mask(self._typed_columns())
+
+    def set_na_rep(self, rep=''):
+        '''sets the placeholder for missing values
+
+        Parameters
+        ----------
+        rep : str
+            rendered for missing values (None, NaN or masked) which are
+            not merged, e.g. '', '--' or '.'
+        '''
+        if not isinstance(rep, str):
+            raise ValueError('received {}, expected str'.format(type(rep)))
+        self.na_rep = rep
+
+    @property
+    def dtypes(self):
+        '''native dtype of each column, of the body rows for tables
+        created from records
+        '''
+        nrows = self.content.shape[0]
+        dtypes = [column.dtype for column in self._typed_columns()]
+        for j in xrange(len(dtypes)):
+            field = self._field_values(j, slice(nrows - 1, None))
+            if field is not None:
+                dtypes[j] = field.dtype
+
+        return dtypes
+
+    def values(self, col, rows=None):
+        '''values of a column in their native dtype
+
+        Parameters
+        ----------
+        col : int
+            index of the column
+        rows : index
+            rows to return, e.g. slice(1, None) to skip a header row,
+            None for all rows; the dtype is inferred for these rows
+
+        Returns
+        -------
+        values : np.ndarray
+            dtype bool, int64, float64, str or object, or the dtype of
+            the field for body rows of a table created from records
+        '''
+        if rows is not None:
+            field = self._field_values(col, rows)
+            if field is not None:
+                return field
+
+        values = self._typed_columns()[col]
+        if rows is None:
+            return values
+
+        values = values[rows]
+        if isinstance(values, np.ndarray) and (values.dtype == object):
+            values = _typed_array(values.tolist())
+
+        return values
+
+    def _float_values(self, region=None):
+        '''numeric values of the cells of a region
+
+        Parameters
+        ----------
+        region : index
+            cells, None for the whole table
+
+        Returns
+        -------
+        values : np.ndarray
+            dtype = float, NaN where a cell is null or not numeric
+        '''
+        columns = []
+        for j, column in enumerate(self._typed_columns()):
+            if column.dtype.kind in 'bif':
+                columns.append(column.astype(float))
+            else:
+                columns.append(float_values(self.content[:,j]))
+        values = np.column_stack(columns)
+
+        return values if region is None else values[region]
+
     def set_indent(self, indent):
         '''sets indentation for presentation of output
         
@@ -1187,6 +2690,25 @@ class Tabular(Tabular2D):
             raise ValueError('received {} for indent instead of int'.format(type(indent)))
         
         self.indent = indent
+
+    def set_compact(self, compact=True):
+        '''sets compact output
+
+        Parameters
+        ----------
+        compact : bool
+            True to drop cosmetic whitespace and to define a macro in the
+            preamble of the table for each recurring combination of cell
+            styles
+        '''
+        if not compact in [True, False]:
+            raise ValueError('received {}, expected boolean'.format(type(compact)))
+        self.compact = compact
+
+    def _get_indent(self):
+        '''length of indent used in output, 0 when compact
+        '''
+        return 0 if self.compact else self.indent
     
     def add_environment(self, env, post='', prepend=False):
         '''adds an environment around tabular
@@ -1206,6 +2728,7 @@ class Tabular(Tabular2D):
         else:
             self.environments.append((env,post))
 
+    @_phase('handle_environments')
     def _handle_environments(self, val):
         '''handles environments
 
@@ -1218,22 +2741,667 @@ class Tabular(Tabular2D):
         if len(self.environments) == 0:
             return val
         
+        gap = '\n' if self.compact else '\n\n'
         for i,info in enumerate(self.environments):
             env, post = info
-            space = ' '*(self.depth - 2 -i)*self.indent
-            val = '{}\\begin{{{}}}{}\n\n{}\n\n{}\\end{{{}}}'.format(space, \
-                    env, post, val, space,  env)
+            space = ' '*(self.depth - 2 -i)*self._get_indent()
+            val = '{}\\begin{{{}}}{}{}{}{}{}\\end{{{}}}'.format(space, \
+                    env, post, gap, val, gap, space,  env)
         
         return val
         
-    def _build_rows(self):
+    def set_hoist(self, hoist=True):
+        '''sets whether to hoist uniform styles out of the cells
+
+        Parameters
+        ----------
+        hoist : bool
+            True to move an alignment shared by a column into the column
+            specification and a color shared by a row into a \\rowcolor,
+            so that only the exceptions are wrapped cell by cell, off by
+            default
+        '''
+        if not hoist in [True, False]:
+            raise ValueError('received {}, expected boolean'.format(type(hoist)))
+        self.hoist = hoist
+
+    @_phase('hoist_styles')
+    def _hoist_styles(self):
+        '''finds the alignments and colors to hoist out of the cells
+
+        Returns
+        -------
+        alignment : str
+            column specification of the tabular
+        alignments : list or None
+            hoisted alignment for each column, None where not hoisted
+        rowcolors : list or None
+            color for \\rowcolor of each row, None where not hoisted
+        '''
+        segments = _split_alignment(self.tab_alignment)
+        if (not self.hoist) or (segments is None) or \
+            (len(segments) != self.content.shape[1]):
+            return self.tab_alignment, None, None
+
+        # an alignment is hoisted only if every cell with content in the
+        # column shares it, empty cells never decide but must not gain or
+        # lose a rule through the column specification
+        alignments = []
+        for j in xrange(self.content.shape[1]):
+            shared = set()
+            empty = set()
+            for cell in self.content[:,j]:
+                if cell.mergedrow | (cell.columns > 1):
+                    continue
+                if cell.isnull | cell.mergedcol:
+                    empty.add(cell.style.alignment)
+                else:
+                    shared.add(cell.style.alignment)
+            alignment = shared.pop() if len(shared) == 1 else None
+            if alignment is not None:
+                ruled = [val for val in empty | set([alignment, segments[j]]) \
+                         if (val is not None) and ('|' in val)]
+                if ruled and (empty - set([alignment])):
+                    alignment = None
+            if alignment is not None:
+                segments[j] = alignment
+            alignments.append(alignment)
+
+        rowcolors = []
+        for i in xrange(self.content.shape[0]):
+            counts = {}
+            for cell in self.content[i]:
+                if cell.mergedcol:
+                    # \rowcolor would paint over a \multirow from above
+                    counts = {}
+                    break
+                if cell.mergedrow:
+                    continue
+                color = cell.style.color
+                if color is None:
+                    counts = {}
+                    break
+                counts[color] = counts.get(color, 0) + 1
+            rowcolors.append(_most_common(counts))
+
+        return ''.join(segments), alignments, rowcolors
+
+    def add_rule(self, predicate, region=None, **styles):
+        '''styles the cells of a region whose values satisfy a predicate
+
+        The predicate is evaluated once over the values of the whole
+        region. Rules are kept, call apply_rules() to apply them again
+        after the content changes.
+
+        Parameters
+        ----------
+        predicate : function
+            takes an array of the values of the region (float, NaN for
+            null or non-numeric cells) and returns a boolean array of
+            the same shape, e.g. lambda x: x < 0
+        region : index
+            cells the rule applies to, e.g. np.s_[1:, 2:], None for
+            the whole table
+        styles : keyword arguments
+            styles of matching cells: bold, emph, underline (bool), color
+            (str, or tuple of color and opacity) and fontsize (str)
+
+        Returns
+        -------
+        rule : Rule
+            the rule added
+        '''
+        rule = Rule(predicate, region, **styles)
+        self._apply_rule(rule)
+        self.rules.append(rule)
+
+        return rule
+
+    def _apply_rule(self, rule):
+        '''applies a rule to its region
+
+        Parameters
+        ----------
+        rule : Rule
+            rule to apply
+        '''
+        if self._shared is not None:
+            self._own(Ellipsis if rule.region is None else rule.region)
+        cells = self.content if rule.region is None else self.content[rule.region]
+        values = self._float_values(rule.region)
+        if not isinstance(cells, np.ndarray):
+            cells = np.array([cells], dtype=object)
+            values = np.array([values], dtype=float)
+        rule.apply(cells, values)
+
+    def heatmap(self, region=None, cmap=('blue', 'red'), vmin=None, vmax=None, 
+                levels=10, center=None):
+        '''colors the cells of a region by their values
+
+        Kept with the rules, see apply_rules().
+
+        Parameters
+        ----------
+        region : index
+            cells to color, e.g. np.s_[1:, 1:], None for the whole table
+        cmap : str or tuple
+            a color for a sequential map or a tuple (low, high) of
+            colors for a diverging map
+        vmin : float
+            value mapped to the low end, None for the minimum
+        vmax : float
+            value mapped to the high end, None for the maximum
+        levels : int
+            number of opacities for each color
+        center : float
+            value without color in a diverging map, None for the middle
+            of `vmin` and `vmax`
+
+        Returns
+        -------
+        heatmap : Heatmap
+            holds the color codes of the region and their palette
+        '''
+        heatmap = Heatmap(region, cmap, vmin, vmax, levels, center)
+        self._apply_rule(heatmap)
+        self.rules.append(heatmap)
+
+        return heatmap
+
+    def highlight_best(self, region=None, axis=0, direction='max', styles=None, 
+                       ties='all'):
+        '''styles the best values of each column or row of a region
+
+        Kept with the rules, see apply_rules().
+
+        Parameters
+        ----------
+        region : index
+            cells to rank, e.g. np.s_[1:, 1:], None for the whole table
+        axis : int
+            0 to rank within each column, 1 within each row
+        direction : str or list
+            'max' if higher is better, 'min' if lower is better, or a
+            list with one of them for each column (row if `axis` is 1)
+        styles : list
+            dict of styles for each rank, by default bold for the best
+            and underline for the second best
+        ties : str
+            'all' to style every cell tied with a ranked value, 'first'
+            to give the next rank to the later cells of a tie
+
+        Returns
+        -------
+        best : Best
+            the rule added
+        '''
+        best = Best(region, axis, direction, styles, ties)
+        self._apply_rule(best)
+        self.rules.append(best)
+
+        return best
+
+    def apply_rules(self):
+        '''applies the rules again, e.g. after the content changed
+
+        Styles set by the previous application of the rules are restored
+        first, so cells which no longer match lose them.
+        '''
+        for rule in reversed(self.rules):
+            rule.undo()
+        for rule in self.rules:
+            self._apply_rule(rule)
+
+    def remove_rules(self):
+        '''removes the rules and the styles they set
+        '''
+        for rule in reversed(self.rules):
+            rule.undo()
+        self.rules = []
+
+    def apply_stylesheet(self, stylesheet):
+        '''styles the table with a stylesheet
+
+        Parameters
+        ----------
+        stylesheet : Stylesheet or str
+            stylesheet, or name of a registered stylesheet
+        '''
+        if isinstance(stylesheet, str):
+            stylesheet = Stylesheet.get(stylesheet)
+        elif not isinstance(stylesheet, Stylesheet):
+            raise ValueError('received {}, expected Stylesheet or str'.format(\
+                             type(stylesheet)))
+        stylesheet.apply(self)
+
+    def set_decimal_alignment(self, mode='S'):
+        '''aligns numbers in columns on their decimal point
+
+        The widths of the integer and fractional parts are inferred from
+        the formatted content when rendering.
+
+        Parameters
+        ----------
+        mode : str or None
+            'S' for siunitx S columns with a table-format, 'r' for right
+            aligned columns padded with phantom digits, None to turn off
+        '''
+        if mode not in [None, 'S', 'r']:
+            raise ValueError('expected None, S or r for mode, received {}'.format(mode))
+        self.decimal_alignment = mode
+
+    @_phase('align_decimals')
+    def _align_decimals(self, alignment, alignments, formatted, rowcolors=None):
+        '''infers decimal alignment of columns from formatted content
+
+        Numbers of S columns in cells with styles wrapping them, e.g.
+        bold or a \\cellcolor, are braced as text, which siunitx cannot
+        parse as numbers.
+
+        Parameters
+        ----------
+        alignment : str
+            column specification, from _hoist_styles()
+        alignments : list
+            hoisted alignment for each column
+        formatted : np.ndarray
+            formatted content of the cells
+        rowcolors : list
+            color for \\rowcolor of each row
+
+        Returns
+        -------
+        alignment : str
+            column specification with decimal aligned columns
+        formatted : np.ndarray
+            formatted content, with numbers padded or marked up for
+            decimal alignment
+        protected : np.ndarray or None
+            dtype = bool, True for cells to brace as text in S columns
+        '''
+        segments = _split_alignment(alignment)
+        if (self.decimal_alignment is None) or (segments is None) or \
+            (len(segments) != self.content.shape[1]):
+            return alignment, formatted, None
+        if alignments is None:
+            alignments = [None]*self.content.shape[1]
+        if rowcolors is None:
+            rowcolors = [None]*self.content.shape[0]
+
+        # cells rendered through the column specification
+        plain = np.frompyfunc(lambda c: (not c.mergedrow) & (c.columns == 1), \
+                              1, 1)(self.content).astype(bool)
+        styles = np.frompyfunc(operator.attrgetter('style'), 1, 1)(self.content)
+        cellalignments = np.frompyfunc(operator.attrgetter('alignment'), 1, 1)(styles)
+        aligned = (cellalignments == None) | \
+                  (cellalignments == np.array(alignments, dtype=object))
+        eligible = plain & aligned
+
+        text = formatted.astype(str)
+        lengths = np.char.str_len(text)
+        core = np.char.strip(text, '*')
+        pre = lengths - np.char.str_len(np.char.lstrip(text, '*'))
+        post = lengths - np.char.str_len(np.char.rstrip(text, '*'))
+        signed = np.char.startswith(core, '-')
+        unsigned = np.char.lstrip(core, '-')
+        parts = np.char.partition(unsigned, '.')
+        integer = np.char.replace(parts[...,0], ',', '')
+        fraction = parts[...,2]
+        numeric = eligible & np.char.isdigit(integer) & \
+            (np.char.isdigit(fraction) | ((parts[...,1] == '') & (fraction == '')))
+
+        columns = numeric.any(axis=0)
+        if not columns.any():
+            return alignment, formatted, None
+
+        digits = np.char.str_len(fraction)
+        int_digits = np.where(numeric, np.char.str_len(integer), 0).max(axis=0)
+        frac_digits = np.where(numeric, digits, 0).max(axis=0)
+        pre_stars = np.where(numeric, pre, 0).max(axis=0)
+        post_stars = np.where(numeric, post, 0).max(axis=0)
+        signs = (numeric & signed).any(axis=0)
+        
+        formatted = formatted.copy()
+        protected = None
+        if self.decimal_alignment == 'S':
+            number = np.char.add(np.where(signed, '-', ''), 
+                                 np.char.replace(unsigned, ',', ''))
+            stars = np.char.add(np.char.add('{', np.char.multiply('*', pre)), '}')
+            number = np.where(pre > 0, np.char.add(stars, number), number)
+            stars = np.char.add(np.char.add('{', np.char.multiply('*', post)), '}')
+            number = np.where(post > 0, np.char.add(number, stars), number)
+            wrapped = dict((style, _wrap_style('', (None,) + style.key[1:]) != '') \
+                           for style in set(styles.flat))
+            colors = np.frompyfunc(operator.attrgetter('color'), 1, 1)(styles)
+            styled = np.frompyfunc(wrapped.__getitem__, 1, 1)(styles).astype(bool) | \
+                ((colors != None) & (colors != np.array(rowcolors, dtype=object)[:,None]))
+            numbers = numeric & columns & (~styled)
+            formatted[numbers] = number[numbers].astype(object)
+            protected = eligible & columns & ((~numeric) | styled) & (lengths > 0)
+        else:
+            missing = frac_digits - digits
+            point = (parts[...,1] == '') & (frac_digits > 0)
+            phantom = np.char.add(np.where(point, '.', ''), np.char.multiply('0', missing))
+            phantom = np.char.add(phantom, np.char.multiply('*', post_stars - post))
+            padded = np.char.add(text, np.char.add(np.char.add('\\phantom{', phantom), '}'))
+            numbers = numeric & columns & (np.char.str_len(phantom) > 0)
+            formatted[numbers] = padded[numbers].astype(object)
+
+        for j in np.nonzero(columns)[0]:
+            segment = segments[j]
+            lead = segment[:len(segment) - len(segment.lstrip('|'))]
+            trail = segment[len(segment.rstrip('|')):]
+            if self.decimal_alignment == 'r':
+                spec = 'r'
+            else:
+                options = ['table-format={}{}{}'.format('-' if signs[j] else '', 
+                    int_digits[j], '.{}'.format(frac_digits[j]) if frac_digits[j] > 0 else '')]
+                if pre_stars[j] > 0:
+                    options.append('table-space-text-pre={}'.format('*'*pre_stars[j]))
+                if post_stars[j] > 0:
+                    options.append('table-space-text-post={}'.format('*'*post_stars[j]))
+                spec = 'S[{}]'.format(','.join(options))
+            segments[j] = lead + spec + trail
+
+        return ''.join(segments), formatted, protected
+
+    @_phase('style_macros')
+    def _style_macros(self, alignments=None, rowcolors=None):
+        '''names macros for recurring combinations of cell styles
+
+        Parameters
+        ----------
+        alignments : list
+            hoisted alignment for each column
+        rowcolors : list
+            color for \\rowcolor of each row
+
+        Returns
+        -------
+        macros : dict or None
+            macro name by style key, None unless compact
+        '''
+        if not self.compact:
+            return None
+
+        counts = {}
+        for i in xrange(len(self.content)):
+            row = self._region(np.s_[i,:])
+            rowcolor = None if rowcolors is None else rowcolors[i]
+            hoisted = row._hoisted(alignments, rowcolor)
+            for j, cell in enumerate(row.content):
+                if cell.mergedrow | cell.isnull:
+                    continue
+                key = cell._style_key(hoisted[j])
+                counts[key] = counts.get(key, 0) + 1
+
+        plain = (None, None, False, False, False, None)
+        recurring = [key for key in counts if (counts[key] > 1) & (key != plain)]
+        recurring.sort(key=lambda key: (-counts[key], key))
+
+        return {key:_macro_name(n) for n, key in enumerate(recurring)}
+
+    @_phase('format_cells')
+    def _format_cells(self, start=0, stop=None):
+        '''formats the content of the cells
+
+        Cells of a column sharing a formatter are formatted in one call
+        on the typed column when the formatter has a `vectorized`
+        attribute.
+
+        Parameters
+        ----------
+        start : int
+            first row to format
+        stop : int
+            row to stop before, None for the last row
+
+        Returns
+        -------
+        formatted : np.ndarray
+            dtype = object, formatted content of the rows, '' for null
+            cells, `na_rep` for missing values
+        '''
+        content = self.content[start:stop]
+        formatted = np.empty(content.shape, dtype=object)
+        formatted.fill('')
+        profiler = _profiler()
+        
+        columns = self._typed_columns()
+        for j in xrange(content.shape[1]):
+            groups = {}
+            for i, cell in enumerate(content[:,j]):
+                if not cell.isnull:
+                    groups.setdefault(cell.style.formatter, []).append(i)
+
+            typed = columns[j][start:stop]
+            for formatter, rows in groups.items():
+                begin = time.time() if profiler is not None else None
+                strings = None
+                if hasattr(formatter, 'vectorized'):
+                    values = self._field_values(j, np.array(rows) + start)
+                    if values is None:
+                        values = typed[rows]
+                    try:
+                        strings = formatter.vectorized(values)
+                    except (TypeError, ValueError):
+                        pass
+                vectorized = strings is not None
+                if not vectorized:
+                    strings = [formatter(content[i,j].content) for i in rows]
+                formatted[rows,j] = strings
+                if profiler is not None:
+                    profiler.add_formatter(formatter, len(rows), vectorized, 
+                                           time.time() - begin)
+
+        if self.na_rep != '':
+            merged = np.frompyfunc(lambda c: c.mergedrow | c.mergedcol, 1, 1)(\
+                                   content).astype(bool)
+            formatted[self.missing_mask()[start:stop] & (~merged)] = self.na_rep
+
+        return formatted
+
+    def _render_rows(self, alignments=None, rowcolors=None, macros=None, 
+                     start=0, stop=None, formatted=None, protected=None):
+        '''renders each row of the tabular
+
+        Parameters
+        ----------
+        alignments : list
+            hoisted alignment for each column
+        rowcolors : list
+            color for \\rowcolor of each row
+        macros : dict
+            macro name by style key
+        start : int
+            first row to render
+        stop : int
+            row to stop before, None for the last row
+        formatted : np.ndarray
+            formatted content of rows `start` to `stop`, None to format
+            them here
+        protected : np.ndarray
+            cells of rows `start` to `stop` to brace as text
+        '''
+        if rowcolors is None:
+            rowcolors = [None]*len(self.content)
+        if stop is None:
+            stop = len(self.content)
+        if formatted is None:
+            formatted = self._format_cells(start, stop)
+        if protected is None:
+            protected = [None]*(stop - start)
+        indent = self.depth*self._get_indent()
+
+        profiler = _profiler()
+        if profiler is None:
+            return [self._region(np.s_[i,:]).as_tex(indent, alignments, rowcolors[i], 
+                    macros, self.compact, formatted[i - start], protected[i - start]) \
+                    for i in xrange(start, stop)]
+
+        rows = []
+        for i in xrange(start, stop):
+            begin = time.time()
+            rows.append(self._region(np.s_[i,:]).as_tex(indent, alignments, rowcolors[i], 
+                        macros, self.compact, formatted[i - start], protected[i - start]))
+            profiler.add_row(i, time.time() - begin)
+
+        return rows
+
+    @_phase('build_rows')
+    def _build_rows(self, alignments=None, rowcolors=None, macros=None, 
+                    formatted=None, protected=None):
         '''builds the tex string of the rows
+
+        Parameters
+        ----------
+        alignments : list
+            hoisted alignment for each column
+        rowcolors : list
+            color for \\rowcolor of each row
+        macros : dict
+            macro name by style key
+        formatted : np.ndarray
+            formatted content of the cells, None to format them here
+        protected : np.ndarray
+            cells to brace as text
         '''
         
-        rows = [self[i,:].as_tex(self.depth*self.indent) for i in xrange(len(self.content))]
+        rows = self._render_rows(alignments, rowcolors, macros, 
+                                 formatted=formatted, protected=protected)
         
         return '\n'.join(rows)
     
+    def _column_groups(self, formatted, width, keys, padding=2):
+        '''partitions the columns into groups fitting in a width
+
+        Parameters
+        ----------
+        formatted : np.ndarray
+            formatted content of the cells
+        width : int
+            width available, in characters
+        keys : list
+            columns repeated in each group
+        padding : int
+            characters of space between two columns
+
+        Returns
+        -------
+        groups : list
+            list of column indices for each group, keys first
+        '''
+        ncols = self.content.shape[1]
+        keys = sorted(set(k % ncols for k in keys))
+
+        spans = np.frompyfunc(lambda c: c.columns, 1, 1)(self.content).astype(int)
+        hidden = np.frompyfunc(lambda c: c.mergedrow, 1, 1)(self.content).astype(bool)
+        lengths = np.frompyfunc(len, 1, 1)(formatted).astype(int)
+        widths = np.where((spans == 1) & (~hidden), lengths, 0).max(axis=0)
+
+        # columns joined by a merge stay together
+        linked = np.zeros(ncols, dtype=bool)
+        minimum = {}
+        for i, j in zip(*np.nonzero((spans > 1) & (~hidden))):
+            linked[j:j + spans[i,j] - 1] = True
+            minimum[j] = max(minimum.get(j, 0), lengths[i,j])
+        
+        blocks = np.split(np.arange(ncols), np.nonzero(~linked[:-1])[0] + 1)
+
+        groups = []
+        group = []
+        key_width = widths[keys].sum() + padding*len(keys)
+        used = key_width
+        for block in blocks:
+            if np.in1d(block, keys).any():
+                if len(block) > 1:
+                    raise ValueError('key columns cannot be merged with other columns')
+                continue
+            block_width = max(widths[block].sum() + padding*len(block), \
+                              minimum.get(block[0], 0) + padding)
+            if (len(group) > 0) and (used + block_width > width):
+                groups.append(group)
+                group = []
+                used = key_width
+            group.extend(block.tolist())
+            used += block_width
+        if (len(group) > 0) or (len(groups) == 0):
+            groups.append(group)
+
+        return [keys + group for group in groups]
+
+    def _subtable(self, columns, part=0):
+        '''tabular of some columns, sharing cells and settings
+
+        Parameters
+        ----------
+        columns : list
+            indices of the columns
+        part : int
+            number of the part, labels of parts after the first get a
+            suffix
+        '''
+        table = self.__class__(self.content[:,columns])
+
+        for attr, value in self.__dict__.items():
+            if attr not in ['content', 'shape', 'original_content', 'tab_alignment',
+                            '_shared']:
+                setattr(table, attr, copy.copy(value))
+
+        segments = _split_alignment(self.tab_alignment)
+        if (segments is not None) and (len(segments) == self.content.shape[1]):
+            table.tab_alignment = ''.join(segments[j] for j in columns)
+        if hasattr(table, 'label') and (part > 0):
+            table.label = '{}_{}'.format(self.label, part + 1)
+
+        return table
+
+    def split_columns(self, width=100, keys=[0]):
+        '''splits a wide table into tables of columns fitting in a width
+
+        Widths of columns are estimated from the length of the
+        formatted content. Merged columns stay in the same part.
+
+        Parameters
+        ----------
+        width : int
+            width of the page, in characters
+        keys : list
+            indices of the columns repeated in each part, e.g. labels
+
+        Returns
+        -------
+        parts : list
+            tables sharing cells with this table
+        '''
+        formatted = self._format_cells()
+        groups = self._column_groups(formatted, width, keys)
+
+        return [self._subtable(columns, n) for n, columns in enumerate(groups)]
+
+    def split_as_tex(self, width=100, keys=[0]):
+        '''creates tex strings for a wide table split by columns
+
+        Formats the content once, see split_columns().
+
+        Parameters
+        ----------
+        width : int
+            width of the page, in characters
+        keys : list
+            indices of the columns repeated in each part
+
+        Returns
+        -------
+        parts : list
+            tex string of each part
+        '''
+        formatted = self._format_cells()
+        groups = self._column_groups(formatted, width, keys)
+
+        return [self._subtable(columns, n).as_tex(formatted[:,columns]) \
+                for n, columns in enumerate(groups)]
+
     def set_tab_alignment(self, tabular):
         '''sets default alignment of tabular
         
@@ -1246,23 +3414,39 @@ class Tabular(Tabular2D):
         
         self.tab_alignment = tabular
         
-    def _set_header(self):
+    @_phase('set_header')
+    def _set_header(self, alignment=None, macros=None):
         '''sets look of the header
+
+        Parameters
+        ----------
+        alignment : str
+            column specification, if None uses `tab_alignment`
+        macros : dict
+            macro name by style key, defined before the tabular
         '''
-        space = ' '*(self.depth-1)*self.indent
+        if alignment is None:
+            alignment = self.tab_alignment
+        space = ' '*(self.depth-1)*self._get_indent()
         tab = '{}\\begin{{{}}}\n'.format(space, 'ThreePartTable')
+        if macros:
+            for key, name in sorted(macros.items(), key=lambda item: item[1]):
+                tab += '{}\\providecommand{{\\{}}}{{}}'.format(space, name)
+                tab += '\\renewcommand{{\\{}}}[1]{{{}}}\n'.format(name, \
+                                                        _wrap_style('#1', key))
         tab += '{}\\begin{{{}}}{{{}}}'.format(space, \
-                                    self.tab_type, self.tab_alignment)
+                                    self.tab_type, alignment)
 
-        return tab + '\n\n'
+        return tab + ('\n' if self.compact else '\n\n')
         
+    @_phase('set_footer')
     def _set_footer(self):
         '''sets look of the footer
         '''
-        space = ' '*(self.depth-1)*self.indent
+        space = ' '*(self.depth-1)*self._get_indent()
         end = '\n{}\\end{{{}}}'.format(space, self.tab_type)
         
-        spc = ' '*(self.depth)*self.indent
+        spc = ' '*(self.depth)*self._get_indent()
         
         if len(self.notes) > 0:
             notes = []
@@ -1288,16 +3472,43 @@ class Tabular(Tabular2D):
             raise ValueError('{} not a valid tabular type'.format(type_))
         self.tab_type = type_
     
-    def as_tex(self):
-        '''creates tex string for the row
+    def _render(self, formatted=None):
+        '''renders the tabular, without its environments
+
+        Parameters
+        ----------
+        formatted : np.ndarray
+            formatted content of the cells, None to format them here
         '''
-            
-        
-        header = self._set_header()
+        if formatted is None:
+            formatted = self._format_cells()
+        alignment, alignments, rowcolors = self._hoist_styles()
+        alignment, formatted, protected = self._align_decimals(alignment, 
+                                                    alignments, formatted, rowcolors)
+        macros = self._style_macros(alignments, rowcolors)
+        header = self._set_header(alignment, macros)
         footer = self._set_footer()
-        rows = self._build_rows()
+        rows = self._build_rows(alignments, rowcolors, macros, formatted, protected)
         
-        tabular = header + rows + footer
+        return header + rows + footer
+
+    def as_tex(self, formatted=None):
+        '''creates tex string for the row
+
+        Parameters
+        ----------
+        formatted : np.ndarray
+            formatted content of the cells, as from _format_cells(),
+            None to format them while rendering
+
+        Notes
+        -----
+        Rendering does not modify the table, only filling caches that any
+        thread would fill alike, so a table may be rendered by several
+        threads at once, and profiled by a profiler active in each of them.
+        Setting styles or content while it renders is not thread-safe.
+        '''
+        tabular = self._render(formatted)
         
         string = self._handle_environments(tabular)
         
@@ -1384,15 +3595,22 @@ class Table(Tabular):
         '''
         self.label = label
 
-    def as_tex(self):
+    def as_tex(self, formatted=None):
         '''creates tex string for the row
+
+        Parameters
+        ----------
+        formatted : np.ndarray
+            formatted content of the cells, as from _format_cells(),
+            None to format them while rendering
+
+        Notes
+        -----
+        The table environment is added to a shallow copy, leaving the
+        table as it was, see Tabular.as_tex()
         '''
-        
-        for env in self.environments:
-            if 'table' == env[0]:
-                self.environments.remove(env)
-                self.depth -= 1
-            
+        depth = self.depth
+
         # Justification
         if self.loc == 'c':
             just = 'centering'
@@ -1401,24 +3619,21 @@ class Table(Tabular):
         elif self.loc == 'l':
             just = 'raggedright'
         
-        post = '{}\\{}'.format(' '*(self.depth - 1)*self.indent, just)
+        post = '{}\\{}'.format(' '*(depth - 1)*self._get_indent(), just)
         label = ' \\label{{{}}}'.format(self.label)
         post += '\n{}\\captionsetup{{singlelinecheck=false,justification={}}}'.format(\
-                ' '*(self.depth - 1)*self.indent, just)
+                ' '*(depth - 1)*self._get_indent(), just)
         post += '\n{}\\caption{{{}}}'.format(\
-        ' '*(self.depth - 1)*self.indent, \
+        ' '*(depth - 1)*self._get_indent(), \
                     self.caption + label)
-        
-         
-        self.add_environment('table', post, prepend=True)
-       
-        header = self._set_header()
-        footer = self._set_footer()
-        rows = self._build_rows()
-        
-        tabular = header + rows + footer
-        
-        string = self._handle_environments(tabular)
+
+        table = copy.copy(self)
+        table.environments = [('table', post)] + self.environments
+        table.depth = depth + 1
+
+        tabular = table._render(formatted)
+
+        string = table._handle_environments(tabular)
 
         return string
 
@@ -1433,7 +3648,112 @@ class LongTable(Tabular):
         self.caption = 'Table 1'
         self.label = 'table1'
         self.loc = 'c'
-    
+        self.source = None
+
+    @classmethod
+    def from_records(cls, records, header=True, chunksize=None):
+        '''creates a longtable from a structured array, see
+        Tabular.from_records()
+
+        Only the header and the first `chunksize` records are made
+        cells, to be styled as the table. write() renders the remaining
+        records a chunk at a time, as from_csv() does, reading only the
+        records of the chunk from `records`, e.g. an np.memmap.
+
+        Parameters
+        ----------
+        records : np.ndarray
+            1-d structured array, a column for each field
+        header : bool
+            True to put the field names in a header row
+        chunksize : int
+            number of records rendered at a time, None to make every
+            record a cell
+        '''
+        if chunksize is None:
+            return super(LongTable, cls).from_records(records, header)
+        if (not isinstance(chunksize, int)) or (chunksize < 1):
+            raise ValueError('chunksize must be a positive int')
+
+        table = super(LongTable, cls).from_records(records[:chunksize], header)
+        records = records.reshape(-1)
+        if len(records) > chunksize:
+            table.source = ([records[name][chunksize:] for name in \
+                             records.dtype.names], chunksize, header)
+
+        return table
+
+    @classmethod
+    def from_memmap(cls, path, dtype, shape, offset=0, header=True, 
+                    chunksize=10000):
+        '''creates a longtable from a binary file, memory-mapped read-only
+
+        Rows past the first `chunksize` are streamed by write(), see
+        from_records(), so that only the rows being rendered are read.
+
+        Parameters
+        ----------
+        path : str
+            name of the file
+        dtype : np.dtype
+            structured dtype for a column for each field, see
+            from_records(), or a plain dtype for a 2-d `shape`
+        shape : int or tuple
+            number of records, or (rows, columns) for a plain dtype
+        offset : int
+            bytes before the data in the file
+        header : bool
+            True to put the field names in a header row, structured
+            dtypes only
+        chunksize : int
+            number of rows rendered at a time, None to make every row a
+            cell
+        '''
+        data = np.memmap(path, dtype=dtype, mode='r', offset=offset, shape=shape)
+        if data.dtype.names is not None:
+            return cls.from_records(data, header, chunksize)
+        if data.ndim != 2:
+            raise ValueError('received shape {}, expected 2-d'.format(data.shape))
+        if chunksize is None:
+            return cls(data)
+        if (not isinstance(chunksize, int)) or (chunksize < 1):
+            raise ValueError('chunksize must be a positive int')
+
+        table = cls(data[:chunksize])
+        if len(data) > chunksize:
+            table.source = ([data[chunksize:,j] for j in xrange(data.shape[1])], 
+                            chunksize, False)
+
+        return table
+
+    @classmethod
+    def from_csv(cls, path, chunksize=10000, header=True, delimiter=','):
+        '''creates a longtable streaming the rows of a csv file
+
+        Only the header and the first `chunksize` rows are read, to be
+        styled as the table. write() renders the remaining rows a chunk
+        at a time in the style of the last row, the prototype, with the
+        formatter of each of its cells.
+
+        Parameters
+        ----------
+        path : str
+            name of the csv file
+        chunksize : int
+            number of rows read at a time
+        header : bool
+            True if the first line of the file holds column names
+        delimiter : str
+            field separator
+        '''
+        if (not isinstance(chunksize, int)) or (chunksize < 1):
+            raise ValueError('chunksize must be a positive int')
+
+        table = super(LongTable, cls).from_csv(path, header, delimiter, chunksize)
+        table.source = (path, chunksize, header, delimiter)
+
+        return table
+
     def set_location(self, loc='c'):
         '''horizontal location (justification) of table
         
@@ -1476,11 +3796,39 @@ class LongTable(Tabular):
         '''
         self.repeats = repeats
 
-    def _build_rows(self):
+    @_phase('build_rows')
+    def _build_rows(self, alignments=None, rowcolors=None, macros=None, 
+                    formatted=None, protected=None):
         '''builds the tex string of the rows
+
+        Parameters
+        ----------
+        alignments : list
+            hoisted alignment for each column
+        rowcolors : list
+            color for \\rowcolor of each row
+        macros : dict
+            macro name by style key
+        formatted : np.ndarray
+            formatted content of the cells, None to format them here
+        protected : np.ndarray
+            cells to brace as text
+        '''
+        rows = self._render_rows(alignments, rowcolors, macros, 
+                                 formatted=formatted, protected=protected)
+
+        return self._build_head(rows[:self.repeats]) + '\n'.join(rows[self.repeats:])
+
+    @_phase('build_head')
+    def _build_head(self, headrows):
+        '''builds the caption, head and foot of the longtable
+
+        Parameters
+        ----------
+        headrows : list
+            tex of the rows repeated on each page
         '''
-        space = ' '*(self.depth)*self.indent
-        rows = [self[i,:].as_tex(self.depth*self.indent) for i in xrange(len(self.content))]
+        space = ' '*(self.depth)*self._get_indent()
 
         # Justification
         if self.loc == 'c':
@@ -1498,7 +3846,6 @@ class LongTable(Tabular):
         caption += '\n{}\\caption{{{}}} \\\\\n'.format(space, self.caption + label)
                     
         firsthead = caption
-        headrows = rows[:self.repeats]
         firsthead += '\n'.join(headrows) + '\n{}\\endfirsthead\n\n'.format(space)
         head = '{}\\mc{{{}}}{{c}}{{{}}} \\\\\n'.format(space, self.shape[1], \
             '\\tablename\\ \\thetable\\ -- \\emph{Continued from previous page}')
@@ -1507,7 +3854,226 @@ class LongTable(Tabular):
             '\\emph{Continued on next page}')
         foot += '\n{}\\endfoot\n{}\\endlastfoot\n\n'.format(space, space)
         
-        return firsthead + head + foot + '\n'.join(rows[self.repeats:])
+        return firsthead + head + foot
+
+    def write(self, filename, fragment_rows=None, processes=1):
+        '''write table to file
+        
+        Parameters
+        ----------
+        filename : str
+            name of file
+        fragment_rows : int
+            if given, the body of the table is written to fragment files
+            of `fragment_rows` rows each, named after `filename` with
+            suffixes '_1', '_2', ..., which the table in `filename`
+            inputs in order, with the expandable \\@@input so that rows
+            may start with \\rowcolor; names are written as given, TeX
+            resolving them against the directory it runs in, e.g.
+            'tables/big' from the directory of the main document
+        processes : int
+            number of worker processes rendering the fragments
+
+        Returns
+        -------
+        fragments : list
+            names of the fragment files, empty if not fragmented
+
+        Notes
+        -----
+        Tables streaming rows, created by from_csv(), from_records() or
+        from_memmap() with a `chunksize`, are not fragmented, the rows
+        left in their source are streamed to `filename`
+        '''
+        if self.source is not None:
+            self._write_stream(filename)
+            return []
+        if fragment_rows is None:
+            Tabular.write(self, filename)
+            return []
+        if not isinstance(filename, str):
+            raise ValueError('filename must be a str')
+        if (not isinstance(fragment_rows, int)) or (fragment_rows < 1):
+            raise ValueError('fragment_rows must be a positive int')
+        if (not isinstance(processes, int)) or (processes < 1):
+            raise ValueError('processes must be a positive int')
+        
+        if filename[-4:] != '.tex':
+            filename = filename + '.tex'
+
+        alignment, alignments, rowcolors = self._hoist_styles()
+        formatted = protected = None
+        if self.decimal_alignment is not None:
+            alignment, formatted, protected = self._align_decimals(alignment, 
+                                        alignments, self._format_cells(), rowcolors)
+        macros = self._style_macros(alignments, rowcolors)
+        
+        tasks = []
+        for start in xrange(self.repeats, len(self.content), fragment_rows):
+            stop = min(start + fragment_rows, len(self.content))
+            name = '{}_{}.tex'.format(filename[:-4], len(tasks) + 1)
+            tasks.append((start, stop, name))
+
+        layout = (alignments, rowcolors, macros, formatted, protected)
+        _write_fragments(self, layout, tasks, processes)
+
+        space = ' '*(self.depth)*self._get_indent()
+        inputs = ['{}\\@@input {}'.format(space, name) for _, _, name in tasks]
+
+        if formatted is not None:
+            formatted = formatted[:self.repeats]
+            protected = protected if protected is None else protected[:self.repeats]
+        headrows = self._render_rows(alignments, rowcolors, macros, 0, self.repeats, 
+                                     formatted, protected)
+        rows = self._build_head(headrows) + '\n'.join(inputs)
+        tabular = self._set_header(alignment, macros) + rows + self._set_footer()
+        
+        texfile = open(filename, 'wb')
+        texfile.write('\\makeatletter\n' + self._handle_environments(tabular) + 
+                      '\n\\makeatother')
+        texfile.close()
+
+        return [name for _, _, name in tasks]
+
+    def _row_template(self, alignments, rowcolors, macros):
+        '''splits the tex of the last row around the content of its cells
+
+        Parameters
+        ----------
+        alignments : list
+            hoisted alignment for each column
+        rowcolors : list
+            color for \\rowcolor of each row
+        macros : dict
+            macro name by style key
+
+        Returns
+        -------
+        pieces : list
+            tex before the first cell, between cells and after the last
+        '''
+        last = len(self.content) - 1
+        markers = np.array([['\x01{}\x01'.format(j) for j in \
+                             xrange(self.content.shape[1])]], dtype=object)
+        rest = self._render_rows(alignments, rowcolors, macros, last, last + 1, 
+                                 markers)[0]
+
+        pieces = []
+        for marker in markers[0]:
+            if marker not in rest:
+                raise ValueError('the last row styles streamed rows, it cannot be merged')
+            piece, rest = rest.split(marker, 1)
+            pieces.append(piece)
+
+        return pieces + [rest]
+
+    def _format_chunk(self, columns, parse=True):
+        '''formats columns of a chunk with the formatters of the last row
+
+        Text read from a csv file is parsed for vectorized formatters,
+        others receive the text as cells of from_csv() do. Text of columns
+        which are not numeric in the chunk is escaped unless formatted
+        with escape_tex().
+
+        Parameters
+        ----------
+        columns : list
+            dtype = object array of the text of each column, or array of
+            each field of records
+        parse : bool
+            True for text read from a csv file, False for records
+
+        Returns
+        -------
+        formatted : list
+            dtype = object array of the formatted values of each column
+        '''
+        formatted = []
+        for cell, text in zip(self.content[-1], columns):
+            formatter = cell.formatter
+            column = text
+            if parse:
+                column = _parse_column(text)
+                missing = text == ''
+                if (column.dtype == object) and (formatter is not escape_tex):
+                    text = column = escape_tex.vectorized(text)
+            else:
+                missing = np.isnan(column) if column.dtype.kind == 'f' else \
+                          np.zeros(len(column), dtype=bool)
+
+            values = None
+            if hasattr(formatter, 'vectorized'):
+                try:
+                    values = np.asarray(formatter.vectorized(column), dtype=object)
+                except (TypeError, ValueError):
+                    pass
+            if values is None:
+                # missing values, e.g. a chunk of only empty csv values, 
+                # are not formatted
+                values = np.empty(len(text), dtype=object)
+                values[~missing] = [formatter(val) for val in text[~missing].tolist()]
+            values[missing] = self.na_rep
+            formatted.append(values)
+
+        return formatted
+
+    def _source_chunks(self):
+        '''columns of each chunk of the rows left in the source of the
+        table, text read from its csv file or views of its records
+        '''
+        if isinstance(self.source[0], str):
+            path, chunksize, header, delimiter = self.source
+            with open(path, 'rb') as csvfile:
+                reader = csv.reader(csvfile, delimiter=delimiter)
+                for _ in itertools.islice(reader, len(self.content)):
+                    pass
+                while True:
+                    texts = _read_chunk(reader, chunksize, self.content.shape[1])
+                    if len(texts) == 0:
+                        return
+                    yield texts
+        else:
+            columns, chunksize, header = self.source
+            for start in xrange(0, len(columns[0]), chunksize):
+                yield [column[start:start + chunksize] for column in columns]
+
+    def _write_stream(self, filename):
+        '''writes the table followed by the rows left in its source, read,
+        formatted and written a chunk at a time
+
+        Parameters
+        ----------
+        filename : str
+            name of file
+        '''
+        if not isinstance(filename, str):
+            raise ValueError('filename must be a str')
+        if self.decimal_alignment is not None:
+            raise ValueError('decimal alignment requires the whole table, '
+                             'not available when streaming')
+        if filename[-4:] != '.tex':
+            filename = filename + '.tex'
+
+        header, parse = self.source[2], isinstance(self.source[0], str)
+        alignment, alignments, rowcolors = self._hoist_styles()
+        macros = self._style_macros(alignments, rowcolors)
+        rows = self._build_rows(alignments, rowcolors, macros)
+        marker = '\x01rows\x01'
+        tabular = self._set_header(alignment, macros) + rows + marker + \
+                  self._set_footer()
+        before, after = self._handle_environments(tabular).split(marker)
+        pieces = self._row_template(alignments, rowcolors, macros) if \
+                 len(self.content) > int(header) else None
+
+        texfile = open(filename, 'wb')
+        texfile.write(before)
+        for columns in (self._source_chunks() if pieces is not None else []):
+            lines = pieces[0]
+            for column, piece in zip(self._format_chunk(columns, parse), pieces[1:]):
+                lines = lines + column + piece
+            texfile.write('\n' + '\n'.join(lines))
+        texfile.write(after)
+        texfile.close()
     
 
 
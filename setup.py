@@ -7,6 +7,9 @@ setup(
     author_email='jaketorcasso@gmail.com',
     packages=['pytabular'],
     scripts=['bin/PyTabular_tutorial.ipynb'],
+    entry_points={
+        'console_scripts': ['pytabular = pytabular.cli:main'],
+    },
     url='http://pypi.python.org/pypi/PyTabular/',
     license='LICENSE.txt',
     description='Package for creating LateX tables.',
@@ -0,0 +1,89 @@
+'''
+Tests for Decimal Alignment
+---------------------------
+
+Run from the repository root with::
+
+    python -m unittest discover tests
+'''
+
+from __future__ import print_function, division
+
+# Standard Library
+import unittest
+
+# Third Party
+import numpy as np
+
+# Local
+from pytabular import Tabular, format_int
+
+
+class TestDecimalAlignment(unittest.TestCase):
+
+    def setUp(self):
+        data = np.array([['Var', 'Coef', 'p', 'N'],
+                         ['a', 1.5, 0.04, 1200],
+                         ['b', -12.25, 0.2, 35],
+                         ['c', '', 0.001, 7]], dtype=object)
+        self.table = Tabular(data)
+        self.table[1:,1].set_digits(2)
+        self.table[1:,2].set_digits(3)
+        self.table[1:,2].set_stars('right')
+        self.table[1:,3].set_formatter(format_int)
+        self.table[2,1].set_digits(1)
+        self.table.set_tab_alignment('l|ccc')
+
+    def test_off_by_default(self):
+        self.assertIn('{l|ccc}', self.table.as_tex())
+
+    def test_siunitx_columns(self):
+        self.table.set_decimal_alignment('S')
+        tex = self.table.as_tex()
+
+        self.assertIn('{l|S[table-format=-2.2]'
+                      'S[table-format=1.3,table-space-text-post=***]'
+                      'S[table-format=4]}', tex)
+        # header text is braced, stars are kept out of the number
+        self.assertIn('Var & {Coef} & {p} & {N} \\\\', tex)
+        self.assertIn('a & 1.50 & 0.040{**} & 1200 \\\\', tex)
+        self.assertIn('c &  & 0.001{***} & 7 \\\\', tex)
+
+    def test_phantom_padding(self):
+        self.table.set_decimal_alignment('r')
+        tex = self.table.as_tex()
+
+        self.assertIn('{l|rrr}', tex)
+        self.assertIn('a & 1.50 & 0.040**\\phantom{*} & 1,200 \\\\', tex)
+        self.assertIn('b & -12.2\\phantom{0} & 0.200\\phantom{***} & 35 \\\\', tex)
+
+    def test_styled_numbers_braced(self):
+        table = Tabular(np.array([[1.5, 10.25], [-3.0, 2.5]]))
+        table[0,0].set_bold()
+        table[1,1].set_color('red')
+        table.set_decimal_alignment('S')
+        tex = table.as_tex()
+
+        self.assertIn('{S[table-format=-1.1]S[table-format=2.2]}', tex)
+        self.assertIn('{\\textbf{1.5}} & 10.25 \\\\', tex)
+        self.assertIn('-3.0 & {\\cellcolor{red!50}{2.5}} \\\\', tex)
+
+    def test_text_columns_unchanged(self):
+        table = Tabular(np.array([['x', 'y'], ['a', 'b']]))
+        table.set_decimal_alignment('S')
+
+        self.assertIn('{cc}', table.as_tex())
+
+    def test_turn_off(self):
+        before = self.table.as_tex()
+        self.table.set_decimal_alignment('S')
+        self.table.set_decimal_alignment(None)
+
+        self.assertEqual(self.table.as_tex(), before)
+
+    def test_invalid_mode(self):
+        self.assertRaises(ValueError, self.table.set_decimal_alignment, 'd')
+
+
+if __name__ == '__main__':
+    unittest.main()
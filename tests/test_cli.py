@@ -0,0 +1,126 @@
+'''
+Tests for the Command Line Renderer
+-----------------------------------
+
+Run from the repository root with::
+
+    python -m unittest discover tests
+'''
+
+from __future__ import print_function, division
+
+# Standard Library
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from StringIO import StringIO
+
+# Third Party
+import numpy as np
+
+# Local
+from pytabular import Table, LongTable
+from pytabular.cli import load_spec, build_table, find_specs, render_all, main
+
+
+class TestCLI(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        with open(os.path.join(self.directory, 'results.csv'), 'w') as csvfile:
+            csvfile.write('model,acc,n\na,0.91234,10\nb,0.85,20\n')
+        self.spec = {'data': 'results.csv', 'caption': 'Results',
+                     'label': 'results', 'digits': 2, 'alignment': 'lcc',
+                     'styles': [{'rows': '0', 'bold': True}],
+                     'notes': ['Accuracy on the test set.']}
+        self.stdout = sys.stdout
+        sys.stdout = StringIO()
+
+    def tearDown(self):
+        sys.stdout = self.stdout
+        shutil.rmtree(self.directory)
+
+    def _write_spec(self, name, spec):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as specfile:
+            json.dump(spec, specfile)
+        return path
+
+    def _read(self, name, directory=None):
+        with open(os.path.join(directory or self.directory, name)) as texfile:
+            return texfile.read()
+
+    def test_load_spec(self):
+        spec = load_spec(self._write_spec('results.json', self.spec))
+
+        self.assertEqual(spec['data'], os.path.join(self.directory, 'results.csv'))
+        self.assertTrue(isinstance(spec['caption'], str))
+
+    def test_invalid_specs(self):
+        path = self._write_spec('nodata.json', {'caption': 'Results'})
+        self.assertRaises(ValueError, load_spec, path)
+        path = self._write_spec('kind.json', dict(self.spec, kind='figure'))
+        self.assertRaises(ValueError, load_spec, path)
+
+    def test_build_table(self):
+        table = build_table(load_spec(self._write_spec('results.json', self.spec)))
+        tex = table.as_tex()
+
+        self.assertTrue(isinstance(table, Table))
+        self.assertIn('\\caption{Results \\label{results}}', tex)
+        self.assertIn('{lcc}', tex)
+        self.assertIn('\\textbf{model} & \\textbf{acc} & \\textbf{n} \\\\', tex)
+        self.assertIn('a & 0.91 & 10 \\\\', tex)
+        self.assertIn('Accuracy on the test set.', tex)
+
+    def test_build_longtable_from_npy(self):
+        records = np.zeros(3, dtype=[('a', '<i8'), ('b', '<f8')])
+        records['a'] = [1, 2, 3]
+        records['b'] = [0.5, 0.25, 0.125]
+        np.save(os.path.join(self.directory, 'records.npy'), records)
+        spec = {'data': 'records.npy', 'kind': 'longtable', 'digits': 1,
+                'chunksize': 1}
+        table = build_table(load_spec(self._write_spec('records.json', spec)))
+
+        self.assertTrue(isinstance(table, LongTable))
+        self.assertEqual(table.content.shape, (2, 2))
+
+    def test_find_specs(self):
+        self._write_spec('b.json', self.spec)
+        self._write_spec('a.json', self.spec)
+
+        self.assertEqual([os.path.basename(path) for path in find_specs(self.directory)],
+                         ['a.json', 'b.json'])
+
+    def test_render_all(self):
+        paths = [self._write_spec('results.json', self.spec),
+                 self._write_spec('other.json', dict(self.spec, output='renamed')),
+                 self._write_spec('broken.json', dict(self.spec, data='missing.csv'))]
+        results = render_all(paths, processes=2)
+
+        self.assertEqual([error is None for _, _, _, error in results],
+                         [True, True, False])
+        self.assertEqual(results[1][1], os.path.join(self.directory, 'renamed.tex'))
+        self.assertIn('a & 0.91 & 10 \\\\', self._read('results.tex'))
+        self.assertEqual(self._read('renamed.tex'), self._read('results.tex'))
+
+    def test_main(self):
+        self._write_spec('results.json', self.spec)
+        outdir = os.path.join(self.directory, 'tables')
+
+        self.assertEqual(main([self.directory, '--out', outdir, '-p', '1']), 0)
+        self.assertIn('a & 0.91 & 10 \\\\', self._read('results.tex', outdir))
+        self.assertIn('results.json -> ', sys.stdout.getvalue())
+
+    def test_main_fails_with_broken_spec(self):
+        self._write_spec('broken.json', dict(self.spec, data='missing.csv'))
+
+        self.assertEqual(main([self.directory, '-p', '1']), 1)
+        self.assertIn('broken.json failed: IOError', sys.stdout.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
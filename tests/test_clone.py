@@ -0,0 +1,86 @@
+'''
+Tests for Copy-on-Write Cloning
+-------------------------------
+
+Run from the repository root with::
+
+    python -m unittest discover tests
+'''
+
+from __future__ import print_function, division
+
+# Standard Library
+import unittest
+
+# Third Party
+import numpy as np
+
+# Local
+from pytabular import Table, Stylesheet
+
+
+class TestClone(unittest.TestCase):
+
+    def setUp(self):
+        self.table = Table(np.arange(12).reshape((4, 3)))
+        self.table.set_caption('Original')
+
+    def test_clone_renders_alike(self):
+        clone = self.table.clone()
+
+        self.assertEqual(clone.as_tex(), self.table.as_tex())
+        self.assertIs(clone.content[1,1], self.table.content[1,1])
+
+    def test_styling_clone_leaves_original(self):
+        before = self.table.as_tex()
+        clone = self.table.clone()
+        clone[1:, 2].set_bold()
+        clone.set_caption('Variant')
+
+        self.assertEqual(self.table.as_tex(), before)
+        self.assertTrue(clone[1,2].style.bold)
+        self.assertFalse(self.table[1,2].style.bold)
+        self.assertIn('Variant', clone.as_tex())
+        self.assertNotIn('Variant', before)
+
+    def test_styling_original_leaves_clone(self):
+        clone = self.table.clone()
+        before = clone.as_tex()
+        self.table[0].set_color('red')
+
+        self.assertEqual(clone.as_tex(), before)
+
+    def test_content_set_on_clone_leaves_original(self):
+        clone = self.table.clone()
+        clone[1:3, 0].merge(force=True)
+
+        self.assertEqual(self.table[2,0].content, 6)
+        self.assertEqual(clone[1,0].rows, 2)
+        self.assertEqual(self.table[1,0].rows, 1)
+
+    def test_rules_stay_with_table(self):
+        self.table.add_rule(lambda x: x > 5, bold=True)
+        clone = self.table.clone()
+        self.table.remove_rules()
+
+        self.assertTrue(clone[3,0].style.bold)
+        self.assertFalse(self.table[3,0].style.bold)
+        self.assertEqual(clone.rules, [])
+
+    def test_apply_stylesheet_to_clone_leaves_original(self):
+        before = self.table.as_tex()
+        clone = self.table.clone()
+
+        sheet = Stylesheet()
+        sheet.add('0', bold=True)
+        sheet.add('1:', '1:', color='red')
+        clone.apply_stylesheet(sheet)
+
+        self.assertEqual(self.table.as_tex(), before)
+        self.assertNotEqual(clone.as_tex(), before)
+        self.assertTrue(clone[0,0].style.bold)
+        self.assertFalse(self.table[0,0].style.bold)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+'''
+Tests for Compact Output
+------------------------
+
+Run from the repository root with::
+
+    python -m unittest discover tests
+'''
+
+from __future__ import print_function, division
+
+# Standard Library
+import unittest
+
+# Third Party
+import numpy as np
+
+# Local
+from pytabular import Table
+from pytabular.tables import _macro_name
+
+
+class TestCompact(unittest.TestCase):
+
+    def setUp(self):
+        self.table = Table(np.arange(12).reshape((4, 3)))
+        self.table[0].set_bold()
+        self.table[1:, 0].set_color('red')
+
+    def test_default_is_not_compact(self):
+        self.assertFalse(self.table.compact)
+        self.assertIn(' & ', self.table.as_tex())
+        self.assertNotIn('\\providecommand', self.table.as_tex())
+
+    def test_compact_rows(self):
+        self.table.set_compact()
+        tex = self.table.as_tex()
+
+        self.assertNotIn(' & ', tex)
+        self.assertNotIn('\n\n', tex)
+        self.assertIn('4&5\\\\\n', tex)
+
+    def test_recurring_styles_become_macros(self):
+        self.table.set_compact()
+        tex = self.table.as_tex()
+
+        self.assertIn('\\renewcommand{\\ptA}[1]{\\textbf{#1}}', tex)
+        self.assertIn('\\renewcommand{\\ptB}[1]{\\cellcolor{red!50}{#1}}', tex)
+        self.assertIn('\\ptA{0}&\\ptA{1}&\\ptA{2}\\\\', tex)
+        self.assertIn('\\ptB{3}&4&5\\\\', tex)
+
+    def test_single_styles_stay_inline(self):
+        self.table[3,2].set_emph()
+        self.table.set_compact()
+        tex = self.table.as_tex()
+
+        self.assertIn('\\emph{11}', tex)
+        self.assertEqual(tex.count('\\providecommand'), 2)
+
+    def test_compact_off_restores_output(self):
+        before = self.table.as_tex()
+        self.table.set_compact()
+        self.table.as_tex()
+        self.table.set_compact(False)
+
+        self.assertEqual(self.table.as_tex(), before)
+
+    def test_invalid_compact(self):
+        self.assertRaises(ValueError, self.table.set_compact, 'yes')
+
+    def test_macro_names(self):
+        self.assertEqual(_macro_name(0), 'ptA')
+        self.assertEqual(_macro_name(25), 'ptZ')
+        self.assertEqual(_macro_name(26), 'ptAA')
+        self.assertEqual(_macro_name(27), 'ptAB')
+
+
+if __name__ == '__main__':
+    unittest.main()
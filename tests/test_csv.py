@@ -0,0 +1,105 @@
+'''
+Tests for Tables from CSV Files
+-------------------------------
+
+Run from the repository root with::
+
+    python -m unittest discover tests
+'''
+
+from __future__ import print_function, division
+
+# Standard Library
+import os
+import shutil
+import tempfile
+import unittest
+
+# Third Party
+import numpy as np
+
+# Local
+from pytabular import Tabular, LongTable, csv_to_tex, format_digits
+
+
+class TestCSV(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'data.csv')
+        with open(self.path, 'w') as csvfile:
+            csvfile.write('name_x,val,n\n')
+            for i in range(10):
+                csvfile.write('a&b{},{},{}\n'.format(i, '' if i == 4 else i*1.5, i))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _read(self, filename):
+        with open(filename) as texfile:
+            return texfile.read()
+
+    def _write(self, table):
+        table[1:,1].set_formatter(format_digits(2))
+        table[1:,2].set_bold()
+        table.set_na_rep('--')
+        filename = os.path.join(self.directory, 'table.tex')
+        table.write(filename)
+        return self._read(filename)
+
+    def test_columns_typed(self):
+        table = Tabular.from_csv(self.path)
+
+        self.assertEqual(table.content.shape, (11, 3))
+        self.assertEqual(table.dtypes, [np.dtype('O'), np.dtype('f8'), np.dtype('i8')])
+        self.assertTrue(np.isnan(table.values(1, slice(1, None))[4]))
+
+    def test_values_render_as_written(self):
+        path = os.path.join(self.directory, 'codes.csv')
+        with open(path, 'w') as csvfile:
+            csvfile.write('zip,x\n02130,1.50\n10001,2.25\n')
+        tex = Tabular.from_csv(path).as_tex()
+
+        self.assertIn('02130 & 1.50 \\\\', tex)
+        self.assertIn('10001 & 2.25 \\\\', tex)
+
+    def test_text_escaped(self):
+        tex = Tabular.from_csv(self.path).as_tex()
+
+        self.assertIn('name\\_x & val & n \\\\', tex)
+        self.assertIn('a\\&b3 & 4.5 & 3 \\\\', tex)
+
+    def test_nrows(self):
+        table = Tabular.from_csv(self.path, nrows=3)
+
+        self.assertEqual(table.content.shape, (4, 3))
+
+    def test_without_header(self):
+        table = Tabular.from_csv(self.path, header=False)
+
+        self.assertEqual(table.content.shape, (11, 3))
+        self.assertEqual(table[0,0].content, 'name_x')
+
+    def test_streamed_chunks_write_same_file(self):
+        full = self._write(LongTable.from_csv(self.path, chunksize=100))
+
+        self.assertIn('a\\&b4 & -- & \\textbf{4} \\\\', full)
+        for chunksize in [1, 3, 10]:
+            table = LongTable.from_csv(self.path, chunksize=chunksize)
+            self.assertEqual(table.content.shape, (chunksize + 1, 3))
+            self.assertEqual(self._write(table), full)
+
+    def test_csv_to_tex(self):
+        filename = os.path.join(self.directory, 'converted')
+        csv_to_tex(self.path, filename, chunksize=4, formatters={1:format_digits(1)})
+        tex = self._read(filename + '.tex')
+
+        self.assertIn('a\\&b9 & 13.5 & 9 \\\\', tex)
+        self.assertEqual(tex.count('a\\&b'), 10)
+
+    def test_invalid_chunksize(self):
+        self.assertRaises(ValueError, LongTable.from_csv, self.path, chunksize=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
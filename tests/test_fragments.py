@@ -0,0 +1,90 @@
+'''
+Tests for Fragmented LongTables
+-------------------------------
+
+Run from the repository root with::
+
+    python -m unittest discover tests
+'''
+
+from __future__ import print_function, division
+
+# Standard Library
+import os
+import shutil
+import tempfile
+import unittest
+
+# Third Party
+import numpy as np
+
+# Local
+from pytabular import LongTable, read_tex
+
+
+class TestFragments(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'long')
+        self.table = LongTable(np.arange(30).reshape((10, 3)))
+        self.table[0].set_bold()
+        self.table[1:,1].set_color('red')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _read(self, filename):
+        with open(filename) as texfile:
+            return texfile.read()
+
+    def test_without_fragments(self):
+        fragments = self.table.write(self.filename)
+
+        self.assertEqual(fragments, [])
+        self.assertEqual(self._read(self.filename + '.tex'), self.table.as_tex())
+
+    def test_fragment_names(self):
+        fragments = self.table.write(self.filename, fragment_rows=4)
+
+        expected = [self.filename + '_{}.tex'.format(i) for i in [1, 2, 3]]
+        self.assertEqual(fragments, expected)
+        for fragment in fragments:
+            self.assertTrue(os.path.exists(fragment))
+
+    def test_master_inputs_fragments(self):
+        fragments = self.table.write(self.filename, fragment_rows=4)
+        master = self._read(self.filename + '.tex')
+
+        self.assertTrue(master.startswith('\\makeatletter\n'))
+        self.assertTrue(master.rstrip().endswith('\\makeatother'))
+        for fragment in fragments:
+            self.assertIn('\\@@input {}\n'.format(fragment), master)
+
+    def test_fragments_hold_body(self):
+        fragments = self.table.write(self.filename, fragment_rows=4)
+        rows = [self._read(fragment).count('\\\\') for fragment in fragments]
+
+        # the first row is the header, repeated on each page
+        self.assertEqual(rows, [4, 4, 1])
+        self.assertIn('\\cellcolor{red!50}{4}', self._read(fragments[0]))
+        self.assertIn('27 & \\cellcolor{red!50}{28} & 29', self._read(fragments[2]))
+
+    def test_processes_write_same_files(self):
+        fragments = self.table.write(self.filename, fragment_rows=3)
+        serial = [self._read(fragment) for fragment in fragments]
+        fragments = self.table.write(self.filename, fragment_rows=3, processes=2)
+
+        self.assertEqual([self._read(fragment) for fragment in fragments], serial)
+
+    def test_read_tex_reassembles(self):
+        self.table.write(self.filename, fragment_rows=4)
+        table = read_tex(self.filename + '.tex')
+
+        self.assertEqual(table.content.shape, (10, 3))
+        self.assertEqual(table[9,2].content, 29)
+        self.assertEqual(table.as_tex(), self.table.as_tex())
+
+
+if __name__ == '__main__':
+    unittest.main()
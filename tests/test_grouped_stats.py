@@ -0,0 +1,116 @@
+'''
+Tests for Grouped Statistics
+----------------------------
+
+Run from the repository root with::
+
+    python -m unittest discover tests
+'''
+
+from __future__ import print_function, division
+
+# Standard Library
+import os
+import shutil
+import tempfile
+import unittest
+
+# Third Party
+import numpy as np
+
+# Local
+from pytabular import grouped_stats, summary_table
+
+
+class TestGroupedStats(unittest.TestCase):
+
+    def setUp(self):
+        state = np.random.RandomState(0)
+        self.data = state.randn(1000, 3)
+        self.data[::7, 1] = np.nan
+        self.groups = state.choice(['a', 'b', 'c'], 1000)
+
+    def _check(self, labels, results, data, groups):
+        for i, label in enumerate(labels):
+            values = data[groups == label]
+            self.assertTrue(np.allclose(results['mean'][i], np.nanmean(values, 0)))
+            self.assertTrue(np.allclose(results['std'][i], np.nanstd(values, 0, ddof=1)))
+            self.assertTrue(np.allclose(results['min'][i], np.nanmin(values, 0)))
+            self.assertTrue(np.allclose(results['max'][i], np.nanmax(values, 0)))
+            self.assertTrue(np.allclose(results['sum'][i], np.nansum(values, 0)))
+            self.assertTrue(np.allclose(results['count'][i], (~np.isnan(values)).sum(0)))
+
+    def test_matches_numpy(self):
+        stats = ['mean', 'std', 'min', 'max', 'count', 'sum']
+        labels, results = grouped_stats(self.data, self.groups, stats)
+
+        self.assertEqual(labels.tolist(), ['a', 'b', 'c'])
+        self._check(labels, results, self.data, self.groups)
+
+    def test_chunks_match_numpy(self):
+        stats = ['mean', 'std', 'min', 'max', 'count', 'sum']
+        for chunksize in [1, 97, 1000]:
+            labels, results = grouped_stats(self.data, self.groups, stats, chunksize)
+            self._check(labels, results, self.data, self.groups)
+
+    def test_groups_missing_from_chunks(self):
+        groups = np.where(np.arange(1000) < 500, 'a', 'b')
+        stats = ['mean', 'std', 'min', 'max', 'count', 'sum']
+        labels, results = grouped_stats(self.data, groups, stats, chunksize=97)
+
+        self._check(labels, results, self.data, groups)
+
+    def test_single_group(self):
+        labels, results = grouped_stats(self.data[:, 0], stats=['mean', 'count'])
+
+        self.assertEqual(results['mean'].shape, (1, 1))
+        self.assertTrue(np.allclose(results['mean'][0,0], self.data[:, 0].mean()))
+        self.assertEqual(results['count'][0,0], 1000)
+
+    def test_memmap(self):
+        directory = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(directory, 'data.npy')
+            np.save(filename, self.data)
+            data = np.load(filename, mmap_mode='r')
+            labels, results = grouped_stats(data, self.groups,
+                                            ['mean', 'std', 'min', 'max', 'count', 'sum'],
+                                            chunksize=128)
+            self._check(labels, results, self.data, self.groups)
+            del data
+        finally:
+            shutil.rmtree(directory)
+
+    def test_invalid_arguments(self):
+        self.assertRaises(ValueError, grouped_stats, self.data, stats=['median'])
+        self.assertRaises(ValueError, grouped_stats, self.data, chunksize=0)
+
+
+class TestSummaryTable(unittest.TestCase):
+
+    def setUp(self):
+        self.data = np.array([[1., 2.], [3., np.nan], [5., 6.], [7., 8.]])
+        self.groups = np.array(['b', 'a', 'b', 'a'])
+
+    def test_grouped_rows(self):
+        table = summary_table(self.data, self.groups, ['u', 'v'],
+                              stats=['mean', 'count'], digits=1)
+        tex = table.as_tex()
+
+        self.assertIn('Group & Variable & Mean & N \\\\', tex)
+        self.assertIn('\\mr{2}{*}{a} & u & 5.0 & 2 \\\\', tex)
+        self.assertIn(' & v & 8.0 & 1 \\\\', tex)
+        self.assertIn('\\mr{2}{*}{b} & u & 3.0 & 2 \\\\', tex)
+
+    def test_without_groups(self):
+        table = summary_table(self.data[:, :1], stats=['mean'], digits=2)
+
+        self.assertEqual(table.content.shape, (2, 2))
+        self.assertIn('x1 & 4.00 \\\\', table.as_tex())
+
+    def test_invalid_variables(self):
+        self.assertRaises(ValueError, summary_table, self.data, variables=['u'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+'''
+Tests for Hoisting Styles out of Cells
+--------------------------------------
+
+Run from the repository root with::
+
+    python -m unittest discover tests
+'''
+
+from __future__ import print_function, division
+
+# Standard Library
+import unittest
+
+# Third Party
+import numpy as np
+
+# Local
+from pytabular import Tabular
+
+
+class TestHoist(unittest.TestCase):
+
+    def setUp(self):
+        self.table = Tabular(np.arange(9).reshape((3, 3)))
+        self.table[:,0].set_alignment('l')
+        self.table[1].set_color('gray')
+        self.table[0,2].set_alignment('r')
+
+    def test_off_by_default(self):
+        tex = self.table.as_tex()
+
+        self.assertFalse(self.table.hoist)
+        self.assertIn('{ccc}', tex)
+        self.assertIn('\\mc{1}{l}{6} & 7 & 8 \\\\', tex)
+        self.assertIn('\\mc{1}{l}{\\cellcolor{gray!50}{3}} & \\cellcolor{gray!50}{4}', tex)
+
+    def test_column_alignment_and_row_color(self):
+        self.table.set_hoist()
+        tex = self.table.as_tex()
+
+        self.assertIn('{lcc}', tex)
+        self.assertIn('0 & 1 & \\mc{1}{r}{2} \\\\', tex)
+        self.assertIn('\\rowcolor{gray!50} 3 & 4 & 5 \\\\', tex)
+
+    def test_only_shared_alignments(self):
+        self.table[2,0].set_alignment('r')
+        self.table.set_hoist()
+        tex = self.table.as_tex()
+
+        self.assertIn('{ccc}', tex)
+        self.assertIn('\\mc{1}{r}{6} & 7 & 8 \\\\', tex)
+
+    def test_lines_keep_empty_cells(self):
+        table = Tabular(np.arange(6).reshape((3, 2)))
+        table[:,0].set_alignment('l')
+        table.set_tab_alignment('c|c')
+        table[1,0].set_content('')
+        table[1,0].set_alignment('c')
+        table.set_hoist()
+
+        self.assertIn('{c|c}', table.as_tex())
+
+    def test_invalid_hoist(self):
+        self.assertRaises(ValueError, self.table.set_hoist, 'yes')
+
+
+if __name__ == '__main__':
+    unittest.main()
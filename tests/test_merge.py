@@ -0,0 +1,109 @@
+'''
+Tests for Merging and Missing Values
+------------------------------------
+
+Run from the repository root with::
+
+    python -m unittest discover tests
+'''
+
+from __future__ import print_function, division
+
+# Standard Library
+import unittest
+
+# Third Party
+import numpy as np
+
+# Local
+from pytabular import Tabular
+from pytabular.operators import MergeError
+
+
+class TestMissing(unittest.TestCase):
+
+    def test_masked_array(self):
+        data = np.ma.masked_invalid([[1.0, np.nan, 3.0], [4.0, 5.0, np.nan]])
+        data[0,0] = np.ma.masked
+        table = Tabular(data)
+
+        self.assertEqual(table.missing_mask().tolist(), [[True, True, False],
+                                                         [False, False, True]])
+
+    def test_object_array(self):
+        table = Tabular(np.array([['a', None, 2.0], [np.nan, 1, None]], dtype=object))
+
+        self.assertEqual(table.missing_mask().tolist(), [[False, True, False],
+                                                         [True, False, True]])
+
+    def test_na_rep(self):
+        table = Tabular(np.array([[1.0, np.nan], [None, 2.0]], dtype=object))
+        table.set_na_rep('--')
+        tex = table.as_tex()
+
+        self.assertIn('1.0 & -- \\\\', tex)
+        self.assertIn('-- & 2.0 \\\\', tex)
+        self.assertRaises(ValueError, table.set_na_rep, None)
+
+
+class TestMerge(unittest.TestCase):
+
+    def setUp(self):
+        self.table = Tabular(np.array([[1, 2], [None, np.nan], ['', 3]], dtype=object))
+
+    def test_merge_over_null_cells(self):
+        self.table[:,0].merge()
+
+        self.assertEqual(self.table[0,0].rows, 3)
+        self.assertTrue(self.table[1,0].mergedcol)
+        self.assertTrue(self.table[2,0].mergedcol)
+        self.assertIn('\\mr{3}{*}{1} & 2 \\\\', self.table.as_tex())
+
+    def test_merge_over_null_row(self):
+        self.table[1,:].merge()
+
+        self.assertEqual(self.table[1,0].columns, 2)
+        self.assertTrue(self.table[1,1].mergedrow)
+
+    def test_merged_nulls_not_placeholders(self):
+        self.table.set_na_rep('.')
+        self.table[:,0].merge()
+        tex = self.table.as_tex()
+
+        self.assertIn('\\mr{3}{*}{1} & 2 \\\\', tex)
+        self.assertIn('\n   & . \\\\', tex)
+        self.assertIn('\n   & 3 \\\\', tex)
+
+    def test_merge_over_values_fails(self):
+        self.assertRaises(MergeError, self.table[:,1].merge)
+        self.assertRaises(MergeError, self.table[0:2,:].merge)
+
+    def test_merge_after_values_removed(self):
+        for cell in self.table[1:,1]:
+            cell.set_content(None)
+        self.table[:,1].merge()
+
+        self.assertEqual(self.table[0,1].rows, 3)
+
+    def test_merge_after_values_set(self):
+        self.table.missing_mask()
+        self.table[1,0].set_content(4)
+
+        self.assertRaises(MergeError, self.table[:,0].merge)
+
+    def test_force(self):
+        self.table[0:2,:].merge(force=True)
+
+        self.assertEqual(self.table[0,0].rows, 2)
+        self.assertEqual(self.table[0,0].columns, 2)
+        self.assertEqual(self.table[0,1].content, '')
+        self.assertEqual(self.table[2,1].content, 3)
+
+    def test_merge_merged_cells_fails(self):
+        self.table[:,0].merge()
+
+        self.assertRaises(MergeError, self.table[1:,0].merge)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+'''
+Tests for Reading Rendered Tables
+---------------------------------
+
+Run from the repository root with::
+
+    python -m unittest discover tests
+'''
+
+from __future__ import print_function, division
+
+# Standard Library
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+
+# Third Party
+import numpy as np
+
+# Local
+from pytabular import Tabular, Table, LongTable, parse_tex, read_tex
+from pytabular import format_digits, format_stars, regression_table, summary_table
+
+
+class TestParseTex(unittest.TestCase):
+
+    def _check(self, table):
+        tex = table.as_tex()
+        parsed = parse_tex(tex)
+
+        self.assertIs(type(parsed), type(table))
+        self.assertEqual(parsed.as_tex(), tex)
+        return parsed
+
+    def test_styled_table(self):
+        table = Table(np.array([['Variable', 'Mean', 'Std.'], ['Health', 5, 6],
+                                ['', 8, ''], ['x', 1.25, 2]], dtype=object))
+        table[0].set_bold()
+        table[1:].set_fontsize('small')
+        table[0].set_lines(1)
+        table[1:,0].set_alignment('l')
+        table[2,1:].merge()
+        table[3].set_color('gray')
+        table[3,1].set_emph()
+        table[3,2].set_rotation(90)
+        table[1:3,0].merge(force=True)
+        table.set_caption('Cap')
+        table.set_label('lab')
+        table.add_note('a note')
+        table.add_note('second', 'tiny')
+        parsed = self._check(table)
+
+        self.assertEqual(parsed.caption, 'Cap')
+        self.assertEqual(parsed.label, 'lab')
+        self.assertEqual(parsed[2,1].columns, 2)
+        self.assertEqual(parsed[1,0].rows, 2)
+        self.assertTrue(parsed[0,2].style.bold)
+
+        table.set_compact()
+        self._check(table)
+        table.set_hoist()
+        self._check(table)
+
+    def test_longtable(self):
+        table = LongTable(np.arange(20).reshape((5, 4)))
+        table[0].set_bold()
+        table.set_caption('Long')
+        self._check(table)
+
+        table.set_compact()
+        table.set_repeats(2)
+        table.set_location('r')
+        self._check(table)
+
+    def test_lines_spacing_and_environments(self):
+        table = Table(np.arange(20).reshape((5, 4)))
+        table[1:3,1:3].merge(force=True)
+        table[3].set_lines(2, 'lr')
+        table[4,1].set_lines(1)
+        table[4].set_space_above(1)
+        table[2].set_space_below('3mm')
+        table[1:,0].set_alignment('l')
+        table.set_decimal_alignment('S')
+        table.add_environment('landscape')
+        self._check(table)
+
+    def test_rules_and_alignment(self):
+        state = np.random.RandomState(0)
+        table = Table(state.randn(30, 5).round(3))
+        table[0].set_bold()
+        table.highlight_best(np.s_[1:, 1:])
+        table.heatmap(np.s_[1:, 4])
+        table[1:, 1:3].set_formatter(format_digits(2))
+        table.set_decimal_alignment('r')
+        table.set_indent(4)
+        self._check(table)
+
+        table.set_decimal_alignment('S')
+        table[1:,3].set_formatter(format_stars())
+        self._check(table)
+
+    def test_tabular(self):
+        # escaped characters, warned about when the table is created
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            table = Tabular(np.array([['a \\& b', 'c'], ['\\$5', 'x']], dtype=object))
+        table.set_tab_alignment('l|c')
+        self._check(table)
+
+    def test_builders(self):
+        state = np.random.RandomState(0)
+        self._check(regression_table(state.randn(4, 3), np.abs(state.randn(4, 3))/5,
+                                     state.rand(4, 3), variables=['a', 'b', 'c'],
+                                     stats=[('N', [100, 200, 300, 400])]))
+        self._check(summary_table(state.randn(50, 3), groups=np.arange(50) % 2))
+
+    def test_table_environments_kept(self):
+        table = Table(np.arange(4).reshape((2, 2)))
+        table.add_environment('table', 'h')
+        self._check(table)
+
+    def test_numbers(self):
+        table = Table(np.array([['a', 'b'], [1, 2.50]], dtype=object))
+        table[1,1].set_digits(2)
+        tex = table.as_tex()
+
+        parsed = parse_tex(tex)
+        self.assertEqual(parsed[1,0].content, 1)
+        self.assertEqual(parsed[1,1].content, 2.5)
+        parsed = parse_tex(tex, numbers=False)
+        self.assertEqual(parsed[1,0].content, '1')
+        self.assertEqual(parsed[1,1].content, '2.50')
+
+    def test_invalid_tex(self):
+        self.assertRaises(ValueError, parse_tex, 'no table here')
+        self.assertRaises(ValueError, parse_tex, '\\begin{tabu}{cc}\n\n  a & b \n\\end{tabu}')
+
+
+class TestReadTex(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_streamed_csv(self):
+        path = os.path.join(self.directory, 'data.csv')
+        with open(path, 'w') as csvfile:
+            csvfile.write('a,b,c\n')
+            for i in range(50):
+                csvfile.write('{},{:.3f},name{}\n'.format(i, i/7., i))
+        filename = os.path.join(self.directory, 'streamed.tex')
+        table = LongTable.from_csv(path, chunksize=10)
+        table[0].set_bold()
+        table.write(filename)
+        parsed = read_tex(filename)
+
+        self.assertEqual(parsed.shape, (51, 3))
+        with open(filename) as texfile:
+            self.assertEqual(parsed.as_tex(), texfile.read())
+
+    def test_fragments_relative_to_file(self):
+        table = LongTable(np.arange(30).reshape((10, 3)))
+        cwd = os.getcwd()
+        os.chdir(self.directory)
+        try:
+            table.write('long', fragment_rows=4)
+        finally:
+            os.chdir(cwd)
+        parsed = read_tex(os.path.join(self.directory, 'long.tex'))
+
+        self.assertEqual(parsed.as_tex(), table.as_tex())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+'''
+Tests for Tables from Records and Memory-Mapped Files
+-----------------------------------------------------
+
+Run from the repository root with::
+
+    python -m unittest discover tests
+'''
+
+from __future__ import print_function, division
+
+# Standard Library
+import os
+import shutil
+import tempfile
+import unittest
+
+# Third Party
+import numpy as np
+
+# Local
+from pytabular import Table, LongTable, format_digits
+
+
+class TestRecords(unittest.TestCase):
+
+    def setUp(self):
+        self.records = np.zeros(4, dtype=[('name', 'S5'), ('x', 'f4'), ('n', 'i2')])
+        self.records['name'] = ['a', 'b', 'c', 'd']
+        self.records['x'] = [1.5, 2.25, np.nan, 4]
+        self.records['n'] = [1, 2, 3, 4]
+
+    def test_fields_become_columns(self):
+        table = Table.from_records(self.records)
+
+        self.assertEqual(table.content.shape, (5, 3))
+        self.assertEqual(table[0,1].content, 'x')
+        self.assertEqual(table[2,0].content, 'b')
+        self.assertEqual(table.dtypes, [np.dtype('S5'), np.dtype('f4'), np.dtype('i2')])
+
+    def test_values_are_views(self):
+        table = Table.from_records(self.records)
+        values = table.values(1, slice(1, None))
+
+        self.assertTrue(values.base is not None)
+        self.assertTrue(np.isnan(values[2]))
+        self.assertEqual(values[1], np.float32(2.25))
+
+    def test_without_header(self):
+        table = Table.from_records(self.records, header=False)
+
+        self.assertEqual(table.content.shape, (4, 3))
+        self.assertEqual(table[0,0].content, 'a')
+
+    def test_rendering(self):
+        table = Table.from_records(self.records)
+        table[1:,1].set_formatter(format_digits(2))
+        table.set_na_rep('--')
+        tex = table.as_tex()
+
+        self.assertIn('name & x & n \\\\', tex)
+        self.assertIn('b & 2.25 & 2 \\\\', tex)
+        self.assertIn('c & -- & 3 \\\\', tex)
+
+    def test_set_content_retypes_columns(self):
+        table = Table.from_records(self.records)
+        table[1,1].set_content(9)
+
+        self.assertEqual(table.values(1, slice(1, None))[0], 9)
+
+    def test_invalid_records(self):
+        self.assertRaises(ValueError, Table.from_records, np.arange(4))
+        self.assertRaises(ValueError, LongTable.from_records, self.records, chunksize=0)
+
+
+class TestMemmap(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.records = np.zeros(25, dtype=[('a', '<i8'), ('b', '<f8'), ('c', 'S4')])
+        self.records['a'] = np.arange(25)
+        self.records['b'] = np.arange(25)/3.
+        self.records['b'][7] = np.nan
+        self.records['c'] = 'x'
+        self.path = os.path.join(self.directory, 'records.bin')
+        self.records.tofile(self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, table):
+        table[0].set_bold()
+        table[1:,1].set_formatter(format_digits(2))
+        table[1:,2].set_emph()
+        table.set_na_rep('--')
+        filename = os.path.join(self.directory, 'table.tex')
+        table.write(filename)
+        with open(filename) as texfile:
+            return texfile.read()
+
+    def test_fields_are_memmaps(self):
+        table = LongTable.from_memmap(self.path, self.records.dtype, 25)
+
+        self.assertTrue(isinstance(table.fields[2][1], np.memmap))
+        self.assertEqual(table.dtypes, [np.dtype('<i8'), np.dtype('<f8'), np.dtype('S4')])
+
+    def test_plain_dtype(self):
+        path = os.path.join(self.directory, 'plain.bin')
+        np.arange(6.).tofile(path)
+        table = LongTable.from_memmap(path, float, (3, 2))
+
+        self.assertEqual(table.content.shape, (3, 2))
+        self.assertEqual(table[2,1].content, 5.)
+
+    def test_streamed_chunks_write_same_file(self):
+        full = self._write(LongTable.from_memmap(self.path, self.records.dtype, 25,
+                                                 chunksize=None))
+
+        self.assertIn('7 & -- & \\emph{x} \\\\', full)
+        for chunksize in [1, 4, 25, 100]:
+            table = LongTable.from_memmap(self.path, self.records.dtype, 25,
+                                          chunksize=chunksize)
+            self.assertEqual(table.source is None, chunksize >= 25)
+            self.assertEqual(self._write(table), full)
+
+    def test_streamed_plain_chunks_write_same_file(self):
+        path = os.path.join(self.directory, 'plain.bin')
+        np.arange(60.).reshape((20, 3)).tofile(path)
+        full = self._write(LongTable.from_memmap(path, float, (20, 3), chunksize=None))
+
+        table = LongTable.from_memmap(path, float, (20, 3), chunksize=6)
+        self.assertEqual(self._write(table), full)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,209 @@
+'''
+Tests for Conditional Formatting Rules
+--------------------------------------
+
+Run from the repository root with::
+
+    python -m unittest discover tests
+'''
+
+from __future__ import print_function, division
+
+# Standard Library
+import unittest
+
+# Third Party
+import numpy as np
+
+# Local
+from pytabular import Tabular
+
+
+class TestRule(unittest.TestCase):
+
+    def setUp(self):
+        data = np.array([['a', 'b', 'c'], [1, -2, 3], [-4, 5, '']], dtype=object)
+        self.table = Tabular(data)
+        self.table[2,0].set_bold()
+
+    def test_matching_cells_styled(self):
+        self.table.add_rule(lambda x: x < 0, np.s_[1:, :], bold=True, color=('red', 30))
+        tex = self.table.as_tex()
+
+        self.assertIn('1 & \\textbf{\\cellcolor{red!30}{-2}} & 3 \\\\', tex)
+        self.assertIn('\\textbf{\\cellcolor{red!30}{-4}} & 5 &  \\\\', tex)
+        self.assertEqual(self.table[1,0].style.color, None)
+
+    def test_rules_stack(self):
+        self.table.add_rule(lambda x: x < 0, np.s_[1:, :], bold=True)
+        self.table.add_rule(lambda x: np.abs(x) > 4, np.s_[1:, 1], emph=True)
+
+        self.assertIn('\\emph{5}', self.table.as_tex())
+        self.assertFalse(self.table[2,1].style.bold)
+
+    def test_text_and_null_cells_are_nan(self):
+        seen = []
+        self.table.add_rule(lambda x: seen.append(x) or x > -10, bold=True)
+
+        self.assertTrue(np.isnan(seen[0][[0, 0, 0, 2], [0, 1, 2, 2]]).all())
+        self.assertFalse(self.table[0,0].style.bold)
+        self.assertFalse(self.table[2,2].style.bold)
+        self.assertTrue(self.table[1,1].style.bold)
+
+    def test_apply_rules_after_content_changes(self):
+        self.table.add_rule(lambda x: x < 0, np.s_[1:, :], bold=True, color=('red', 30))
+        self.table[1,1].set_content(2)
+        self.table[2,0].set_content(4)
+        self.table.apply_rules()
+        tex = self.table.as_tex()
+
+        self.assertIn('1 & 2 & 3 \\\\', tex)
+        # bold set before the rule is kept
+        self.assertIn('\\textbf{4} & 5 &  \\\\', tex)
+        self.assertEqual(self.table[2,0].style.color, None)
+
+    def test_remove_rules_restores_styles(self):
+        before = self.table.as_tex()
+        self.table.add_rule(lambda x: x < 0, bold=True, color='red')
+        self.table.add_rule(lambda x: x > 2, emph=True)
+        self.table.remove_rules()
+
+        self.assertEqual(self.table.as_tex(), before)
+        self.assertEqual(self.table.rules, [])
+
+    def test_styles_set_after_rule_kept(self):
+        self.table.add_rule(lambda x: x < 0, bold=True)
+        self.table[1,1].set_color('blue')
+        self.table.remove_rules()
+
+        self.assertEqual(self.table[1,1].style.color, 'blue!50')
+        self.assertFalse(self.table[1,1].style.bold)
+
+    def test_invalid_rules(self):
+        self.assertRaises(ValueError, self.table.add_rule, 'x < 0', bold=True)
+        self.assertRaises(ValueError, self.table.add_rule, lambda x: x < 0)
+        self.assertRaises(ValueError, self.table.add_rule, lambda x: x < 0, shadow=True)
+        self.assertRaises(ValueError, self.table.add_rule, lambda x: x[0] < 0, bold=True)
+
+
+class TestHeatmap(unittest.TestCase):
+
+    def setUp(self):
+        self.table = Tabular(np.array([[-2., -1., 0.], [1., 2., np.nan]]))
+
+    def test_diverging_codes(self):
+        heatmap = self.table.heatmap(levels=2)
+
+        self.assertEqual(heatmap.palette, [None, 'blue!50', 'blue!100',
+                                           'red!50', 'red!100'])
+        self.assertEqual(heatmap.codes.tolist(), [[2, 1, 0], [3, 4, 0]])
+        self.assertEqual(self.table[0,0].style.color, 'blue!100')
+        self.assertEqual(self.table[0,2].style.color, None)
+        self.assertEqual(self.table[1,1].style.color, 'red!100')
+
+    def test_sequential_codes(self):
+        heatmap = self.table.heatmap(cmap='green', levels=4, vmin=-2, vmax=2)
+
+        self.assertEqual(heatmap.palette, [None, 'green!25', 'green!50',
+                                           'green!75', 'green!100'])
+        self.assertEqual(heatmap.codes.tolist(), [[0, 1, 2], [3, 4, 0]])
+
+    def test_values_clipped_to_limits(self):
+        heatmap = self.table.heatmap(np.s_[0, :], levels=2, vmin=-1, vmax=1)
+
+        self.assertEqual(heatmap.codes.tolist(), [2, 2, 0])
+        self.assertEqual(self.table[1,1].style.color, None)
+
+    def test_center(self):
+        heatmap = self.table.heatmap(levels=2, center=-1)
+
+        self.assertEqual(heatmap.codes.tolist(), [[2, 0, 3], [3, 4, 0]])
+
+    def test_styles_interned(self):
+        table = Tabular(np.array([[3., 3., -3.], [3., 3., -3.]]))
+        table[0].set_bold()
+        table.heatmap(levels=1)
+        content = table.content
+
+        self.assertIs(content[0,0].style, content[0,1].style)
+        self.assertIs(content[1,0].style, content[1,1].style)
+        self.assertIsNot(content[0,2].style, content[1,2].style)
+        self.assertEqual(content[0,2].style.color, 'blue!100')
+
+    def test_remove_restores_colors(self):
+        self.table[0,2].set_color('gray')
+        before = self.table.as_tex()
+        self.table.heatmap()
+        self.table.remove_rules()
+
+        self.assertEqual(self.table.as_tex(), before)
+
+    def test_invalid_heatmaps(self):
+        self.assertRaises(ValueError, self.table.heatmap, cmap=['blue', 'red'])
+        self.assertRaises(ValueError, self.table.heatmap, cmap=('a', 'b', 'c'))
+        self.assertRaises(ValueError, self.table.heatmap, levels=0)
+        self.assertRaises(ValueError, self.table.heatmap, levels=101)
+
+
+class TestBest(unittest.TestCase):
+
+    def setUp(self):
+        data = np.array([['m', 'acc', 'err', 'f1'],
+                         ['a', 0.9, 0.1, 0.5],
+                         ['b', 0.95, 0.05, 0.5],
+                         ['c', 0.95, 0.2, '-'],
+                         ['d', 0.8, 0.01, 0.4]], dtype=object)
+        self.table = Tabular(data)
+
+    def _styled(self, column, style):
+        return [i for i in range(1, 5) if getattr(self.table[i,column].style, style)]
+
+    def test_best_and_second_best(self):
+        self.table.highlight_best(np.s_[1:, 1:], direction=['max', 'min', 'max'])
+
+        self.assertEqual(self._styled(1, 'bold'), [2, 3])
+        self.assertEqual(self._styled(1, 'underline'), [])
+        self.assertEqual(self._styled(2, 'bold'), [4])
+        self.assertEqual(self._styled(2, 'underline'), [2])
+        self.assertEqual(self._styled(3, 'bold'), [1, 2])
+        self.assertIn('b & \\textbf{0.95} & \\uline{0.05} & \\textbf{0.5} \\\\', \
+                      self.table.as_tex())
+
+    def test_first_of_ties(self):
+        self.table.highlight_best(np.s_[1:, 1:], direction=['max', 'min', 'max'], 
+                                  ties='first')
+
+        self.assertEqual(self._styled(1, 'bold'), [2])
+        self.assertEqual(self._styled(1, 'underline'), [3])
+        self.assertEqual(self._styled(3, 'bold'), [1])
+        self.assertEqual(self._styled(3, 'underline'), [2])
+
+    def test_rows_with_styles(self):
+        self.table.highlight_best(np.s_[1:, 1:3], axis=1, styles=[{'color':'red'}])
+
+        self.assertEqual(self._styled(1, 'color'), [1, 2, 3, 4])
+        self.assertEqual(self._styled(2, 'color'), [])
+
+    def test_text_and_null_cells_skipped(self):
+        self.table.highlight_best(np.s_[:, 3], direction='min')
+
+        self.assertEqual(self._styled(3, 'bold'), [4])
+        self.assertFalse(self.table[0,3].style.bold)
+
+    def test_remove_restores_styles(self):
+        before = self.table.as_tex()
+        self.table.highlight_best(np.s_[1:, 1:])
+        self.table.remove_rules()
+
+        self.assertEqual(self.table.as_tex(), before)
+
+    def test_invalid_best(self):
+        self.assertRaises(ValueError, self.table.highlight_best, axis=2)
+        self.assertRaises(ValueError, self.table.highlight_best, direction='best')
+        self.assertRaises(ValueError, self.table.highlight_best, ties='last')
+        self.assertRaises(ValueError, self.table.highlight_best, np.s_[1:, 1:], 
+                          direction=['max', 'min'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+'''
+Tests for Saving and Pickling Tables
+------------------------------------
+
+Run from the repository root with::
+
+    python -m unittest discover tests
+'''
+
+from __future__ import print_function, division
+
+# Standard Library
+import copy
+import cPickle
+import os
+import shutil
+import tempfile
+import unittest
+
+# Third Party
+import numpy as np
+
+# Local
+from pytabular import Table, LongTable, format_digits
+
+
+class TestSave(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.filename = os.path.join(self.directory, 'table.ptab')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _check(self, table):
+        tex = table.as_tex()
+        table.save(self.filename)
+        loaded = type(table).load(self.filename)
+        pickled = cPickle.loads(cPickle.dumps(table, 2))
+
+        self.assertIs(type(loaded), type(table))
+        self.assertEqual(loaded.as_tex(), tex)
+        self.assertEqual(pickled.as_tex(), tex)
+        return loaded
+
+    def test_styled_table(self):
+        table = Table(np.array([['Variable', 'Mean', 'Std.'], ['Health', 5, 6],
+                                ['', 8, ''], ['x', 1, 2]]))
+        table.set_bold()
+        table[1:].set_fontsize('small')
+        table[0].set_lines(1)
+        table[1:,0].set_alignment('l')
+        table[2,1:].merge()
+        table[3].set_color('gray')
+        table[3].set_space_above(2)
+        table.set_compact()
+        table.set_caption('Cap')
+        table.set_label('lab')
+        table.add_note('a note')
+        loaded = self._check(table)
+
+        self.assertEqual(loaded[2,1].columns, 2)
+        self.assertTrue(loaded.compact)
+
+    def test_rules_and_formatters(self):
+        state = np.random.RandomState(0)
+        table = Table(state.randn(20, 6).round(3))
+        table[0].set_bold()
+        table.highlight_best(np.s_[1:, 1:])
+        table.heatmap(np.s_[1:, 5])
+        table[1:, 1:3].set_formatter(format_digits(2))
+        table[4:8, 0].merge(force=True)
+        loaded = self._check(table)
+
+        # rules are not saved, the styles they set are
+        tex = loaded.as_tex()
+        loaded.remove_rules()
+        self.assertEqual(loaded.rules, [])
+        self.assertEqual(loaded.as_tex(), tex)
+
+    def test_mixed_content(self):
+        table = Table(np.array([[None, 1.5, True], ['s', 2, np.float32(2.5)]], dtype=object))
+        loaded = self._check(table)
+
+        self.assertEqual([cell.content for cell in loaded.content.flat],
+                         [cell.content for cell in table.content.flat])
+
+    def test_longtable_typed_columns(self):
+        table = LongTable(np.arange(20).reshape((5, 4)))
+        table.set_bold()
+        loaded = self._check(table)
+
+        self.assertEqual(loaded.values(0).dtype, np.dtype('int64'))
+        self.assertTrue(isinstance(loaded.fields[2][0], np.memmap))
+
+    def test_records(self):
+        records = np.zeros(50, dtype=[('a', int), ('b', float), ('c', 'S4')])
+        records['a'] = np.arange(50)
+        records['b'] = np.arange(50)/3.
+        records['c'] = 'x'
+        self._check(Table.from_records(records))
+
+    def test_copies(self):
+        table = LongTable(np.arange(20).reshape((5, 4)))
+
+        self.assertEqual(copy.deepcopy(table).as_tex(), table.as_tex())
+        self.assertIs(copy.copy(table).content, table.content)
+
+    def test_lambda_formatter_fails(self):
+        table = Table(np.array([[1, 2]]))
+        table.set_formatter(lambda x: '%d!' % x)
+
+        self.assertRaises(ValueError, table.save, self.filename)
+        self.assertFalse(os.path.exists(self.filename))
+
+    def test_load_other_class_fails(self):
+        Table(np.array([[1, 2]])).save(self.filename)
+
+        self.assertRaises(ValueError, LongTable.load, self.filename)
+
+
+if __name__ == '__main__':
+    unittest.main()